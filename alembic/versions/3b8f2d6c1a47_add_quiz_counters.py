@@ -0,0 +1,47 @@
+"""add quiz counters
+
+Revision ID: 3b8f2d6c1a47
+Revises: ec149fcd9ea2
+Create Date: 2026-10-18 10:12:41.208345
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b8f2d6c1a47'
+down_revision: Union[str, Sequence[str], None] = 'ec149fcd9ea2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('quiz', sa.Column(
+        'question_count', sa.Integer(), nullable=False, server_default='0'
+    ))
+    op.add_column('quiz', sa.Column(
+        'answer_count', sa.Integer(), nullable=False, server_default='0'
+    ))
+    op.execute(
+        """
+        UPDATE quiz SET
+            question_count = (
+                SELECT count(*) FROM question
+                WHERE question.quiz_id = quiz.id
+            ),
+            answer_count = (
+                SELECT count(*) FROM answer
+                JOIN question ON answer.question_id = question.id
+                WHERE question.quiz_id = quiz.id
+            )
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('quiz', 'answer_count')
+    op.drop_column('quiz', 'question_count')
@@ -0,0 +1,30 @@
+"""add quiz version
+
+Revision ID: 8d4e7a2f9c31
+Revises: 3b8f2d6c1a47
+Create Date: 2026-10-18 11:02:17.530911
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d4e7a2f9c31'
+down_revision: Union[str, Sequence[str], None] = '3b8f2d6c1a47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The server default backfills every existing quiz with version 1.
+    op.add_column('quiz', sa.Column(
+        'version', sa.Integer(), nullable=False, server_default='1'
+    ))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('quiz', 'version')
@@ -0,0 +1,48 @@
+"""add attempt stats
+
+Revision ID: a7d3e5c2b914
+Revises: 4f2c9b7e1d58
+Create Date: 2026-10-18 15:58:12.640215
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d3e5c2b914'
+down_revision: Union[str, Sequence[str], None] = '4f2c9b7e1d58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing attempts are folded in with `python -m app.rebuild_stats`.
+    op.create_table('quizstats',
+    sa.Column('quiz_id', sa.Uuid(), nullable=False),
+    sa.Column('attempt_count', sa.Integer(), nullable=False),
+    sa.Column('score_total', sa.Integer(), nullable=False),
+    sa.Column('max_score_total', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['quiz_id'], ['quiz.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('quiz_id')
+    )
+    op.create_table('answerstats',
+    sa.Column('answer_id', sa.Uuid(), nullable=False),
+    sa.Column('quiz_id', sa.Uuid(), nullable=False),
+    sa.Column('pick_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['quiz_id'], ['quiz.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('answer_id')
+    )
+    op.create_index(
+        op.f('ix_answerstats_quiz_id'), 'answerstats', ['quiz_id'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_answerstats_quiz_id'), table_name='answerstats')
+    op.drop_table('answerstats')
+    op.drop_table('quizstats')
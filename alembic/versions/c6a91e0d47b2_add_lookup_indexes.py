@@ -0,0 +1,43 @@
+"""add lookup indexes
+
+Revision ID: c6a91e0d47b2
+Revises: 8d4e7a2f9c31
+Create Date: 2026-10-18 11:40:52.114260
+
+"""
+from typing import Sequence, Union
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c6a91e0d47b2'
+down_revision: Union[str, Sequence[str], None] = '8d4e7a2f9c31'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Composite (fk, id) indexes serve both the foreign key lookups and
+    # the keyset pagination ORDER BY id.
+    op.create_index(
+        op.f('ix_user_username'), 'user', ['username'], unique=True
+    )
+    op.create_index(
+        'ix_quiz_owner_id_id', 'quiz', ['owner_id', 'id'], unique=False
+    )
+    op.create_index(
+        'ix_question_quiz_id_id', 'question', ['quiz_id', 'id'], unique=False
+    )
+    op.create_index(
+        'ix_answer_question_id_id', 'answer', ['question_id', 'id'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_answer_question_id_id', table_name='answer')
+    op.drop_index('ix_question_quiz_id_id', table_name='question')
+    op.drop_index('ix_quiz_owner_id_id', table_name='quiz')
+    op.drop_index(op.f('ix_user_username'), table_name='user')
@@ -0,0 +1,73 @@
+"""add search indexes
+
+Revision ID: e2b8c4f61a93
+Revises: a7d3e5c2b914
+Create Date: 2026-10-18 16:41:05.927384
+
+"""
+from typing import Sequence, Union
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b8c4f61a93'
+down_revision: Union[str, Sequence[str], None] = 'a7d3e5c2b914'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# These expressions must match the ones app/search.py queries with,
+# otherwise the planner won't use the indexes.
+TSVECTOR_INDEXES = {
+    'ix_quiz_search': (
+        'quiz', "to_tsvector('english', title || ' ' || "
+        "coalesce(description, ''))"
+    ),
+    'ix_question_search': (
+        'question', "to_tsvector('english', question)"
+    ),
+    'ix_answer_search': ('answer', "to_tsvector('english', text)"),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        for name, (table, expression) in TSVECTOR_INDEXES.items():
+            op.execute(
+                f'CREATE INDEX {name} ON {table} USING gin ({expression})'
+            )
+    elif dialect == 'sqlite':
+        op.execute(
+            'CREATE VIRTUAL TABLE search_index USING fts5('
+            'body, kind UNINDEXED, object_id UNINDEXED, '
+            'question_id UNINDEXED, quiz_id UNINDEXED)'
+        )
+        op.execute(
+            "INSERT INTO search_index "
+            "(body, kind, object_id, question_id, quiz_id) "
+            "SELECT title || ' ' || coalesce(description, ''), 'quiz', "
+            "id, NULL, id FROM quiz"
+        )
+        op.execute(
+            "INSERT INTO search_index "
+            "(body, kind, object_id, question_id, quiz_id) "
+            "SELECT question, 'question', id, id, quiz_id FROM question"
+        )
+        op.execute(
+            "INSERT INTO search_index "
+            "(body, kind, object_id, question_id, quiz_id) "
+            "SELECT answer.text, 'answer', answer.id, answer.question_id, "
+            "question.quiz_id FROM answer "
+            "JOIN question ON question.id = answer.question_id"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        for name in TSVECTOR_INDEXES:
+            op.execute(f'DROP INDEX {name}')
+    elif dialect == 'sqlite':
+        op.execute('DROP TABLE search_index')
@@ -1,25 +1,73 @@
 import jwt
+import time
+import uuid
 
-from fastapi import HTTPException, status
+from fastapi import Body, HTTPException, Query, Request, status
 from fastapi.params import Depends
 from fastapi.security import OAuth2PasswordBearer
-from typing import Annotated, AsyncGenerator
+from typing import Annotated, AsyncGenerator, TypeVar
 from jwt.exceptions import InvalidTokenError
 from pydantic import ValidationError
 from sqlmodel.ext.asyncio.session import AsyncSession
+from app.api.middleware import PRIMARY_STICKY_COOKIE
+from app.core.cache import principal_cache
 from app.core.config import settings
-from app.core.db import engine
-from app.models import User, TokenPayload
+from app.core.pagination import (
+    DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, PageParams, decode_cursor
+)
+from app.core.db import (
+    async_session_maker, read_session_maker, replica_engine
+)
+from app.models import BulkItemResult, User, TokenPayload
 
 
 oauth2_token = OAuth2PasswordBearer(tokenUrl='/login/access-token')
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    async with AsyncSession(engine) as session:
+    async with async_session_maker() as session:
+        yield session
+
+
+def _sticks_to_primary(request: Request) -> bool:
+    try:
+        return float(request.cookies[PRIMARY_STICKY_COOKIE]) > time.time()
+    except (KeyError, ValueError):
+        return False
+
+
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    if replica_engine is None or _sticks_to_primary(request):
+        session_maker = async_session_maker
+    else:
+        session_maker = read_session_maker
+    async with session_maker() as session:
         yield session
 
 
 SessionDep = Annotated[AsyncSession, Depends(get_db)]
+ReadSessionDep = Annotated[AsyncSession, Depends(get_read_db)]
+
+
+def get_page_params(
+        limit: Annotated[
+            int, Query(ge=1, le=MAX_PAGE_SIZE)
+        ] = DEFAULT_PAGE_SIZE,
+        cursor: str | None = None
+) -> PageParams:
+    if cursor is None:
+        return PageParams(limit=limit)
+    try:
+        return PageParams(limit=limit, after=decode_cursor(cursor))
+    except ValueError:
+        raise HTTPException(status_code=400, detail='Invalid cursor')
+
+
+PageDep = Annotated[PageParams, Depends(get_page_params)]
+
+T = TypeVar('T')
+BulkBody = Annotated[
+    list[T], Body(min_length=1, max_length=settings.BULK_MAX_ITEMS)
+]
 TokenDep = Annotated[str, Depends(oauth2_token)]
 
 
@@ -29,14 +77,22 @@ async def get_current_user(session: SessionDep, token: TokenDep) -> User:
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
         )
         token_data = TokenPayload(**token_data)
-    except (InvalidTokenError, ValidationError):
+        user_id = uuid.UUID(token_data.sub)
+    except (InvalidTokenError, ValidationError, ValueError, TypeError):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail='Could not validate credentials'
         )
-    user = await session.get(User, token_data.sub)
-    if not user:
+    user = principal_cache.get(user_id)
+    if user is not None:
+        return user
+    db_user = await session.get(User, user_id)
+    if not db_user:
         raise HTTPException(status_code=404, detail='User not found')
+    # Cache a detached copy: the session-bound instance gets expired on
+    # commit and would be unusable once this request's session is closed.
+    user = User(**db_user.model_dump())
+    principal_cache.set(user_id, user)
     return user
 
 
@@ -48,4 +104,38 @@ def get_current_active_super_user(current_user: CurrentUser) -> User:
         raise HTTPException(
             status_code=403, detail='The user doesn\'t have enough privileges'
         )
-    return current_user
\ No newline at end of file
+    return current_user
+
+
+def authorize(row, not_found: str):
+    if row is None:
+        raise HTTPException(status_code=404, detail=not_found)
+    if not row.allowed:
+        raise HTTPException(
+            status_code=403, detail='The user doesn\'t have enough privileges'
+        )
+    return row
+
+
+def authorize_bulk(
+        keys: list, access: dict, not_found: str
+) -> tuple[list[BulkItemResult], list[int], list]:
+    # Per-item counterpart of authorize(): returns a result for every
+    # item plus the indexes and quiz ids of the items that may proceed.
+    results, accepted, quiz_ids = [], [], []
+    for index, key in enumerate(keys):
+        row = access.get(key)
+        if row is None:
+            results.append(BulkItemResult(
+                index=index, id=key, status=404, detail=not_found
+            ))
+        elif not row.allowed:
+            results.append(BulkItemResult(
+                index=index, id=key, status=403,
+                detail='The user doesn\'t have enough privileges'
+            ))
+        else:
+            results.append(BulkItemResult(index=index, id=key, status=200))
+            accepted.append(index)
+            quiz_ids.append(row.quiz_id)
+    return results, accepted, quiz_ids
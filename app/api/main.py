@@ -1,7 +1,7 @@
 from fastapi import APIRouter
 from .routers import (
     users, login, quizzes,
-    questions, answers
+    questions, answers, search, internal, metrics
 )
 
 api_router = APIRouter()
@@ -9,4 +9,7 @@ api_router.include_router(users.router)
 api_router.include_router(login.router)
 api_router.include_router(quizzes.router)
 api_router.include_router(questions.router)
-api_router.include_router(answers.router)
\ No newline at end of file
+api_router.include_router(answers.router)
+api_router.include_router(search.router)
+api_router.include_router(internal.router)
+api_router.include_router(metrics.router)
\ No newline at end of file
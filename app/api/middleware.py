@@ -0,0 +1,104 @@
+import collections
+import logging
+import time
+from http.cookies import SimpleCookie
+from app.core.config import settings
+from app.core.metrics import RequestStats, request_stats
+
+logger = logging.getLogger(__name__)
+
+PRIMARY_STICKY_COOKIE = 'db_primary_until'
+SAFE_METHODS = {'GET', 'HEAD', 'OPTIONS'}
+
+
+class ReadYourWritesMiddleware:
+    # After a successful write the client is pinned to the primary for a
+    # few seconds, so reads issued right after it don't hit a lagging
+    # replica.
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or scope['method'] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if (
+                    message['type'] == 'http.response.start'
+                    and message['status'] < 400
+            ):
+                cookie = SimpleCookie()
+                cookie[PRIMARY_STICKY_COOKIE] = str(
+                    time.time() + settings.REPLICA_STICKY_SECONDS
+                )
+                cookie[PRIMARY_STICKY_COOKIE]['max-age'] = (
+                    settings.REPLICA_STICKY_SECONDS
+                )
+                cookie[PRIMARY_STICKY_COOKIE]['path'] = '/'
+                cookie[PRIMARY_STICKY_COOKIE]['httponly'] = True
+                cookie[PRIMARY_STICKY_COOKIE]['samesite'] = 'lax'
+                headers = list(message.get('headers', []))
+                headers.append((
+                    b'set-cookie',
+                    cookie.output(header='').strip().encode('latin-1')
+                ))
+                message['headers'] = headers
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+class QueryProfilerMiddleware:
+    # Debug aid: reports the SQL issued by each request in X-DB-Queries and
+    # X-DB-Time (milliseconds) and flags statements that ran at least
+    # QUERY_PROFILER_REPEAT_THRESHOLD times, the usual sign of a lazy load
+    # inside a loop. Statements a streaming body runs after the headers are
+    # sent are not included.
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        stats = request_stats.get()
+        token = None
+        if stats is None:
+            stats = RequestStats(scope=scope)
+            token = request_stats.set(stats)
+        stats.shapes = collections.Counter()
+
+        async def send_wrapper(message):
+            if message['type'] == 'http.response.start':
+                headers = list(message.get('headers', []))
+                headers.append(
+                    (b'x-db-queries', str(stats.statements).encode())
+                )
+                headers.append(
+                    (b'x-db-time', f'{stats.db_time * 1000:.3f}'.encode())
+                )
+                repeated = {
+                    statement: count
+                    for statement, count in stats.shapes.items()
+                    if count >= settings.QUERY_PROFILER_REPEAT_THRESHOLD
+                }
+                if repeated:
+                    headers.append(
+                        (b'x-db-n-plus-one', str(len(repeated)).encode())
+                    )
+                    for statement, count in repeated.items():
+                        logger.warning(
+                            'Probable N+1 on %s %s: %d x %s',
+                            scope['method'], scope['path'], count,
+                            ' '.join(statement.split())
+                        )
+                message['headers'] = headers
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            stats.shapes = None
+            if token is not None:
+                request_stats.reset(token)
@@ -0,0 +1,94 @@
+import functools
+import uuid
+import zlib
+from typing import Any, AsyncIterator, Awaitable, Callable, Mapping
+from fastapi import Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
+from sqlmodel import SQLModel
+from app.core.cache import quiz_response_cache
+from app.core.config import settings
+
+
+@functools.cache
+def _adapter(model: type[SQLModel]) -> TypeAdapter:
+    return TypeAdapter(model)
+
+
+def serialize(model: type[SQLModel], obj: Any) -> bytes:
+    # Instances of the response model are dumped as they are; ORM rows and
+    # dicts are validated once, from attributes, and dumped straight to
+    # JSON bytes by pydantic-core.
+    adapter = _adapter(model)
+    if not isinstance(obj, model):
+        obj = adapter.validate_python(obj, from_attributes=True)
+    return adapter.dump_json(obj)
+
+
+def json_response(
+        model: type[SQLModel], obj: Any,
+        headers: Mapping[str, str] | None = None
+) -> Any:
+    # FastAPI validates a returned object against response_model again and
+    # then walks it with jsonable_encoder. With FAST_JSON_RESPONSES the body
+    # is built here instead; response_model still drives the OpenAPI schema.
+    if not settings.FAST_JSON_RESPONSES:
+        return obj
+    return Response(
+        content=serialize(model, obj), media_type='application/json',
+        headers=dict(headers) if headers else None
+    )
+
+
+def quiz_etag(quiz_id: uuid.UUID, version: int) -> str:
+    return f'"{quiz_id.hex}-{version}"'
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    header = request.headers.get('if-none-match')
+    if not header:
+        return False
+    if header.strip() == '*':
+        return True
+    tags = (tag.strip().removeprefix('W/') for tag in header.split(','))
+    return etag in tags
+
+
+def not_modified_response(etag: str) -> Response:
+    return Response(status_code=304, headers={'ETag': etag})
+
+
+async def cached_quiz_response(
+        quiz_id: uuid.UUID, variant: str,
+        build: Callable[[], Awaitable[bytes]],
+        headers: dict[str, str] | None = None
+) -> Response:
+    # Callers must have authorized access to the quiz before calling this.
+    body = await quiz_response_cache.get(quiz_id, variant)
+    if body is None:
+        body = await build()
+        await quiz_response_cache.set(quiz_id, variant, body)
+    return Response(
+        content=body, media_type='application/json', headers=headers
+    )
+
+
+async def _gzip_chunks(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+    async for chunk in chunks:
+        data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def ndjson_response(
+        request: Request, chunks: AsyncIterator[bytes]
+) -> StreamingResponse:
+    headers = {'Vary': 'Accept-Encoding'}
+    if 'gzip' in request.headers.get('accept-encoding', ''):
+        chunks = _gzip_chunks(chunks)
+        headers['Content-Encoding'] = 'gzip'
+    return StreamingResponse(
+        chunks, media_type='application/x-ndjson', headers=headers
+    )
@@ -1,11 +1,18 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
 import uuid
 from app import crud
-from app.api.deps import SessionDep, CurrentUser
-from app.crud import get_question_by_id
+from app.api.deps import (
+    SessionDep, ReadSessionDep, CurrentUser, PageDep, BulkBody,
+    authorize, authorize_bulk
+)
+from app.api.responses import (
+    is_not_modified, json_response, not_modified_response, quiz_etag
+)
+from app.core.cache import quiz_response_cache
+from app.core.pagination import paginate
 from app.models import (
-    AnswerRead, AnswerUpdate, AnswerCreate,
-    Message, QuestionAnswers,
+    Answer, AnswerRead, AnswerUpdate, AnswerCreate, AnswerBulkUpdate,
+    BulkResult, Message, Question, QuestionAnswers,
 )
 
 router = APIRouter(prefix='/answers', tags=['answers'])
@@ -15,86 +22,129 @@ async def create_answer(
         session: SessionDep, answer_in: AnswerCreate,
         current_user: CurrentUser
 ):
-    question = await get_question_by_id(
-        session=session, question_id=answer_in.question_id
-    )
-    if not question:
-        raise HTTPException(
-            status_code=404, detail='Question not found'
-        )
-    if question.quiz.owner_id != current_user.id:
-        raise HTTPException(
-            status_code=404,
-            detail='The user doesn\'t have enough privileges'
-        )
+    access = authorize(await crud.get_quiz_access(
+        session=session, user=current_user,
+        question_id=answer_in.question_id
+    ), 'Question not found')
     answer = await crud.create_answer(
         session=session, answer_in=answer_in,
     )
-    return answer
+    await quiz_response_cache.invalidate(access.quiz_id)
+    return json_response(AnswerRead, answer)
 
-@router.get('/{answer_id}', response_model=AnswerRead)
-async def get_answer(
-        session: SessionDep, answer_id: uuid.UUID,
+@router.post('/bulk', response_model=BulkResult)
+async def create_answers_bulk(
+        session: SessionDep, answers_in: BulkBody[AnswerCreate],
         current_user: CurrentUser
 ):
-    answer = await crud.get_answer_by_id(
-        session=session, answer_id=answer_id
+    keys = [answer.question_id for answer in answers_in]
+    access = await crud.get_access_map(
+        session=session, user=current_user, model=Question, ids=keys
+    )
+    results, accepted, quiz_ids = authorize_bulk(
+        keys, access, 'Question not found'
+    )
+    new_ids = await crud.bulk_create_answers(
+        session=session, answers=[answers_in[i] for i in accepted],
+        quiz_ids=quiz_ids
+    )
+    for index, new_id in zip(accepted, new_ids):
+        results[index].id = new_id
+    for quiz_id in set(quiz_ids):
+        await quiz_response_cache.invalidate(quiz_id)
+    return BulkResult(results=results)
+
+@router.patch('/bulk', response_model=BulkResult)
+async def edit_answers_bulk(
+        session: SessionDep, updates: BulkBody[AnswerBulkUpdate],
+        current_user: CurrentUser
+):
+    keys = [item.id for item in updates]
+    access = await crud.get_access_map(
+        session=session, user=current_user, model=Answer, ids=keys
+    )
+    results, accepted, quiz_ids = authorize_bulk(
+        keys, access, 'Answer not found'
+    )
+    await crud.bulk_update_answers(
+        session=session, updates=[updates[i] for i in accepted],
+        quiz_ids=quiz_ids
+    )
+    for quiz_id in set(quiz_ids):
+        await quiz_response_cache.invalidate(quiz_id)
+    return BulkResult(results=results)
+
+@router.delete('/bulk', response_model=BulkResult)
+async def delete_answers_bulk(
+        session: SessionDep, answer_ids: BulkBody[uuid.UUID],
+        current_user: CurrentUser
+):
+    access = await crud.get_access_map(
+        session=session, user=current_user, model=Answer, ids=answer_ids
+    )
+    results, accepted, quiz_ids = authorize_bulk(
+        answer_ids, access, 'Answer not found'
     )
+    await crud.bulk_delete_answers(
+        session=session, answer_ids=[answer_ids[i] for i in accepted],
+        quiz_ids=quiz_ids
+    )
+    for quiz_id in set(quiz_ids):
+        await quiz_response_cache.invalidate(quiz_id)
+    return BulkResult(results=results)
+
+@router.get('/{answer_id}', response_model=AnswerRead)
+async def get_answer(
+        session: ReadSessionDep, answer_id: uuid.UUID,
+        request: Request, response: Response, current_user: CurrentUser
+):
+    access = authorize(await crud.get_quiz_access(
+        session=session, user=current_user, answer_id=answer_id
+    ), 'Answer not found')
+    etag = quiz_etag(access.quiz_id, access.version)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    answer = await session.get(Answer, answer_id)
     if not answer:
         raise HTTPException(
             status_code=404, detail='Answer not found'
         )
-    if (
-            current_user.id != answer.question.quiz.owner_id
-            and not current_user.is_superuser
-    ):
-        raise HTTPException(
-            status_code=403,
-            detail='The user doesn\'t have enough privileges'
-        )
-    return answer
+    response.headers['ETag'] = etag
+    return json_response(AnswerRead, answer, response.headers)
 
 @router.get('/question/{question_id}', response_model=QuestionAnswers)
 async def get_answer_in_question(
-        session: SessionDep, question_id: uuid.UUID,
+        session: ReadSessionDep, question_id: uuid.UUID,
+        page: PageDep, request: Request, response: Response,
         current_user: CurrentUser
 ):
-    question = await crud.get_question_by_id(
-        session=session, question_id=question_id
+    access = authorize(await crud.get_quiz_access(
+        session=session, user=current_user, question_id=question_id
+    ), 'Question not found')
+    etag = quiz_etag(access.quiz_id, access.version)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    answers = await crud.get_question_answers(
+        session=session, question_id=question_id,
+        limit=page.limit, after=page.after
+    )
+    answers, next_cursor = paginate(answers, page.limit)
+    response.headers['ETag'] = etag
+    return json_response(
+        QuestionAnswers, {'answers': answers, 'next_cursor': next_cursor},
+        response.headers
     )
-    if not question:
-        raise HTTPException(
-            status_code=404, detail='Question not found'
-        )
-    if question.quiz.owner_id != current_user.id and not current_user.is_superuser:
-        raise HTTPException(
-            status_code=403,
-            detail='The user doesn\'t have enough privileges'
-        )
-    return question
 
 @router.delete('/{answer_id}', response_model=Message)
 async def delete_answer(
         session: SessionDep, answer_id: uuid.UUID,
         current_user: CurrentUser
 ):
-    answer = await crud.get_answer_by_id(
-        session=session, answer_id=answer_id
-    )
-    if not answer:
-        return HTTPException(
-            status_code=404, detail='Answer not found'
-        )
-    if (
-            current_user.id != answer.question.quiz.owner_id
-            and not current_user.is_superuser
-    ):
-        return HTTPException(
-            status_code=403,
-            detail='The user doesn\'t have enough privileges'
-        )
-    await session.delete(answer)
-    await session.commit()
+    answer, quiz_id, _ = authorize(await crud.get_answer_for_user(
+        session=session, user=current_user, answer_id=answer_id
+    ), 'Answer not found')
+    await crud.delete_answer(session=session, db_answer=answer)
+    await quiz_response_cache.invalidate(quiz_id)
     return Message(message='Answer deleted successfully')
 
 @router.patch('/{answer_id}', response_model=AnswerRead)
@@ -102,23 +152,12 @@ async def edit_answer(
         session: SessionDep, answer_id: uuid.UUID,
         update_data: AnswerUpdate, current_user: CurrentUser
 ):
-    db_answer = await crud.get_answer_by_id(
-        session=session, answer_id=answer_id
-    )
-    if not db_answer:
-        raise HTTPException(
-            status_code=404, detail='Answer not found'
-        )
-    if (
-            db_answer.question.quiz.owner_id != current_user.id
-            and not current_user.is_superuser
-    ):
-        raise HTTPException(
-            status_code=403,
-            detail='The user doesn\'t have enough privileges'
-        )
+    db_answer, quiz_id, _ = authorize(await crud.get_answer_for_user(
+        session=session, user=current_user, answer_id=answer_id
+    ), 'Answer not found')
     answer = await crud.update_answer(
         session=session, db_answer=db_answer,
         update_data=update_data
     )
-    return answer
\ No newline at end of file
+    await quiz_response_cache.invalidate(quiz_id)
+    return json_response(AnswerRead, answer)
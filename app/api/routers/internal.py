@@ -0,0 +1,40 @@
+from fastapi import APIRouter
+from fastapi.params import Depends
+from app.api.deps import get_current_active_super_user
+from app.core.cache import principal_cache
+from app.core.db import engine, pool_status, replica_engine
+from app.core.slowlog import slow_query_log
+from app.grading import attempt_buffer
+from app.models import (
+    CacheStats, PoolReport, SlowQueryReport, WriteBufferStats
+)
+
+router = APIRouter(
+    prefix='/internal', tags=['internal'],
+    dependencies=[Depends(get_current_active_super_user)]
+)
+
+@router.get('/principal-cache', response_model=CacheStats)
+async def get_principal_cache_stats():
+    return principal_cache.stats()
+
+
+@router.get('/pool', response_model=PoolReport)
+async def get_pool_status():
+    return {
+        'primary': pool_status(engine),
+        'replica': (
+            pool_status(replica_engine) if replica_engine is not None
+            else None
+        ),
+    }
+
+
+@router.get('/attempt-buffer', response_model=WriteBufferStats)
+async def get_attempt_buffer_stats():
+    return attempt_buffer.stats()
+
+
+@router.get('/slow-queries', response_model=SlowQueryReport)
+async def get_slow_queries():
+    return slow_query_log.report()
@@ -1,19 +1,94 @@
 import uuid
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
 from app import crud
-from app.api.deps import SessionDep, CurrentUser
+from app.api.deps import (
+    SessionDep, ReadSessionDep, CurrentUser, PageDep, BulkBody,
+    authorize, authorize_bulk
+)
+from app.api.responses import (
+    cached_quiz_response, is_not_modified, not_modified_response,
+    json_response, quiz_etag, serialize
+)
+from app.core.cache import quiz_response_cache
+from app.core.pagination import paginate
 from app.models import (
-    QuestionRead, Question, QuestionUpdate, QuizQuestions,
-    QuestionCreate, Message,
+    QuestionRead, QuestionUpdate, QuestionBulkUpdate, QuizQuestions,
+    QuestionCreate, BulkResult, Message, Question, Quiz,
 )
 
 router = APIRouter(prefix='/questions', tags=['question'])
 
+@router.post('/bulk', response_model=BulkResult)
+async def create_questions_bulk(
+        session: SessionDep, questions_in: BulkBody[QuestionCreate],
+        current_user: CurrentUser
+):
+    keys = [question.quiz_id for question in questions_in]
+    access = await crud.get_access_map(
+        session=session, user=current_user, model=Quiz, ids=keys
+    )
+    results, accepted, quiz_ids = authorize_bulk(
+        keys, access, 'Quiz not found'
+    )
+    new_ids = await crud.bulk_create_questions(
+        session=session, questions=[questions_in[i] for i in accepted]
+    )
+    for index, new_id in zip(accepted, new_ids):
+        results[index].id = new_id
+    for quiz_id in set(quiz_ids):
+        await quiz_response_cache.invalidate(quiz_id)
+    return BulkResult(results=results)
+
+@router.patch('/bulk', response_model=BulkResult)
+async def edit_questions_bulk(
+        session: SessionDep, updates: BulkBody[QuestionBulkUpdate],
+        current_user: CurrentUser
+):
+    keys = [item.id for item in updates]
+    access = await crud.get_access_map(
+        session=session, user=current_user, model=Question, ids=keys
+    )
+    results, accepted, quiz_ids = authorize_bulk(
+        keys, access, 'Question not found'
+    )
+    await crud.bulk_update_questions(
+        session=session, updates=[updates[i] for i in accepted],
+        quiz_ids=quiz_ids
+    )
+    for quiz_id in set(quiz_ids):
+        await quiz_response_cache.invalidate(quiz_id)
+    return BulkResult(results=results)
+
+@router.delete('/bulk', response_model=BulkResult)
+async def delete_questions_bulk(
+        session: SessionDep, question_ids: BulkBody[uuid.UUID],
+        current_user: CurrentUser
+):
+    access = await crud.get_access_map(
+        session=session, user=current_user, model=Question, ids=question_ids
+    )
+    results, accepted, quiz_ids = authorize_bulk(
+        question_ids, access, 'Question not found'
+    )
+    await crud.bulk_delete_questions(
+        session=session, question_ids=[question_ids[i] for i in accepted],
+        quiz_ids=quiz_ids
+    )
+    for quiz_id in set(quiz_ids):
+        await quiz_response_cache.invalidate(quiz_id)
+    return BulkResult(results=results)
+
 @router.get('/{question_id}', response_model=QuestionRead)
 async def get_question(
-        session: SessionDep, question_id: uuid.UUID,
-        current_user: CurrentUser
+        session: ReadSessionDep, question_id: uuid.UUID,
+        request: Request, response: Response, current_user: CurrentUser
 ):
+    access = authorize(await crud.get_quiz_access(
+        session=session, user=current_user, question_id=question_id
+    ), 'Question not found')
+    etag = quiz_etag(access.quiz_id, access.version)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
     question = await crud.get_question_by_id(
         session=session, question_id=question_id
     )
@@ -21,79 +96,61 @@ async def get_question(
         raise HTTPException(
             status_code=404, detail='Question not found'
         )
-    if (
-            not current_user.is_superuser
-            and question.quiz.owner_id != current_user.id
-    ):
-        raise HTTPException(
-            status_code=403, detail='The user doesn\'t have enough privileges'
-        )
-    return question
+    response.headers['ETag'] = etag
+    return json_response(QuestionRead, question, response.headers)
 
 @router.get('/quiz/{quiz_id}', response_model=QuizQuestions)
 async def get_questions_in_quiz(
-        session: SessionDep, quiz_id: uuid.UUID,
-        current_user: CurrentUser
+        session: ReadSessionDep, quiz_id: uuid.UUID,
+        page: PageDep, request: Request, current_user: CurrentUser
 ):
-    quiz = await crud.get_quiz_by_id(
-        session=session, quiz_id=quiz_id
-    )
-    if not quiz:
-        raise HTTPException(
-            status_code=404, detail='Quiz not found'
+    access = authorize(await crud.get_quiz_access(
+        session=session, user=current_user, quiz_id=quiz_id
+    ), 'Quiz not found')
+    etag = quiz_etag(quiz_id, access.version)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+
+    async def build() -> bytes:
+        questions = await crud.get_quiz_questions(
+            session=session, quiz_id=quiz_id,
+            limit=page.limit, after=page.after
         )
-    if (
-            not current_user.is_superuser
-            and quiz.owner_id != current_user.id
-    ):
-        raise HTTPException(
-            status_code=403, detail='The user doesn\'t have enough privileges'
+        questions, next_cursor = paginate(questions, page.limit)
+        return serialize(
+            QuizQuestions,
+            {'questions': questions, 'next_cursor': next_cursor}
         )
-    return quiz
+
+    variant = f'questions:{access.version}:{page.limit}:{page.after}'
+    return await cached_quiz_response(
+        quiz_id, variant, build, headers={'ETag': etag}
+    )
 
 @router.post('/', response_model=QuestionRead)
 async def create_question(
         session: SessionDep, question_in: QuestionCreate,
         current_user: CurrentUser
 ):
-    quiz = await crud.get_quiz_by_id(
-        session=session, quiz_id=question_in.quiz_id
-    )
-    if not quiz:
-        raise HTTPException(
-            status_code=404, detail='Quiz not found'
-        )
-    if current_user.id != quiz.owner_id:
-        raise HTTPException(
-            status_code=403, detail='The user doesn\'t have enough privileges'
-        )
+    authorize(await crud.get_quiz_access(
+        session=session, user=current_user, quiz_id=question_in.quiz_id
+    ), 'Quiz not found')
     new_question = await crud.question_create(
         session=session, question_data=question_in
     )
-    return new_question
+    await quiz_response_cache.invalidate(question_in.quiz_id)
+    return json_response(QuestionRead, new_question)
 
 @router.delete('/{question_id}', response_model=Message)
 async def delete_question(
         *, session: SessionDep, question_id: uuid.UUID,
         current_user: CurrentUser
 ):
-    question_db = await crud.get_question_by_id(
-        session=session, question_id=question_id
-    )
-    if not question_db:
-        raise HTTPException(
-            status_code=404, detail='Question not found'
-        )
-    if (
-            question_db.quiz.owner_id != current_user.id
-            and not current_user.is_superuser
-    ):
-        raise HTTPException(
-            status_code=403,
-            detail='The user doesn\'t have enough privileges'
-        )
-    await session.delete(question_db)
-    await session.commit()
+    question_db, quiz_id, _ = authorize(await crud.get_question_for_user(
+        session=session, user=current_user, question_id=question_id
+    ), 'Question not found')
+    await crud.delete_question(session=session, db_question=question_db)
+    await quiz_response_cache.invalidate(quiz_id)
     return Message(message='Question deleted successfully')
 
 @router.patch('/{question_id}', response_model=QuestionRead)
@@ -101,21 +158,12 @@ async def edit_question(
         session: SessionDep, question_id: uuid.UUID,
         update_data: QuestionUpdate, current_user: CurrentUser
 ):
-    db_question = await crud.get_question_by_id(
-        session=session, question_id=question_id
-    )
-    if not db_question:
-        raise HTTPException(
-            status_code=404, detail='Question not found'
-        )
-    if (
-            db_question.quiz.owner_id != current_user.id
-            and not current_user.is_superuser
-    ):
-        raise HTTPException(
-            status_code=403, detail='The user doesn\'t have enough privileges'
-        )
+    db_question, quiz_id, _ = authorize(await crud.get_question_for_user(
+        session=session, user=current_user, question_id=question_id
+    ), 'Question not found')
     db_question = await crud.update_question(
         session=session, db_question=db_question, update_data=update_data
     )
-    return db_question
\ No newline at end of file
+    await quiz_response_cache.invalidate(quiz_id)
+    await session.refresh(db_question, ['answers'])
+    return json_response(QuestionRead, db_question)
@@ -1,13 +1,28 @@
 import uuid
-from fastapi import APIRouter, HTTPException
-from sqlalchemy.orm import selectinload
-from sqlmodel import select
-
+from typing import AsyncIterator
+from fastapi import APIRouter, HTTPException, Request
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
 from app import crud
-from app.api.deps import SessionDep, CurrentUser
+from app.api.deps import (
+    SessionDep, ReadSessionDep, CurrentUser, PageDep, authorize
+)
+from app.api.responses import (
+    cached_quiz_response, is_not_modified, json_response, ndjson_response,
+    not_modified_response, quiz_etag, serialize
+)
+from app.core.cache import quiz_response_cache
+from app.core.config import settings
+from app.core.db import read_session_maker
+from app.grading import (
+    UnknownAnswerError, get_answer_key, grade, record_attempt
+)
+from app.core.pagination import paginate
 from app.models import (
-    QuizCreate, QuizUpdate, QuizRead, Quiz,
-    Message, Question
+    QuizCreate, QuizUpdate, QuizRead, QuizPage, QuizSummaryPage,
+    ImportLineError, ImportReport, Message,
+    AttemptCreate, AttemptResult, QuestionResult,
+    AnswerStatsRead, QuestionStatsRead, QuizStatsRead
 )
 
 router = APIRouter(prefix='/quizzes', tags=['quizzes'])
@@ -18,18 +33,11 @@ async def delete_quiz(
         session: SessionDep, quiz_id: uuid.UUID,
         current_user: CurrentUser
 ):
-    db_quiz = await session.get(Quiz, quiz_id)
-    if not db_quiz:
-        raise HTTPException(
-            status_code=404, detail='Quiz not found'
-        )
-    if not current_user.is_superuser and current_user.id != db_quiz.owner_id:
-        raise HTTPException(
-            status_code=404,
-            detail='The user doesn\'t have enough privileges'
-        )
-    await session.delete(db_quiz)
-    await session.commit()
+    db_quiz, _, _ = authorize(await crud.get_quiz_for_user(
+        session=session, user=current_user, quiz_id=quiz_id
+    ), 'Quiz not found')
+    await crud.delete_quiz(session=session, db_quiz=db_quiz)
+    await quiz_response_cache.invalidate(quiz_id)
     return Message(message='Quiz deleted successfully')
 
 @router.post('/create-quiz', response_model=QuizRead)
@@ -41,60 +49,254 @@ async def create_quiz(
         session=session, quiz=quiz_in,
         owner_id=current_user.id
     )
-    return quiz
+    return json_response(QuizRead, quiz)
 
 @router.get('/{quiz_id}', response_model=QuizRead)
 async def get_quiz_by_id(
-        session: SessionDep, quiz_id: uuid.UUID,
-        current_user: CurrentUser
+        session: ReadSessionDep, quiz_id: uuid.UUID,
+        request: Request, current_user: CurrentUser
 ):
-    quiz = await crud.get_quiz_by_id(session=session, quiz_id=quiz_id)
-    if not quiz:
-        raise HTTPException(status_code=404, detail='Quiz not found')
-    if not current_user.is_superuser and current_user.id != quiz.owner_id:
-        raise HTTPException(
-            status_code=403,
-            detail='The user doesn\'t have enough privileges'
-        )
-    return quiz
+    access = authorize(await crud.get_quiz_access(
+        session=session, user=current_user, quiz_id=quiz_id
+    ), 'Quiz not found')
+    etag = quiz_etag(quiz_id, access.version)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+
+    async def build() -> bytes:
+        quiz = await crud.get_quiz_by_id(session=session, quiz_id=quiz_id)
+        if not quiz:
+            raise HTTPException(status_code=404, detail='Quiz not found')
+        return serialize(QuizRead, quiz)
+
+    return await cached_quiz_response(
+        quiz_id, f'quiz:{access.version}', build, headers={'ETag': etag}
+    )
 
 @router.patch('/{quiz_id}', response_model=QuizRead)
 async def edit_quiz(
         session: SessionDep, quiz_id: uuid.UUID,
         update_data: QuizUpdate, current_user: CurrentUser
 ):
-    stmt = (select(Quiz).where(Quiz.id == quiz_id)
-            .options(selectinload(Quiz.questions)
-                     .selectinload(Question.answers)))
-    result = await session.exec(stmt)
-    quiz = result.one_or_none()
-    if not quiz:
-        raise HTTPException(status_code=404, detail='Quiz not found')
-    if current_user.id != quiz.owner_id and not current_user.is_superuser:
+    quiz, _, _ = authorize(await crud.get_quiz_for_user(
+        session=session, user=current_user, quiz_id=quiz_id,
+        with_questions=True
+    ), 'Quiz not found')
+    quiz = await crud.update_quiz(
+        session=session, db_quiz=quiz, update_data=update_data
+    )
+    await quiz_response_cache.invalidate(quiz_id)
+    return json_response(QuizRead, quiz)
+
+@router.post('/{quiz_id}/attempts', response_model=AttemptResult)
+async def submit_attempt(
+        session: SessionDep, quiz_id: uuid.UUID,
+        attempt_in: AttemptCreate, current_user: CurrentUser,
+        sync: bool = False
+):
+    access = authorize(await crud.get_quiz_access(
+        session=session, user=current_user, quiz_id=quiz_id
+    ), 'Quiz not found')
+    key = await get_answer_key(
+        session=session, quiz_id=quiz_id, version=access.version
+    )
+    try:
+        results = grade(key, attempt_in.answer_ids)
+    except UnknownAnswerError as exc:
         raise HTTPException(
-            status_code=403,
-            detail='The user doesn\'t have enough privileges'
+            status_code=400,
+            detail=f'Answer {exc.args[0]} does not belong to this quiz'
         )
-    db_quiz = await crud.update_quiz(
-        session=session, db_quiz=quiz, update_data=update_data
+    score = sum(results)
+    # By default the attempt is queued for a batched insert; sync=true
+    # only answers once the row is committed.
+    attempt_id = await record_attempt(
+        session=session, quiz_id=quiz_id, user_id=current_user.id,
+        answer_ids=attempt_in.answer_ids, score=score,
+        max_score=len(results), sync=sync
     )
-    return db_quiz
+    return json_response(AttemptResult, AttemptResult(
+        id=attempt_id, quiz_id=quiz_id, score=score,
+        max_score=len(results),
+        questions=[
+            QuestionResult(question_id=question_id, correct=correct)
+            for question_id, correct in zip(key.question_ids, results)
+        ]
+    ))
 
-@router.get('/user/{user_id}', response_model=list[QuizRead])
-async def get_user_quizzes(
-        session: SessionDep, user_id: uuid.UUID,
+@router.get('/{quiz_id}/stats', response_model=QuizStatsRead)
+async def get_quiz_stats(
+        session: ReadSessionDep, quiz_id: uuid.UUID,
         current_user: CurrentUser
 ):
-    quizzes = await crud.get_user_quizzes(
-        session=session, user_id=user_id
+    authorize(await crud.get_quiz_access(
+        session=session, user=current_user, quiz_id=quiz_id
+    ), 'Quiz not found')
+    quiz_stats, answer_rows = await crud.get_quiz_stats(
+        session=session, quiz_id=quiz_id
     )
+    attempts = quiz_stats.attempt_count if quiz_stats else 0
+    questions: list[QuestionStatsRead] = []
+    for question_id, answer_id, pick_count in answer_rows:
+        if not questions or questions[-1].question_id != question_id:
+            questions.append(
+                QuestionStatsRead(question_id=question_id, answers=[])
+            )
+        questions[-1].answers.append(AnswerStatsRead(
+            answer_id=answer_id, pick_count=pick_count,
+            pick_rate=pick_count / attempts if attempts else 0.0
+        ))
+    return json_response(QuizStatsRead, QuizStatsRead(
+        quiz_id=quiz_id, attempt_count=attempts,
+        average_score=(
+            quiz_stats.score_total / attempts if attempts else None
+        ),
+        average_ratio=(
+            quiz_stats.score_total / quiz_stats.max_score_total
+            if attempts and quiz_stats.max_score_total else None
+        ),
+        questions=questions
+    ))
+
+@router.get('/user/{user_id}', response_model=QuizPage)
+async def get_user_quizzes(
+        session: ReadSessionDep, user_id: uuid.UUID,
+        page: PageDep, current_user: CurrentUser
+):
     if current_user.id != user_id:
         raise HTTPException(
             status_code=403,
             detail='The user doesn\'t have enough privileges'
         )
-    if not quizzes:
+    quizzes = await crud.get_user_quizzes(
+        session=session, user_id=user_id,
+        limit=page.limit, after=page.after
+    )
+    if not quizzes and page.after is None:
         raise HTTPException(
             status_code=404, detail='Quizzes not found'
         )
-    return quizzes
\ No newline at end of file
+    items, next_cursor = paginate(quizzes, page.limit)
+    return json_response(
+        QuizPage, {'items': items, 'next_cursor': next_cursor}
+    )
+
+@router.get('/user/{user_id}/summary', response_model=QuizSummaryPage)
+async def get_user_quiz_summaries(
+        session: ReadSessionDep, user_id: uuid.UUID,
+        page: PageDep, current_user: CurrentUser
+):
+    if current_user.id != user_id:
+        raise HTTPException(
+            status_code=403,
+            detail='The user doesn\'t have enough privileges'
+        )
+    summaries = await crud.get_user_quiz_summaries(
+        session=session, user_id=user_id,
+        limit=page.limit, after=page.after
+    )
+    items, next_cursor = paginate(summaries, page.limit)
+    return json_response(
+        QuizSummaryPage, {'items': items, 'next_cursor': next_cursor}
+    )
+
+@router.get('/user/{user_id}/export')
+async def export_user_quizzes(
+        user_id: uuid.UUID, request: Request, current_user: CurrentUser
+):
+    if current_user.id != user_id:
+        raise HTTPException(
+            status_code=403,
+            detail='The user doesn\'t have enough privileges'
+        )
+
+    async def lines():
+        # The request's session may be closed before streaming ends, so
+        # the export owns its session for the lifetime of the response.
+        async with read_session_maker() as session:
+            async for batch in crud.stream_user_quizzes(
+                    session=session, user_id=user_id,
+                    batch_size=settings.EXPORT_BATCH_SIZE
+            ):
+                yield b''.join(
+                    serialize(QuizRead, quiz) + b'\n' for quiz in batch
+                )
+
+    return ndjson_response(request, lines())
+
+async def _ndjson_lines(
+        request: Request, max_line_bytes: int
+) -> AsyncIterator[tuple[int, bytes | None]]:
+    # Yields (line number, line) while the body is still arriving; lines
+    # over max_line_bytes are dropped and yielded as None.
+    buffer = b''
+    line_no = 0
+    too_long = False
+    async for chunk in request.stream():
+        *lines, buffer = (buffer + chunk).split(b'\n')
+        for line in lines:
+            line_no += 1
+            if too_long or len(line) > max_line_bytes:
+                too_long = False
+                yield line_no, None
+            else:
+                yield line_no, line
+        if len(buffer) > max_line_bytes:
+            too_long = True
+            buffer = b''
+    if buffer or too_long:
+        yield line_no + 1, None if too_long else buffer
+
+@router.post('/import', response_model=ImportReport)
+async def import_quizzes(
+        session: SessionDep, request: Request, current_user: CurrentUser
+):
+    report = ImportReport(imported=0, failed=0, batches=0, errors=[])
+    batch: list[QuizCreate] = []
+    batch_lines: list[int] = []
+
+    def record_error(line: int, detail: str) -> None:
+        report.failed += 1
+        if len(report.errors) < settings.IMPORT_MAX_REPORTED_ERRORS:
+            report.errors.append(ImportLineError(line=line, detail=detail))
+        else:
+            report.errors_truncated = True
+
+    async def flush() -> None:
+        try:
+            await crud.import_quiz_batch(
+                session=session, quizzes=batch, owner_id=current_user.id
+            )
+        except SQLAlchemyError as exc:
+            await session.rollback()
+            for line in batch_lines:
+                record_error(line, f'Database error: {type(exc).__name__}')
+        else:
+            report.imported += len(batch)
+            report.batches += 1
+        batch.clear()
+        batch_lines.clear()
+
+    async for line_no, line in _ndjson_lines(
+            request, settings.IMPORT_MAX_LINE_BYTES
+    ):
+        if line is None:
+            record_error(line_no, 'Line is too long')
+            continue
+        if not line.strip():
+            continue
+        try:
+            quiz = QuizCreate.model_validate_json(line)
+        except ValidationError as exc:
+            record_error(line_no, '; '.join(
+                f"{'.'.join(map(str, error['loc']))}: {error['msg']}"
+                for error in exc.errors()
+            ))
+            continue
+        batch.append(quiz)
+        batch_lines.append(line_no)
+        if len(batch) >= settings.IMPORT_BATCH_SIZE:
+            await flush()
+    if batch:
+        await flush()
+    return report
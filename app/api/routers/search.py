@@ -0,0 +1,31 @@
+from typing import Annotated
+from fastapi import APIRouter, Query
+from app import search
+from app.api.deps import ReadSessionDep, CurrentUser
+from app.api.responses import json_response
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.models import SearchHit, SearchPage
+
+router = APIRouter(prefix='/search', tags=['search'])
+
+
+@router.get('', response_model=SearchPage)
+async def search_quizzes(
+        session: ReadSessionDep, current_user: CurrentUser,
+        q: Annotated[str, Query(min_length=1, max_length=256)],
+        limit: Annotated[
+            int, Query(ge=1, le=MAX_PAGE_SIZE)
+        ] = DEFAULT_PAGE_SIZE,
+        offset: Annotated[int, Query(ge=0)] = 0
+):
+    rows = await search.search(
+        session=session, owner_id=current_user.id, q=q,
+        limit=limit, offset=offset
+    )
+    return json_response(SearchPage, SearchPage(
+        items=[
+            SearchHit.model_validate(row, from_attributes=True)
+            for row in rows[:limit]
+        ],
+        next_offset=offset + limit if len(rows) > limit else None
+    ))
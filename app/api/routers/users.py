@@ -2,7 +2,7 @@ import uuid
 from fastapi import APIRouter, HTTPException
 from app import crud
 from app.api.deps import SessionDep, CurrentUser
-from app.core.security import verify_password
+from app.core.security import verify_password_async
 from app.models import (
     UserRegister,
     UserCreate,
@@ -46,7 +46,7 @@ async def update_password(
             status_code=403,
             detail='The user doesn\'t have enough privileges'
         )
-    if verify_password(
+    if await verify_password_async(
             user_update_password.current_password,
             db_user.hashed_password
     ):
@@ -99,6 +99,5 @@ async def delete_user(
         raise HTTPException(
             status_code=403, detail='Superuser cannot be deleted'
         )
-    await session.delete(db_user)
-    await session.commit()
+    await crud.delete_user(session=session, db_user=db_user)
     return Message(message='User deleted successfully')
\ No newline at end of file
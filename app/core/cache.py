@@ -0,0 +1,168 @@
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Hashable
+from app.core.config import settings
+
+
+class TTLCache:
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[Hashable, tuple[Any, float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable) -> Any | None:
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        value, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if self.maxsize <= 0:
+            return
+        self._data[key] = (value, time.monotonic() + self.ttl)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def stats(self) -> dict:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+        }
+
+
+
+class MemoryResponseCache:
+    # Serialized response bodies per quiz. A quiz can have several cached
+    # variants (e.g. different pages), all dropped together on invalidate.
+    def __init__(self, max_bytes: int, ttl: float):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.size = 0
+        self._entries: OrderedDict[
+            tuple[uuid.UUID, str], tuple[bytes, float]
+        ] = OrderedDict()
+        self._variants: dict[uuid.UUID, set[str]] = {}
+
+    async def get(self, quiz_id: uuid.UUID, variant: str) -> bytes | None:
+        key = (quiz_id, variant)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        body, expires_at = entry
+        if expires_at <= time.monotonic():
+            self._discard(key)
+            return None
+        self._entries.move_to_end(key)
+        return body
+
+    async def set(self, quiz_id: uuid.UUID, variant: str, body: bytes) -> None:
+        if len(body) > self.max_bytes:
+            return
+        key = (quiz_id, variant)
+        self._discard(key)
+        self._entries[key] = (body, time.monotonic() + self.ttl)
+        self._variants.setdefault(quiz_id, set()).add(variant)
+        self.size += len(body)
+        while self.size > self.max_bytes:
+            self._discard(next(iter(self._entries)))
+
+    async def invalidate(self, quiz_id: uuid.UUID) -> None:
+        for variant in self._variants.pop(quiz_id, ()):
+            entry = self._entries.pop((quiz_id, variant), None)
+            if entry is not None:
+                self.size -= len(entry[0])
+
+    def _discard(self, key: tuple[uuid.UUID, str]) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self.size -= len(entry[0])
+        variants = self._variants.get(key[0])
+        if variants is not None:
+            variants.discard(key[1])
+            if not variants:
+                del self._variants[key[0]]
+
+
+class RedisResponseCache:
+    # One hash per quiz with a field per variant, so a single DEL
+    # invalidates every variant. Any client speaking the redis.asyncio
+    # API works, including fakeredis for local runs.
+    def __init__(self, client, ttl: int, prefix: str = 'quiz-response:'):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def _key(self, quiz_id: uuid.UUID) -> str:
+        return f'{self.prefix}{quiz_id}'
+
+    async def get(self, quiz_id: uuid.UUID, variant: str) -> bytes | None:
+        return await self.client.hget(self._key(quiz_id), variant)
+
+    async def set(self, quiz_id: uuid.UUID, variant: str, body: bytes) -> None:
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.hset(self._key(quiz_id), variant, body)
+            pipe.expire(self._key(quiz_id), self.ttl)
+            await pipe.execute()
+
+    async def invalidate(self, quiz_id: uuid.UUID) -> None:
+        await self.client.delete(self._key(quiz_id))
+
+
+class NullResponseCache:
+    async def get(self, quiz_id: uuid.UUID, variant: str) -> bytes | None:
+        return None
+
+    async def set(self, quiz_id: uuid.UUID, variant: str, body: bytes) -> None:
+        pass
+
+    async def invalidate(self, quiz_id: uuid.UUID) -> None:
+        pass
+
+
+def create_quiz_response_cache():
+    if settings.QUIZ_CACHE_BACKEND == 'redis':
+        from redis import asyncio as redis
+        return RedisResponseCache(
+            redis.from_url(settings.REDIS_URL), ttl=settings.QUIZ_CACHE_TTL
+        )
+    if settings.QUIZ_CACHE_BACKEND == 'memory':
+        return MemoryResponseCache(
+            max_bytes=settings.QUIZ_CACHE_MAX_BYTES,
+            ttl=settings.QUIZ_CACHE_TTL
+        )
+    return NullResponseCache()
+
+
+principal_cache = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL
+)
+answer_key_cache = TTLCache(
+    maxsize=settings.ANSWER_KEY_CACHE_SIZE,
+    ttl=settings.ANSWER_KEY_CACHE_TTL
+)
+quiz_response_cache = create_quiz_response_cache()
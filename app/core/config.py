@@ -1,6 +1,7 @@
 from pydantic import EmailStr
 from pydantic_settings import BaseSettings
 import sqlmodel
+from typing import Literal
 
 
 class Settings(BaseSettings):
@@ -13,6 +14,16 @@ class Settings(BaseSettings):
     POSTGRES_PORT: str
 
     DATABASE_URL: str
+    DATABASE_REPLICA_URL: str | None = None
+    REPLICA_STICKY_SECONDS: int = 5
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    DB_WARMUP_CONNECTIONS: int | None = None
+    INIT_DB_ON_STARTUP: bool = False
 
     SECRET_KEY: str
     ALGORITHM: str
@@ -21,6 +32,41 @@ class Settings(BaseSettings):
     FIRST_USER: str
     FIRST_USER_EMAIL: EmailStr
     FIRST_USER_PASSWORD: str
+
+    PASSWORD_HASH_EXECUTOR: Literal['thread', 'process'] = 'thread'
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_QUEUE_SIZE: int = 32
+
+    PRINCIPAL_CACHE_SIZE: int = 1024
+    PRINCIPAL_CACHE_TTL: float = 60.0
+
+    QUIZ_SUMMARY_USE_COUNTERS: bool = False
+    FAST_JSON_RESPONSES: bool = False
+    METRICS_ENABLED: bool = True
+    QUERY_PROFILER_ENABLED: bool = False
+    QUERY_PROFILER_REPEAT_THRESHOLD: int = 5
+    SLOW_QUERY_THRESHOLD: float | None = 0.5
+    SLOW_QUERY_EXPLAIN_RATE: float = 0.1
+    SLOW_QUERY_LOG_SIZE: int = 200
+    SLOW_QUERY_QUEUE_SIZE: int = 1000
+    BULK_MAX_ITEMS: int = 500
+    EXPORT_BATCH_SIZE: int = 100
+    IMPORT_BATCH_SIZE: int = 100
+    IMPORT_MAX_LINE_BYTES: int = 1024 * 1024
+    IMPORT_MAX_REPORTED_ERRORS: int = 100
+
+    ANSWER_KEY_CACHE_SIZE: int = 4096
+    ANSWER_KEY_CACHE_TTL: float = 600.0
+    ATTEMPT_BUFFER_SIZE: int = 10000
+    ATTEMPT_BATCH_SIZE: int = 500
+    ATTEMPT_FLUSH_INTERVAL: float = 0.2
+    ATTEMPT_ENQUEUE_TIMEOUT: float = 1.0
+
+    QUIZ_CACHE_BACKEND: Literal['none', 'memory', 'redis'] = 'memory'
+    QUIZ_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    QUIZ_CACHE_TTL: int = 300
+    REDIS_URL: str = 'redis://localhost:6379/0'
+
     class Config:
         env_file = '.env'
 
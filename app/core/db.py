@@ -1,21 +1,200 @@
+import asyncio
+import time
+from contextlib import AsyncExitStack
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import (
-    create_async_engine, async_session
+    AsyncEngine, async_sessionmaker, create_async_engine
 )
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, StaticPool
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 from app.models import User, UserCreate
 from app.core.config import settings
+from app.core.metrics import Gauge, db_pool_wait, record_statement, registry
+from app.core.slowlog import slow_query_log
 
 DATABASE_URL = settings.DATABASE_URL
 
-engine = create_async_engine(DATABASE_URL, echo=False)
-async_session_maker = sessionmaker(
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_count = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    def _create_connection(self):
+        # Opening a connection is not waiting for one: the time is noted on
+        # the new record and taken back out of the checkout in _do_get.
+        start = time.perf_counter()
+        record = super()._create_connection()
+        record.info['connect_time'] = time.perf_counter() - start
+        return record
+
+    def _do_get(self):
+        start = time.perf_counter()
+        connect_time = 0.0
+        try:
+            record = super()._do_get()
+            connect_time = record.info.pop('connect_time', 0.0)
+            return record
+        finally:
+            elapsed = time.perf_counter() - start - connect_time
+            db_pool_wait.observe(elapsed)
+            self.wait_count += 1
+            self.wait_time_total += elapsed
+            self.wait_time_max = max(self.wait_time_max, elapsed)
+
+
+def _engine_options(url: str) -> dict:
+    if url.startswith('sqlite') and ':memory:' in url:
+        return {'poolclass': StaticPool}
+    options = {
+        'poolclass': TimedQueuePool,
+        'pool_size': settings.DB_POOL_SIZE,
+        'max_overflow': settings.DB_MAX_OVERFLOW,
+        'pool_timeout': settings.DB_POOL_TIMEOUT,
+        'pool_recycle': settings.DB_POOL_RECYCLE,
+        'pool_pre_ping': settings.DB_POOL_PRE_PING,
+    }
+    if '+asyncpg' in url:
+        # SQLAlchemy's asyncpg adapter prepares statements through its own
+        # cache (prepared_statement_cache_size); statement_cache_size is
+        # asyncpg's cache underneath it. Both follow the setting, so 0
+        # turns prepared statements off entirely, e.g. behind PgBouncer.
+        options['connect_args'] = {
+            'prepared_statement_cache_size': settings.DB_STATEMENT_CACHE_SIZE,
+            'statement_cache_size': settings.DB_STATEMENT_CACHE_SIZE,
+        }
+    return options
+
+
+def _before_cursor_execute(
+        conn, cursor, statement, parameters, context, executemany
+):
+    context._metrics_start = time.perf_counter()
+
+
+def _after_cursor_execute(
+        conn, cursor, statement, parameters, context, executemany
+):
+    duration = time.perf_counter() - context._metrics_start
+    record_statement(duration, statement)
+    threshold = slow_query_log.threshold
+    if threshold is not None and duration >= threshold:
+        slow_query_log.record(
+            _async_engines.get(conn.engine), statement, parameters, duration,
+            executemany
+        )
+
+
+# The listeners get the sync engine; EXPLAINs need its async wrapper.
+_async_engines: dict = {}
+
+
+def create_engine(url: str) -> AsyncEngine:
+    db_engine = create_async_engine(url, echo=False, **_engine_options(url))
+    _async_engines[db_engine.sync_engine] = db_engine
+    if (
+            settings.METRICS_ENABLED or settings.QUERY_PROFILER_ENABLED
+            or settings.SLOW_QUERY_THRESHOLD is not None
+    ):
+        event.listen(
+            db_engine.sync_engine, 'before_cursor_execute',
+            _before_cursor_execute
+        )
+        event.listen(
+            db_engine.sync_engine, 'after_cursor_execute',
+            _after_cursor_execute
+        )
+    return db_engine
+
+
+engine = create_engine(DATABASE_URL)
+async_session_maker = async_sessionmaker(
     engine,
     expire_on_commit=False,
-    clas_=AsyncSession
+    class_=AsyncSession
 )
 
+replica_engine = (
+    create_engine(settings.DATABASE_REPLICA_URL)
+    if settings.DATABASE_REPLICA_URL else None
+)
+read_session_maker = async_sessionmaker(
+    replica_engine or engine,
+    expire_on_commit=False,
+    class_=AsyncSession
+)
+
+
+async def warm_up_pool(db_engine: AsyncEngine, connections: int) -> int:
+    # Opens the connections side by side so the pool really ends up holding
+    # that many, then hands them all back.
+    if not isinstance(db_engine.pool, AsyncAdaptedQueuePool):
+        connections = min(connections, 1)
+    async with AsyncExitStack() as stack:
+        conns = await asyncio.gather(*(
+            stack.enter_async_context(db_engine.connect())
+            for _ in range(connections)
+        ))
+        for conn in conns:
+            await conn.exec_driver_sql('SELECT 1')
+    return connections
+
+
+async def dispose_engines() -> None:
+    await engine.dispose()
+    if replica_engine is not None:
+        await replica_engine.dispose()
+
+
+def pool_status(db_engine: AsyncEngine) -> dict:
+    pool = db_engine.pool
+    status = {
+        'pool_class': type(pool).__name__,
+        'size': None,
+        'checked_in': None,
+        'checked_out': None,
+        'overflow': None,
+        'max_overflow': None,
+        'wait_count': 0,
+        'wait_time_total': 0.0,
+        'wait_time_max': 0.0,
+    }
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        status.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=max(pool.overflow(), 0),
+            max_overflow=pool._max_overflow,
+        )
+    if isinstance(pool, TimedQueuePool):
+        status.update(
+            wait_count=pool.wait_count,
+            wait_time_total=pool.wait_time_total,
+            wait_time_max=pool.wait_time_max,
+        )
+    return status
+
+
+def _pool_connections():
+    for name, db_engine in (('primary', engine), ('replica', replica_engine)):
+        if db_engine is None:
+            continue
+        status = pool_status(db_engine)
+        for state in ('checked_in', 'checked_out', 'overflow'):
+            if status[state] is not None:
+                yield (name, state), status[state]
+
+
+registry.register(Gauge(
+    'db_pool_connections', 'Pooled connections by state.',
+    _pool_connections, ('engine', 'state')
+))
+
+
 async def init_db(session: AsyncSession) -> None:
     from app import crud
     result = await session.exec(
@@ -29,4 +208,4 @@ async def init_db(session: AsyncSession) -> None:
             password=settings.FIRST_USER_PASSWORD,
             is_superuser=True
         )
-        user = await crud.create_user(session=session, user_create=user_in)
\ No newline at end of file
+        user = await crud.create_user(session=session, user_create=user_in)
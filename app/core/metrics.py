@@ -0,0 +1,236 @@
+import collections
+import math
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Callable, Iterable
+
+LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5,
+    5.0, 10.0
+)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+
+
+@dataclass(slots=True)
+class RequestStats:
+    statements: int = 0
+    db_time: float = 0.0
+    # Only collected when the query profiler is on: statement text (bind
+    # parameters are placeholders, so this is the shape) -> executions.
+    shapes: collections.Counter | None = None
+    # The ASGI scope, so that statements can be traced back to the route
+    # (the router stores the matched route in it).
+    scope: dict | None = None
+
+
+# Set by the HTTP middleware for the duration of a request; statements run
+# outside a request (e.g. the attempt flusher) only reach the global series.
+request_stats: ContextVar[RequestStats | None] = ContextVar(
+    'request_stats', default=None
+)
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(names: tuple[str, ...], values: tuple) -> str:
+    if not names:
+        return ''
+    pairs = ','.join(
+        '{}="{}"'.format(
+            name,
+            str(value).replace('\\', '\\\\').replace('"', '\\"')
+            .replace('\n', '\\n')
+        )
+        for name, value in zip(names, values)
+    )
+    return '{' + pairs + '}'
+
+
+class Counter:
+    kind = 'counter'
+
+    def __init__(
+            self, name: str, documentation: str,
+            labelnames: Iterable[str] = ()
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, *labels, amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self):
+        for labels, value in self._values.items():
+            yield self.name, self.labelnames, labels, value
+
+
+class Histogram:
+    kind = 'histogram'
+
+    def __init__(
+            self, name: str, documentation: str,
+            labelnames: Iterable[str] = (),
+            buckets: tuple[float, ...] = LATENCY_BUCKETS
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # Per label set: one slot per bucket plus +Inf, then sum and count.
+        self._series: dict[tuple, list] = {}
+
+    def observe(self, value: float, *labels) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [0] * (len(self.buckets) + 3)
+        series[bisect_left(self.buckets, value)] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    def samples(self):
+        bucket_names = self.labelnames + ('le',)
+        for labels, series in self._series.items():
+            cumulative = 0
+            for bound, count in zip(
+                    self.buckets + (math.inf,), series[:-2]
+            ):
+                cumulative += count
+                yield (
+                    f'{self.name}_bucket', bucket_names,
+                    labels + (_format_value(bound),), cumulative
+                )
+            yield f'{self.name}_sum', self.labelnames, labels, series[-2]
+            yield f'{self.name}_count', self.labelnames, labels, series[-1]
+
+
+class Gauge:
+    kind = 'gauge'
+
+    def __init__(
+            self, name: str, documentation: str,
+            collect: Callable[[], Iterable[tuple[tuple, float]]],
+            labelnames: Iterable[str] = ()
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._collect = collect
+
+    def samples(self):
+        for labels, value in self._collect():
+            yield self.name, self.labelnames, labels, value
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: list = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            for name, labelnames, labels, value in metric.samples():
+                lines.append(
+                    f'{name}{_format_labels(labelnames, labels)} '
+                    f'{_format_value(value)}'
+                )
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+http_requests = registry.register(Counter(
+    'http_requests_total', 'HTTP requests by route template and status.',
+    ('method', 'route', 'status')
+))
+http_request_duration = registry.register(Histogram(
+    'http_request_duration_seconds', 'HTTP request latency.',
+    ('method', 'route')
+))
+db_statements_per_request = registry.register(Histogram(
+    'db_statements_per_request', 'SQL statements issued per request.',
+    ('route',), buckets=COUNT_BUCKETS
+))
+db_time_per_request = registry.register(Histogram(
+    'db_time_per_request_seconds', 'Time spent in SQL per request.',
+    ('route',)
+))
+db_statement_duration = registry.register(Histogram(
+    'db_statement_duration_seconds', 'Latency of single SQL statements.'
+))
+db_pool_wait = registry.register(Histogram(
+    'db_pool_checkout_wait_seconds',
+    'Time spent waiting for a pooled connection.'
+))
+password_hash_duration = registry.register(Histogram(
+    'password_hash_duration_seconds',
+    'bcrypt time including the executor queue.', ('operation',),
+    buckets=(0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 2.0, 5.0)
+))
+
+
+def record_statement(duration: float, statement: str) -> None:
+    db_statement_duration.observe(duration)
+    stats = request_stats.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.db_time += duration
+        if stats.shapes is not None:
+            stats.shapes[statement] += 1
+
+
+UNMATCHED_ROUTE = '<unmatched>'
+
+
+def route_template(scope: dict) -> str:
+    return getattr(scope.get('route'), 'path', UNMATCHED_ROUTE)
+
+
+class MetricsMiddleware:
+    # Pure ASGI so that it adds no per-request task or body buffering. The
+    # route label is the matched template (FastAPI stores the route in the
+    # scope), never the raw path, which keeps UUIDs out of the labels.
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        stats = RequestStats(scope=scope)
+        token = request_stats.set(stats)
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message['type'] == 'http.response.start':
+                status_code = message['status']
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            request_stats.reset(token)
+            route = route_template(scope)
+            method = scope['method']
+            http_requests.inc(method, route, status_code)
+            http_request_duration.observe(elapsed, method, route)
+            db_statements_per_request.observe(stats.statements, route)
+            db_time_per_request.observe(stats.db_time, route)
@@ -0,0 +1,37 @@
+import base64
+import binascii
+import uuid
+from dataclasses import dataclass
+from typing import Sequence, TypeVar
+
+T = TypeVar('T')
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+@dataclass
+class PageParams:
+    limit: int = DEFAULT_PAGE_SIZE
+    after: uuid.UUID | None = None
+
+
+def encode_cursor(last_id: uuid.UUID) -> str:
+    return base64.urlsafe_b64encode(last_id.bytes).rstrip(b'=').decode()
+
+
+def decode_cursor(cursor: str) -> uuid.UUID:
+    padded = cursor + '=' * (-len(cursor) % 4)
+    try:
+        return uuid.UUID(bytes=base64.urlsafe_b64decode(padded))
+    except (binascii.Error, ValueError):
+        raise ValueError('Invalid cursor')
+
+
+def paginate(rows: Sequence[T], limit: int) -> tuple[list[T], str | None]:
+    # Callers fetch ``limit + 1`` rows ordered by id; the extra row only
+    # tells us whether another page exists.
+    items = list(rows[:limit])
+    if len(rows) > limit:
+        return items, encode_cursor(items[-1].id)
+    return items, None
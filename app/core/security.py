@@ -1,12 +1,20 @@
+import asyncio
+import time
 import uuid
 import jwt
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from fastapi import HTTPException, status
 from passlib.context import CryptContext
 from datetime import datetime, timedelta, timezone
 from app.core.config import settings
+from app.core.metrics import password_hash_duration
 
 
 pwd_context = CryptContext(schemes=['bcrypt'], deprecated='auto')
 
+_hash_executor: Executor | None = None
+_hash_in_flight = 0
+
 def create_access_token(user_id: uuid.UUID, expires_delta: timedelta):
     to_encode = {'sub': user_id}
     if expires_delta:
@@ -23,4 +31,57 @@ def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
 
 def get_hashed_password(password):
-    return pwd_context.hash(password)
\ No newline at end of file
+    return pwd_context.hash(password)
+
+def get_hash_executor() -> Executor:
+    global _hash_executor
+    if _hash_executor is None:
+        if settings.PASSWORD_HASH_EXECUTOR == 'process':
+            _hash_executor = ProcessPoolExecutor(
+                max_workers=settings.PASSWORD_HASH_WORKERS
+            )
+        else:
+            _hash_executor = ThreadPoolExecutor(
+                max_workers=settings.PASSWORD_HASH_WORKERS,
+                thread_name_prefix='password-hash'
+            )
+    return _hash_executor
+
+def shutdown_hash_executor() -> None:
+    global _hash_executor
+    if _hash_executor is not None:
+        _hash_executor.shutdown(wait=False, cancel_futures=True)
+        _hash_executor = None
+
+async def _run_in_hash_executor(operation: str, func, *args):
+    # bcrypt is deliberately slow, so it never runs on the event loop.
+    # Once every worker is busy and the queue is full we reject instead
+    # of letting requests pile up behind each other.
+    global _hash_in_flight
+    limit = settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_QUEUE_SIZE
+    if _hash_in_flight >= limit:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail='Server is busy, try again later',
+            headers={'Retry-After': '1'}
+        )
+    _hash_in_flight += 1
+    start = time.perf_counter()
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_hash_executor(), func, *args)
+    finally:
+        _hash_in_flight -= 1
+        password_hash_duration.observe(
+            time.perf_counter() - start, operation
+        )
+
+async def verify_password_async(plain_password, hashed_password) -> bool:
+    return await _run_in_hash_executor(
+        'verify', verify_password, plain_password, hashed_password
+    )
+
+async def hash_password_async(password) -> str:
+    return await _run_in_hash_executor(
+        'hash', get_hashed_password, password
+    )
@@ -0,0 +1,183 @@
+import asyncio
+import collections
+import logging
+import random
+import re
+from datetime import datetime, timezone
+from sqlalchemy.ext.asyncio import AsyncEngine
+from app.core.config import settings
+from app.core.metrics import request_stats, route_template
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+_EXPLAIN_TIMEOUT = 5.0
+
+_PLACEHOLDER = r'(?:\?|\$\d+(?:::[\w\[\]]+)?|%\(\w+\)s|:\w+)'
+_PLACEHOLDER_LIST = re.compile(
+    rf'\(\s*{_PLACEHOLDER}(?:\s*,\s*{_PLACEHOLDER})*\s*\)'
+)
+_REPEATED_LISTS = re.compile(r'\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+')
+
+
+def normalize_sql(statement: str) -> str:
+    # Statements are already parameterized; this only folds the parts that
+    # vary with the number of values (IN lists, multi-row VALUES) so that
+    # one query shape always reads the same.
+    statement = ' '.join(statement.split())
+    statement = _PLACEHOLDER_LIST.sub('(...)', statement)
+    return _REPEATED_LISTS.sub('(...), ...', statement)
+
+
+def _value_shape(value) -> str:
+    if isinstance(value, (list, tuple)):
+        return f'{type(value).__name__}[{len(value)}]'
+    return type(value).__name__
+
+
+def parameter_shapes(parameters, executemany: bool) -> str:
+    # Types only: values may hold personal data and never reach the log.
+    if executemany:
+        rows = list(parameters)
+        if not rows:
+            return '0 x ()'
+        return f'{len(rows)} x {parameter_shapes(rows[0], False)}'
+    if isinstance(parameters, dict):
+        return '{' + ', '.join(
+            f'{key}: {_value_shape(value)}'
+            for key, value in parameters.items()
+        ) + '}'
+    if not parameters:
+        return '()'
+    return '(' + ', '.join(_value_shape(value) for value in parameters) + ')'
+
+
+class SlowQueryLog:
+    # The engine listener only queues what it saw; normalizing, logging and
+    # the EXPLAIN run in a background task, so a slow statement costs its
+    # request nothing beyond a put_nowait. When the queue is full, entries
+    # are dropped rather than waited for.
+    def __init__(
+            self, *, threshold: float | None, explain_rate: float,
+            size: int, queue_size: int
+    ):
+        self.threshold = threshold
+        self.explain_rate = explain_rate
+        self.queue_size = queue_size
+        self.entries: collections.deque = collections.deque(maxlen=size)
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+        self.captured = 0
+        self.explained = 0
+        self.dropped = 0
+
+    def start(self) -> None:
+        if self._task is None:
+            self._queue = asyncio.Queue(maxsize=self.queue_size)
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        await self._queue.put(_STOP)
+        await self._task
+        self._task = None
+        self._queue = None
+
+    def record(
+            self, db_engine: AsyncEngine | None, statement: str, parameters,
+            duration: float, executemany: bool
+    ) -> None:
+        if statement.startswith('EXPLAIN'):
+            return
+        stats = request_stats.get()
+        route = (
+            route_template(stats.scope)
+            if stats is not None and stats.scope is not None else None
+        )
+        explain = (
+            db_engine is not None and not executemany
+            and random.random() < self.explain_rate
+        )
+        self.start()
+        try:
+            self._queue.put_nowait((
+                db_engine, statement, parameters, executemany, duration,
+                route, datetime.now(timezone.utc), explain
+            ))
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    def report(self) -> dict:
+        return {
+            'threshold_ms': (
+                self.threshold * 1000 if self.threshold is not None else None
+            ),
+            'captured': self.captured,
+            'explained': self.explained,
+            'dropped': self.dropped,
+            'items': list(reversed(self.entries)),
+        }
+
+    async def _run(self) -> None:
+        # The task may have been started from inside a request; its
+        # statements (the EXPLAINs) must not count towards that request.
+        request_stats.set(None)
+        while True:
+            item = await self._queue.get()
+            if item is _STOP:
+                break
+            try:
+                await self._capture(*item)
+            except Exception:
+                logger.exception('Failed to capture a slow query')
+
+    async def _capture(
+            self, db_engine, statement, parameters, executemany, duration,
+            route, at, explain
+    ) -> None:
+        sql = normalize_sql(statement)
+        shapes = parameter_shapes(parameters, executemany)
+        logger.warning(
+            'Slow query: %.1f ms on %s: %s %s',
+            duration * 1000, route or '-', sql, shapes
+        )
+        plan = None
+        if explain:
+            try:
+                plan = await asyncio.wait_for(
+                    self._explain(db_engine, statement, parameters),
+                    _EXPLAIN_TIMEOUT
+                )
+                self.explained += 1
+            except Exception:
+                logger.exception('EXPLAIN of a slow query failed')
+        self.captured += 1
+        self.entries.append({
+            'statement': sql,
+            'parameters': shapes,
+            'duration_ms': duration * 1000,
+            'route': route,
+            'at': at,
+            'plan': plan,
+        })
+
+    async def _explain(
+            self, db_engine: AsyncEngine, statement: str, parameters
+    ) -> list[str]:
+        # Neither form executes the statement.
+        async with db_engine.connect() as conn:
+            if conn.dialect.name == 'postgresql':
+                prefix = 'EXPLAIN (ANALYZE off) '
+            else:
+                prefix = 'EXPLAIN QUERY PLAN '
+            result = await conn.exec_driver_sql(prefix + statement, parameters)
+            return [str(row[-1]) for row in result]
+
+
+slow_query_log = SlowQueryLog(
+    threshold=settings.SLOW_QUERY_THRESHOLD,
+    explain_rate=settings.SLOW_QUERY_EXPLAIN_RATE,
+    size=settings.SLOW_QUERY_LOG_SIZE,
+    queue_size=settings.SLOW_QUERY_QUEUE_SIZE,
+)
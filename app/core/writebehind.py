@@ -0,0 +1,113 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable
+from fastapi import HTTPException, status
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class WriteBehindBuffer:
+    def __init__(
+            self, write: Callable[[list], Awaitable[None]], *,
+            max_size: int, batch_size: int, flush_interval: float,
+            put_timeout: float
+    ):
+        self._write = write
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.put_timeout = put_timeout
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+        self.written = 0
+        self.dropped = 0
+        self.flushes = 0
+        self.rejected = 0
+
+    def start(self) -> None:
+        if self._task is None:
+            self._queue = asyncio.Queue(maxsize=self.max_size)
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        # Queued rows are flushed before the worker exits.
+        if self._task is None:
+            return
+        await self._queue.put(_STOP)
+        await self._task
+        self._task = None
+        self._queue = None
+
+    async def put(self, row) -> None:
+        # The worker is started lazily so that the buffer also works when
+        # the app runs without its lifespan (e.g. over ASGITransport).
+        self.start()
+        try:
+            await asyncio.wait_for(self._queue.put(row), self.put_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail='Server is busy, try again later',
+                headers={'Retry-After': '1'}
+            )
+
+    def stats(self) -> dict:
+        return {
+            'pending': self._queue.qsize() if self._queue else 0,
+            'max_size': self.max_size,
+            'written': self.written,
+            'dropped': self.dropped,
+            'flushes': self.flushes,
+            'rejected': self.rejected,
+        }
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        queue = self._queue
+        stopping = False
+        while not stopping:
+            item = await queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                if queue.empty():
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                else:
+                    item = queue.get_nowait()
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            await self._flush(batch)
+
+    async def _flush(self, batch: list) -> None:
+        self.flushes += 1
+        try:
+            await self._write(batch)
+            self.written += len(batch)
+            return
+        except Exception:
+            logger.exception(
+                'Write-behind flush of %d rows failed, retrying one by one',
+                len(batch)
+            )
+        # One bad row (e.g. its quiz was deleted meanwhile) must not take
+        # the rest of the batch down with it.
+        for row in batch:
+            try:
+                await self._write([row])
+                self.written += 1
+            except Exception:
+                self.dropped += 1
+                logger.exception('Dropping write-behind row %r', row)
@@ -1,25 +1,58 @@
 import uuid
-from app.core.security import get_hashed_password, verify_password
+from collections import Counter
+from typing import AsyncIterator
+from app import search
+from app.core.cache import principal_cache
+from app.core.security import hash_password_async, verify_password_async
 from sqlmodel import select
-from sqlalchemy.orm import selectinload, joinedload
+from sqlalchemy import (
+    case, delete, distinct, false, func, insert, text, true, update
+)
+from sqlalchemy.orm import joinedload, selectinload
+from app.core.config import settings
 from app.api.deps import SessionDep
 from app.models import (
     User, UserCreate, UserUpdatePassword,
-    QuizCreate, Quiz, QuizUpdate, QuestionUpdate,
-    QuestionCreate, Question,
-    AnswerCreate, Answer, AnswerUpdate
+    QuizCreate, Quiz, QuizRead, QuizUpdate, QuestionUpdate,
+    QuestionCreate, Question, QuestionRead, QuestionBulkUpdate,
+    AnswerCreate, Answer, AnswerRead, AnswerUpdate, AnswerBulkUpdate,
+    Attempt, QuizStats, AnswerStats
 )
 
 
+def _question_quiz_id(question_id: uuid.UUID):
+    return (
+        select(Question.quiz_id)
+        .where(Question.id == question_id)
+        .scalar_subquery()
+    )
+
+async def _touch_quiz(
+        *, session: SessionDep, quiz_id,
+        questions: int = 0, answers: int = 0
+) -> None:
+    # Bumps the quiz version (used for ETags) and adjusts the counters.
+    # quiz_id may be a scalar subquery, so callers that only know a
+    # question id don't need an extra round trip to find its quiz.
+    await session.execute(
+        update(Quiz)
+        .where(Quiz.id == quiz_id)
+        .values(
+            version=Quiz.version + 1,
+            question_count=Quiz.question_count + questions,
+            answer_count=Quiz.answer_count + answers
+        )
+        .execution_options(synchronize_session=False)
+    )
+
 async def create_user(*, session: SessionDep, user_create: UserCreate) -> User:
     db_obj = User.model_validate(
         user_create, update={
-            'hashed_password': get_hashed_password(user_create.password)
+            'hashed_password': await hash_password_async(user_create.password)
         }
     )
     session.add(db_obj)
     await session.commit()
-    await session.refresh(db_obj)
     return db_obj
 
 async def user_update_password(
@@ -30,14 +63,31 @@ async def user_update_password(
     extra_data = {}
     if 'new_password' in user_data:
         password = user_data['new_password']
-        hashed_password = get_hashed_password(password)
+        hashed_password = await hash_password_async(password)
         extra_data['hashed_password'] = hashed_password
     db_user.sqlmodel_update(user_data, update=extra_data)
     session.add(db_user)
     await session.commit()
-    await session.refresh(db_user)
+    principal_cache.pop(db_user.id)
     return db_user
 
+async def delete_user(*, session: SessionDep, db_user: User) -> None:
+    # Set-based deletes: the ORM cascade would load every quiz, then every
+    # question of each quiz, then every answer of each question.
+    user_id = db_user.id
+    quiz_ids = select(Quiz.id).where(Quiz.owner_id == user_id)
+    await _delete_user_attempts(
+        session=session, user_id=user_id, keep_quiz_ids=quiz_ids
+    )
+    await search.unindex_owner(session=session, owner_id=user_id)
+    await _delete_quiz_rows(session=session, quiz_ids=quiz_ids)
+    await session.execute(
+        delete(User).where(User.id == user_id)
+        .execution_options(synchronize_session=False)
+    )
+    await session.commit()
+    principal_cache.pop(user_id)
+
 async def get_user_by_username(*, session: SessionDep, username: str) -> User | None:
     db_statement = select(User).where(User.username == username)
     result = await session.exec(db_statement)
@@ -49,7 +99,7 @@ async def authenticate(
     db_user = await get_user_by_username(session=session, username=username)
     if not db_user:
         return None
-    if not verify_password(password, db_user.hashed_password):
+    if not await verify_password_async(password, db_user.hashed_password):
         return None
     return db_user
 
@@ -59,47 +109,383 @@ async def clean_quiz_create(
 ) -> Quiz:
     db_obj = Quiz.model_validate(quiz, update={'owner_id': owner_id})
     session.add(db_obj)
+    await search.index_documents(session=session, quiz_ids=[db_obj.id])
     await session.commit()
-    await session.refresh(db_obj)
     return db_obj
 
+# SQLite's default SQLITE_MAX_VARIABLE_NUMBER is 32766; PostgreSQL's wire
+# protocol caps a statement at 32767 bind parameters.
+_MAX_BIND_PARAMS = {'sqlite': 32766, 'postgresql': 32767}
+
+def _chunk_size(session: SessionDep, rows: list[dict]) -> int:
+    limit = _MAX_BIND_PARAMS.get(session.bind.dialect.name, 32766)
+    return max(1, limit // len(rows[0]))
+
+def _build_quiz_rows(
+        quiz: QuizCreate, owner_id: uuid.UUID
+) -> tuple[dict, list[dict], list[dict], QuizRead]:
+    quiz_id = uuid.uuid4()
+    question_rows, answer_rows, questions_read = [], [], []
+    for question in quiz.questions:
+        question_id = uuid.uuid4()
+        question_rows.append({
+            'id': question_id, 'quiz_id': quiz_id,
+            'question': question.question
+        })
+        answers_read = []
+        for answer in question.answers or []:
+            answer_id = uuid.uuid4()
+            answer_rows.append({
+                'id': answer_id, 'question_id': question_id,
+                'text': answer.text, 'is_correct': answer.is_correct
+            })
+            answers_read.append(AnswerRead(
+                id=answer_id, text=answer.text, is_correct=answer.is_correct
+            ))
+        questions_read.append(QuestionRead(
+            id=question_id, question=question.question, answers=answers_read
+        ))
+    quiz_row = {
+        'id': quiz_id, 'owner_id': owner_id,
+        'title': quiz.title, 'description': quiz.description,
+        'question_count': len(question_rows),
+        'answer_count': len(answer_rows),
+        'version': 1
+    }
+    quiz_read = QuizRead(
+        id=quiz_id, owner_id=owner_id, title=quiz.title,
+        description=quiz.description, questions=questions_read
+    )
+    return quiz_row, question_rows, answer_rows, quiz_read
+
+async def _insert_quiz_rows(
+        *, session: SessionDep, quiz_rows: list[dict],
+        question_rows: list[dict], answer_rows: list[dict]
+) -> None:
+    # One multi-row INSERT per table, split only when a statement would
+    # exceed the driver's bind parameter limit.
+    for model, rows in (
+            (Quiz, quiz_rows), (Question, question_rows),
+            (Answer, answer_rows)
+    ):
+        if not rows:
+            continue
+        chunk_size = _chunk_size(session, rows)
+        for start in range(0, len(rows), chunk_size):
+            await session.execute(
+                insert(model).values(rows[start:start + chunk_size])
+            )
+    await search.index_documents(
+        session=session, quiz_ids=[row['id'] for row in quiz_rows],
+        question_ids=[row['id'] for row in question_rows],
+        answer_ids=[row['id'] for row in answer_rows]
+    )
+
 async def create_quiz_with_question(
         *, session: SessionDep, quiz: QuizCreate, owner_id: uuid.UUID
-) -> Quiz:
-    questions = []
-    for question in quiz.questions:
-        answers = [
-            Answer(
-                text=answer.text, is_correct=answer.is_correct
-            ) for answer in question.answers
-        ]
-        questions.append(Question(question=question.question, answers=answers))
-    db_quiz = Quiz(
-        title=quiz.title, description=quiz.description,
-        owner_id=owner_id, questions=questions
+) -> QuizRead:
+    quiz_row, question_rows, answer_rows, quiz_read = _build_quiz_rows(
+        quiz, owner_id
+    )
+    await _insert_quiz_rows(
+        session=session, quiz_rows=[quiz_row],
+        question_rows=question_rows, answer_rows=answer_rows
     )
-    session.add(db_quiz)
     await session.commit()
-    await session.refresh(db_quiz)
-    quiz_id = db_quiz.id
-    result = await session.exec(
-        select(Quiz).where(Quiz.id==quiz_id)
-        .options(
-            selectinload(Quiz.questions).selectinload(Question.answers)
-        )
+    return quiz_read
+
+async def import_quiz_batch(
+        *, session: SessionDep, quizzes: list[QuizCreate],
+        owner_id: uuid.UUID
+) -> None:
+    quiz_rows, question_rows, answer_rows = [], [], []
+    for quiz in quizzes:
+        quiz_row, questions, answers, _ = _build_quiz_rows(quiz, owner_id)
+        quiz_rows.append(quiz_row)
+        question_rows.extend(questions)
+        answer_rows.extend(answers)
+    await _insert_quiz_rows(
+        session=session, quiz_rows=quiz_rows,
+        question_rows=question_rows, answer_rows=answer_rows
     )
-    quiz_with_question = result.one()
-    return quiz_with_question
+    await session.commit()
 
 async def get_user_quizzes(
-        *, session: SessionDep, user_id: uuid.UUID
+        *, session: SessionDep, user_id: uuid.UUID,
+        limit: int, after: uuid.UUID | None = None
 ) -> list[Quiz]:
-    stmt = select(Quiz).where(
-        Quiz.owner_id == user_id).options(
+    stmt = select(Quiz).where(Quiz.owner_id == user_id)
+    if after is not None:
+        stmt = stmt.where(Quiz.id > after)
+    stmt = stmt.order_by(Quiz.id).limit(limit + 1).options(
         selectinload(Quiz.questions).selectinload(Question.answers)
     )
-    quizzes = await session.scalars(stmt)
-    return quizzes
+    result = await session.exec(stmt)
+    return list(result.all())
+
+async def stream_user_quizzes(
+        *, session: SessionDep, user_id: uuid.UUID, batch_size: int
+) -> AsyncIterator[list[Quiz]]:
+    # Server-side cursor; each batch is expunged once the caller is done
+    # with it, so memory stays bounded by batch_size whatever the bank.
+    stmt = (
+        select(Quiz).where(Quiz.owner_id == user_id).order_by(Quiz.id)
+        .options(selectinload(Quiz.questions).selectinload(Question.answers))
+        .execution_options(yield_per=batch_size)
+    )
+    result = await session.stream_scalars(stmt)
+    async for partition in result.partitions():
+        yield partition
+        session.expunge_all()
+
+async def get_user_quiz_summaries(
+        *, session: SessionDep, user_id: uuid.UUID,
+        limit: int, after: uuid.UUID | None = None
+):
+    if settings.QUIZ_SUMMARY_USE_COUNTERS:
+        stmt = select(
+            Quiz.id, Quiz.title, Quiz.description,
+            Quiz.question_count, Quiz.answer_count
+        ).where(Quiz.owner_id == user_id)
+        if after is not None:
+            stmt = stmt.where(Quiz.id > after)
+        stmt = stmt.order_by(Quiz.id).limit(limit + 1)
+    else:
+        page = select(
+            Quiz.id, Quiz.title, Quiz.description
+        ).where(Quiz.owner_id == user_id)
+        if after is not None:
+            page = page.where(Quiz.id > after)
+        page = page.order_by(Quiz.id).limit(limit + 1).subquery()
+        stmt = (
+            select(
+                page.c.id, page.c.title, page.c.description,
+                func.count(distinct(Question.id)).label('question_count'),
+                func.count(Answer.id).label('answer_count')
+            )
+            .select_from(page)
+            .outerjoin(Question, Question.quiz_id == page.c.id)
+            .outerjoin(Answer, Answer.question_id == Question.id)
+            .group_by(page.c.id, page.c.title, page.c.description)
+            .order_by(page.c.id)
+        )
+    result = await session.exec(stmt)
+    return list(result.all())
+
+def _allowed(user: User):
+    # The owner-or-superuser check is evaluated by the database, so one
+    # query tells "not found" (no row) apart from "forbidden"
+    # (allowed is false) without loading anything else.
+    if user.is_superuser:
+        return true().label('allowed')
+    return (Quiz.owner_id == user.id).label('allowed')
+
+async def get_quiz_access(
+        *, session: SessionDep, user: User,
+        quiz_id: uuid.UUID | None = None,
+        question_id: uuid.UUID | None = None,
+        answer_id: uuid.UUID | None = None
+):
+    stmt = select(Quiz.id.label('quiz_id'), Quiz.version, _allowed(user))
+    if answer_id is not None:
+        stmt = (
+            stmt.join(Question, Question.quiz_id == Quiz.id)
+            .join(Answer, Answer.question_id == Question.id)
+            .where(Answer.id == answer_id)
+        )
+    elif question_id is not None:
+        stmt = (
+            stmt.join(Question, Question.quiz_id == Quiz.id)
+            .where(Question.id == question_id)
+        )
+    else:
+        stmt = stmt.where(Quiz.id == quiz_id)
+    result = await session.exec(stmt)
+    return result.one_or_none()
+
+async def get_quiz_for_user(
+        *, session: SessionDep, user: User, quiz_id: uuid.UUID,
+        with_questions: bool = False
+):
+    stmt = select(
+        Quiz, Quiz.id.label('quiz_id'), _allowed(user)
+    ).where(Quiz.id == quiz_id)
+    if with_questions:
+        # Joined into the same SELECT, so a write that answers with the
+        # whole quiz needs no second read.
+        stmt = stmt.options(
+            joinedload(Quiz.questions).joinedload(Question.answers)
+        )
+    result = await session.exec(stmt)
+    return result.unique().one_or_none()
+
+async def get_question_for_user(
+        *, session: SessionDep, user: User, question_id: uuid.UUID
+):
+    stmt = (
+        select(Question, Question.quiz_id, _allowed(user))
+        .join(Quiz, Quiz.id == Question.quiz_id)
+        .where(Question.id == question_id)
+    )
+    result = await session.exec(stmt)
+    return result.one_or_none()
+
+async def get_answer_for_user(
+        *, session: SessionDep, user: User, answer_id: uuid.UUID
+):
+    stmt = (
+        select(Answer, Question.quiz_id, _allowed(user))
+        .join(Question, Question.id == Answer.question_id)
+        .join(Quiz, Quiz.id == Question.quiz_id)
+        .where(Answer.id == answer_id)
+    )
+    result = await session.exec(stmt)
+    return result.one_or_none()
+
+async def get_answer_key_rows(
+        *, session: SessionDep, quiz_id: uuid.UUID
+):
+    stmt = (
+        select(Question.id, Answer.id, Answer.is_correct)
+        .outerjoin(Answer, Answer.question_id == Question.id)
+        .where(Question.quiz_id == quiz_id)
+        .order_by(Question.id, Answer.id)
+    )
+    result = await session.exec(stmt)
+    return result.all()
+
+def _upsert(session: SessionDep):
+    if session.bind.dialect.name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    return dialect_insert
+
+def aggregate_attempt_stats(attempt_rows) -> tuple[list[dict], list[dict]]:
+    quiz_totals: dict[uuid.UUID, list[int]] = {}
+    picks: Counter = Counter()
+    for row in attempt_rows:
+        totals = quiz_totals.setdefault(row['quiz_id'], [0, 0, 0])
+        totals[0] += 1
+        totals[1] += row['score']
+        totals[2] += row['max_score']
+        for answer_id in set(row['answer_ids']):
+            picks[(uuid.UUID(answer_id), row['quiz_id'])] += 1
+    # Sorted so that concurrent upserts lock rows in the same order.
+    quiz_rows = [
+        {
+            'quiz_id': quiz_id, 'attempt_count': attempts,
+            'score_total': score, 'max_score_total': max_score
+        }
+        for quiz_id, (attempts, score, max_score)
+        in sorted(quiz_totals.items())
+    ]
+    answer_rows = [
+        {'answer_id': answer_id, 'quiz_id': quiz_id, 'pick_count': count}
+        for (answer_id, quiz_id), count in sorted(picks.items())
+    ]
+    return quiz_rows, answer_rows
+
+async def _increment_stats(
+        *, session: SessionDep, model, key: str, rows: list[dict],
+        counters: tuple[str, ...]
+) -> None:
+    # INSERT .. ON CONFLICT DO UPDATE SET n = n + excluded.n keeps the
+    # counters correct under concurrent writers without reading them.
+    insert_stmt = _upsert(session)
+    chunk_size = _chunk_size(session, rows)
+    for start in range(0, len(rows), chunk_size):
+        stmt = insert_stmt(model).values(rows[start:start + chunk_size])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[key],
+            set_={
+                name: getattr(model, name) + getattr(stmt.excluded, name)
+                for name in counters
+            }
+        )
+        await session.execute(stmt)
+
+async def create_attempts(
+        *, session: SessionDep, attempt_rows: list[dict]
+) -> None:
+    chunk_size = _chunk_size(session, attempt_rows)
+    for start in range(0, len(attempt_rows), chunk_size):
+        await session.execute(
+            insert(Attempt).values(attempt_rows[start:start + chunk_size])
+        )
+    quiz_rows, answer_rows = aggregate_attempt_stats(attempt_rows)
+    await _increment_stats(
+        session=session, model=QuizStats, key='quiz_id', rows=quiz_rows,
+        counters=('attempt_count', 'score_total', 'max_score_total')
+    )
+    if answer_rows:
+        await _increment_stats(
+            session=session, model=AnswerStats, key='answer_id',
+            rows=answer_rows, counters=('pick_count',)
+        )
+    await session.commit()
+
+async def get_quiz_stats(*, session: SessionDep, quiz_id: uuid.UUID):
+    quiz_stats = await session.get(QuizStats, quiz_id)
+    stmt = (
+        select(
+            Question.id, Answer.id,
+            func.coalesce(AnswerStats.pick_count, 0)
+        )
+        .join(Answer, Answer.question_id == Question.id)
+        .outerjoin(AnswerStats, AnswerStats.answer_id == Answer.id)
+        .where(Question.quiz_id == quiz_id)
+        .order_by(Question.id, Answer.id)
+    )
+    result = await session.exec(stmt)
+    return quiz_stats, result.all()
+
+async def stream_attempt_stat_rows(
+        *, session: SessionDep, batch_size: int
+) -> AsyncIterator[list[dict]]:
+    stmt = select(
+        Attempt.quiz_id, Attempt.score, Attempt.max_score, Attempt.answer_ids
+    ).execution_options(yield_per=batch_size)
+    result = await session.stream(stmt)
+    async for partition in result.mappings().partitions():
+        yield partition
+
+async def get_all_stats(*, session: SessionDep):
+    quiz_rows = await session.exec(select(QuizStats))
+    answer_rows = await session.exec(select(AnswerStats))
+    return quiz_rows.all(), answer_rows.all()
+
+async def lock_stats(*, session: SessionDep) -> None:
+    # Held until the session ends. Attempt inserts and their stats upserts
+    # wait for it, so a rebuild can't overwrite increments made after it
+    # read the attempts. Reads are not blocked.
+    if session.bind.dialect.name == 'postgresql':
+        tables = ', '.join(
+            model.__tablename__ for model in (Attempt, QuizStats, AnswerStats)
+        )
+        await session.execute(
+            text(f'LOCK TABLE {tables} IN SHARE ROW EXCLUSIVE MODE')
+        )
+    else:
+        # SQLite has no table locks, but any write statement takes the
+        # database-wide write lock, even one that matches no rows.
+        await session.execute(delete(QuizStats).where(false()))
+
+async def replace_stats(
+        *, session: SessionDep, quiz_rows: list[dict],
+        answer_rows: list[dict]
+) -> None:
+    await session.execute(delete(AnswerStats))
+    await session.execute(delete(QuizStats))
+    for model, rows in ((QuizStats, quiz_rows), (AnswerStats, answer_rows)):
+        if not rows:
+            continue
+        chunk_size = _chunk_size(session, rows)
+        for start in range(0, len(rows), chunk_size):
+            await session.execute(
+                insert(model).values(rows[start:start + chunk_size])
+            )
+    await session.commit()
 
 async def get_quiz_by_id(
         *, session: SessionDep, quiz_id: uuid.UUID
@@ -117,9 +503,10 @@ async def update_quiz(
 ) -> Quiz:
     quiz_data = update_data.model_dump(exclude_unset=True)
     db_quiz.sqlmodel_update(quiz_data)
+    db_quiz.version = Quiz.version + 1
     session.add(db_quiz)
+    await search.index_documents(session=session, quiz_ids=[db_quiz.id])
     await session.commit()
-    await session.refresh(db_quiz)
     return db_quiz
 
 async def question_create(
@@ -138,11 +525,16 @@ async def question_create(
         answers=answers
     )
     session.add(question)
-    await session.commit()
-    await session.refresh(question)
-    return await get_question_by_id(
-        session=session, question_id=question.id
+    await _touch_quiz(
+        session=session, quiz_id=question_data.quiz_id,
+        questions=1, answers=len(answers)
+    )
+    await search.index_documents(
+        session=session, question_ids=[question.id],
+        answer_ids=[answer.id for answer in answers]
     )
+    await session.commit()
+    return question
 
 async def get_question_by_id(
         *, session: SessionDep, question_id: uuid.UUID
@@ -150,15 +542,36 @@ async def get_question_by_id(
     stmt = (
         select(Question)
         .where(Question.id == question_id)
-        .options(
-            selectinload(Question.quiz),
-            selectinload(Question.answers)
-        )
+        .options(joinedload(Question.answers))
     )
     result = await session.exec(stmt)
-    question = result.one_or_none()
+    question = result.unique().one_or_none()
     return question
 
+async def get_quiz_questions(
+        *, session: SessionDep, quiz_id: uuid.UUID,
+        limit: int, after: uuid.UUID | None = None
+) -> list[Question]:
+    stmt = select(Question).where(Question.quiz_id == quiz_id)
+    if after is not None:
+        stmt = stmt.where(Question.id > after)
+    stmt = stmt.order_by(Question.id).limit(limit + 1).options(
+        selectinload(Question.answers)
+    )
+    result = await session.exec(stmt)
+    return list(result.all())
+
+async def get_question_answers(
+        *, session: SessionDep, question_id: uuid.UUID,
+        limit: int, after: uuid.UUID | None = None
+) -> list[Answer]:
+    stmt = select(Answer).where(Answer.question_id == question_id)
+    if after is not None:
+        stmt = stmt.where(Answer.id > after)
+    stmt = stmt.order_by(Answer.id).limit(limit + 1)
+    result = await session.exec(stmt)
+    return list(result.all())
+
 async def update_question(
         *, session: SessionDep, db_question: Question,
         update_data: QuestionUpdate
@@ -166,25 +579,13 @@ async def update_question(
     question_data = update_data.model_dump(exclude_unset=True)
     db_question.sqlmodel_update(question_data)
     session.add(db_question)
+    await _touch_quiz(session=session, quiz_id=db_question.quiz_id)
+    await search.index_documents(
+        session=session, question_ids=[db_question.id]
+    )
     await session.commit()
-    await session.refresh(db_question)
     return db_question
 
-async def get_answer_by_id(
-        *, session: SessionDep, answer_id: uuid.UUID
-) -> Answer | None:
-    stmt = (
-        select(Answer)
-        .where(Answer.id == answer_id)
-        .options(
-            joinedload(Answer.question)
-            .joinedload(Question.quiz)
-        )
-    )
-    result = await session.exec(stmt)
-    answer = result.one_or_none()
-    return answer
-
 async def update_answer(
         *, session: SessionDep, db_answer: Answer,
         update_data: AnswerUpdate
@@ -192,8 +593,11 @@ async def update_answer(
     answer_data = update_data.model_dump(exclude_unset=True)
     db_answer.sqlmodel_update(answer_data)
     session.add(db_answer)
+    await _touch_quiz(
+        session=session, quiz_id=_question_quiz_id(db_answer.question_id)
+    )
+    await search.index_documents(session=session, answer_ids=[db_answer.id])
     await session.commit()
-    await session.refresh(db_answer)
     return db_answer
 
 async def create_answer(
@@ -205,6 +609,292 @@ async def create_answer(
         question_id=answer_in.question_id
     )
     session.add(answer)
+    await _touch_quiz(
+        session=session, quiz_id=_question_quiz_id(answer_in.question_id),
+        answers=1
+    )
+    await search.index_documents(session=session, answer_ids=[answer.id])
+    await session.commit()
+    return answer
+
+async def _delete_quiz_rows(*, session: SessionDep, quiz_ids) -> None:
+    # quiz_ids may be a list or a subquery. Children are removed
+    # explicitly, as in bulk_delete_questions, since SQLite only honours
+    # ON DELETE CASCADE with foreign keys enabled.
+    question_ids = select(Question.id).where(Question.quiz_id.in_(quiz_ids))
+    for stmt in (
+            delete(Attempt).where(Attempt.quiz_id.in_(quiz_ids)),
+            delete(AnswerStats).where(AnswerStats.quiz_id.in_(quiz_ids)),
+            delete(QuizStats).where(QuizStats.quiz_id.in_(quiz_ids)),
+            delete(Answer).where(Answer.question_id.in_(question_ids)),
+            delete(Question).where(Question.quiz_id.in_(quiz_ids)),
+            delete(Quiz).where(Quiz.id.in_(quiz_ids)),
+    ):
+        await session.execute(
+            stmt.execution_options(synchronize_session=False)
+        )
+
+async def _delete_user_attempts(
+        *, session: SessionDep, user_id: uuid.UUID, keep_quiz_ids
+) -> None:
+    # Attempts on other owners' quizzes go with the user (the foreign key
+    # cascades on PostgreSQL), so their share of those quizzes' stats is
+    # subtracted again. Attempts on keep_quiz_ids are left to
+    # _delete_quiz_rows, which drops those quizzes' stats wholesale.
+    result = await session.execute(
+        select(
+            Attempt.quiz_id, Attempt.score, Attempt.max_score,
+            Attempt.answer_ids
+        ).where(
+            Attempt.user_id == user_id, Attempt.quiz_id.not_in(keep_quiz_ids)
+        )
+    )
+    quiz_rows, answer_rows = aggregate_attempt_stats(result.mappings().all())
+    for model, key, rows, counters in (
+            (QuizStats, 'quiz_id', quiz_rows,
+             ('attempt_count', 'score_total', 'max_score_total')),
+            (AnswerStats, 'answer_id', answer_rows, ('pick_count',)),
+    ):
+        if rows:
+            await _increment_stats(
+                session=session, model=model, key=key, counters=counters,
+                rows=[
+                    {**row, **{name: -row[name] for name in counters}}
+                    for row in rows
+                ]
+            )
+    await session.execute(
+        delete(Attempt).where(Attempt.user_id == user_id)
+        .execution_options(synchronize_session=False)
+    )
+
+async def delete_quiz(*, session: SessionDep, db_quiz: Quiz) -> None:
+    await search.unindex(session=session, quiz_ids=[db_quiz.id])
+    await _delete_quiz_rows(session=session, quiz_ids=[db_quiz.id])
+    await session.commit()
+
+async def delete_question(
+        *, session: SessionDep, db_question: Question
+) -> None:
+    answer_count = (
+        select(func.count(Answer.id))
+        .where(Answer.question_id == db_question.id)
+        .scalar_subquery()
+    )
+    await session.execute(
+        update(Quiz)
+        .where(Quiz.id == db_question.quiz_id)
+        .values(
+            version=Quiz.version + 1,
+            question_count=Quiz.question_count - 1,
+            answer_count=Quiz.answer_count - answer_count
+        )
+        .execution_options(synchronize_session=False)
+    )
+    await search.unindex(session=session, question_ids=[db_question.id])
+    await session.delete(db_question)
+    await session.commit()
+
+async def delete_answer(*, session: SessionDep, db_answer: Answer) -> None:
+    await _touch_quiz(
+        session=session, quiz_id=_question_quiz_id(db_answer.question_id),
+        answers=-1
+    )
+    await search.unindex(session=session, answer_ids=[db_answer.id])
+    await session.delete(db_answer)
+    await session.commit()
+
+async def get_access_map(
+        *, session: SessionDep, user: User,
+        model: type[Quiz] | type[Question] | type[Answer],
+        ids: list[uuid.UUID]
+) -> dict:
+    # Authorizes a whole batch of ids in one query; ids missing from the
+    # result don't exist.
+    if model is Quiz:
+        stmt = select(Quiz.id, Quiz.id.label('quiz_id'), _allowed(user))
+    elif model is Question:
+        stmt = (
+            select(Question.id, Question.quiz_id, _allowed(user))
+            .join(Quiz, Quiz.id == Question.quiz_id)
+        )
+    else:
+        stmt = (
+            select(Answer.id, Question.quiz_id, _allowed(user))
+            .join(Question, Question.id == Answer.question_id)
+            .join(Quiz, Quiz.id == Question.quiz_id)
+        )
+    ids = {item_id for item_id in ids if item_id is not None}
+    result = await session.exec(stmt.where(model.id.in_(ids)))
+    return {row.id: row for row in result.all()}
+
+async def _touch_quizzes(
+        *, session: SessionDep, quiz_ids: list[uuid.UUID],
+        questions: Counter | None = None, answers: Counter | None = None
+) -> None:
+    # One UPDATE for the whole batch; a CASE on the quiz id picks each
+    # quiz's counter deltas.
+    quiz_ids = set(quiz_ids)
+    if not quiz_ids:
+        return
+    values = {'version': Quiz.version + 1}
+    for column, deltas in (
+            (Quiz.question_count, questions), (Quiz.answer_count, answers)
+    ):
+        deltas = {
+            quiz_id: delta for quiz_id, delta in (deltas or {}).items()
+            if delta and quiz_id in quiz_ids
+        }
+        if deltas:
+            values[column.key] = column + case(
+                deltas, value=Quiz.id, else_=0
+            )
+    await session.execute(
+        update(Quiz)
+        .where(Quiz.id.in_(quiz_ids))
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+
+async def bulk_create_answers(
+        *, session: SessionDep, answers: list[AnswerCreate],
+        quiz_ids: list[uuid.UUID]
+) -> list[uuid.UUID]:
+    rows = [
+        {
+            'id': uuid.uuid4(), 'question_id': answer.question_id,
+            'text': answer.text, 'is_correct': answer.is_correct
+        }
+        for answer in answers
+    ]
+    if rows:
+        await session.execute(insert(Answer).values(rows))
+        await _touch_quizzes(
+            session=session, quiz_ids=quiz_ids, answers=Counter(quiz_ids)
+        )
+        await search.index_documents(
+            session=session, answer_ids=[row['id'] for row in rows]
+        )
+        await session.commit()
+    return [row['id'] for row in rows]
+
+async def bulk_update_answers(
+        *, session: SessionDep, updates: list[AnswerBulkUpdate],
+        quiz_ids: list[uuid.UUID]
+) -> None:
+    rows = [
+        {'id': item.id, **item.model_dump(exclude_unset=True, exclude={'id'})}
+        for item in updates
+    ]
+    rows = [row for row in rows if len(row) > 1]
+    if rows:
+        await session.execute(update(Answer), rows)
+        await search.index_documents(
+            session=session,
+            answer_ids=[row['id'] for row in rows if 'text' in row]
+        )
+    if quiz_ids:
+        await _touch_quizzes(session=session, quiz_ids=quiz_ids)
+        await session.commit()
+
+async def bulk_delete_answers(
+        *, session: SessionDep, answer_ids: list[uuid.UUID],
+        quiz_ids: list[uuid.UUID]
+) -> None:
+    if not answer_ids:
+        return
+    # A repeated id deletes one row, so it must decrement the count once.
+    owners = dict(zip(answer_ids, quiz_ids))
+    answer_ids, quiz_ids = list(owners), list(owners.values())
+    await session.execute(
+        delete(Answer).where(Answer.id.in_(answer_ids))
+        .execution_options(synchronize_session=False)
+    )
+    await search.unindex(session=session, answer_ids=answer_ids)
+    await _touch_quizzes(
+        session=session, quiz_ids=quiz_ids,
+        answers=Counter({k: -v for k, v in Counter(quiz_ids).items()})
+    )
+    await session.commit()
+
+async def bulk_create_questions(
+        *, session: SessionDep, questions: list[QuestionCreate]
+) -> list[uuid.UUID]:
+    question_rows, answer_rows = [], []
+    answer_counts = Counter()
+    for question in questions:
+        question_id = uuid.uuid4()
+        question_rows.append({
+            'id': question_id, 'quiz_id': question.quiz_id,
+            'question': question.question
+        })
+        for answer in question.answers or []:
+            answer_rows.append({
+                'id': uuid.uuid4(), 'question_id': question_id,
+                'text': answer.text, 'is_correct': answer.is_correct
+            })
+            answer_counts[question.quiz_id] += 1
+    if question_rows:
+        await _insert_quiz_rows(
+            session=session, quiz_rows=[],
+            question_rows=question_rows, answer_rows=answer_rows
+        )
+        quiz_ids = [question.quiz_id for question in questions]
+        await _touch_quizzes(
+            session=session, quiz_ids=quiz_ids,
+            questions=Counter(quiz_ids), answers=answer_counts
+        )
+        await session.commit()
+    return [row['id'] for row in question_rows]
+
+async def bulk_update_questions(
+        *, session: SessionDep, updates: list[QuestionBulkUpdate],
+        quiz_ids: list[uuid.UUID]
+) -> None:
+    rows = [
+        {'id': item.id, **item.model_dump(exclude_unset=True, exclude={'id'})}
+        for item in updates
+    ]
+    rows = [row for row in rows if len(row) > 1]
+    if rows:
+        await session.execute(update(Question), rows)
+        await search.index_documents(
+            session=session,
+            question_ids=[row['id'] for row in rows if 'question' in row]
+        )
+    if quiz_ids:
+        await _touch_quizzes(session=session, quiz_ids=quiz_ids)
+        await session.commit()
+
+async def bulk_delete_questions(
+        *, session: SessionDep, question_ids: list[uuid.UUID],
+        quiz_ids: list[uuid.UUID]
+) -> None:
+    if not question_ids:
+        return
+    owners = dict(zip(question_ids, quiz_ids))
+    question_ids, quiz_ids = list(owners), list(owners.values())
+    result = await session.exec(
+        select(Question.quiz_id, func.count(Answer.id))
+        .join(Answer, Answer.question_id == Question.id)
+        .where(Question.id.in_(question_ids))
+        .group_by(Question.quiz_id)
+    )
+    answer_counts = Counter({quiz_id: -count for quiz_id, count in result.all()})
+    # Answers are removed explicitly rather than relying on ON DELETE
+    # CASCADE, which SQLite only honours with foreign keys enabled.
+    await session.execute(
+        delete(Answer).where(Answer.question_id.in_(question_ids))
+        .execution_options(synchronize_session=False)
+    )
+    await session.execute(
+        delete(Question).where(Question.id.in_(question_ids))
+        .execution_options(synchronize_session=False)
+    )
+    await search.unindex(session=session, question_ids=question_ids)
+    await _touch_quizzes(
+        session=session, quiz_ids=quiz_ids,
+        questions=Counter({k: -v for k, v in Counter(quiz_ids).items()}),
+        answers=answer_counts
+    )
     await session.commit()
-    await session.refresh(answer)
-    return answer
\ No newline at end of file
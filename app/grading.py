@@ -0,0 +1,111 @@
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from app import crud
+from app.api.deps import SessionDep
+from app.core.cache import answer_key_cache
+from app.core.config import settings
+from app.core.db import async_session_maker
+from app.core.writebehind import WriteBehindBuffer
+
+
+class UnknownAnswerError(ValueError):
+    pass
+
+
+@dataclass(frozen=True, slots=True)
+class AnswerKey:
+    # Answers are numbered per question, so a question's selection and its
+    # correct answers are both plain int bitmaps and grading a question is
+    # a single integer comparison.
+    question_ids: tuple[uuid.UUID, ...]
+    answer_slots: dict[uuid.UUID, tuple[int, int]]
+    correct_masks: tuple[int, ...]
+
+
+def compile_answer_key(rows) -> AnswerKey:
+    question_ids: list[uuid.UUID] = []
+    answer_slots: dict[uuid.UUID, tuple[int, int]] = {}
+    correct_masks: list[int] = []
+    bit = 1
+    for question_id, answer_id, is_correct in rows:
+        if not question_ids or question_ids[-1] != question_id:
+            question_ids.append(question_id)
+            correct_masks.append(0)
+            bit = 1
+        if answer_id is None:
+            continue
+        answer_slots[answer_id] = (len(question_ids) - 1, bit)
+        if is_correct:
+            correct_masks[-1] |= bit
+        bit <<= 1
+    return AnswerKey(
+        question_ids=tuple(question_ids),
+        answer_slots=answer_slots,
+        correct_masks=tuple(correct_masks)
+    )
+
+
+def grade(key: AnswerKey, answer_ids: list[uuid.UUID]) -> list[bool]:
+    selected = [0] * len(key.correct_masks)
+    slots = key.answer_slots
+    for answer_id in answer_ids:
+        slot = slots.get(answer_id)
+        if slot is None:
+            raise UnknownAnswerError(answer_id)
+        selected[slot[0]] |= slot[1]
+    return [
+        chosen == correct
+        for chosen, correct in zip(selected, key.correct_masks)
+    ]
+
+
+async def get_answer_key(
+        *, session: SessionDep, quiz_id: uuid.UUID, version: int
+) -> AnswerKey:
+    # Any answer change bumps the quiz version, so an entry compiled for an
+    # older version is simply replaced.
+    cached = answer_key_cache.get(quiz_id)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    rows = await crud.get_answer_key_rows(session=session, quiz_id=quiz_id)
+    key = compile_answer_key(rows)
+    answer_key_cache.set(quiz_id, (version, key))
+    return key
+
+
+async def _write_attempts(attempt_rows: list[dict]) -> None:
+    async with async_session_maker() as session:
+        await crud.create_attempts(session=session, attempt_rows=attempt_rows)
+
+
+attempt_buffer = WriteBehindBuffer(
+    _write_attempts,
+    max_size=settings.ATTEMPT_BUFFER_SIZE,
+    batch_size=settings.ATTEMPT_BATCH_SIZE,
+    flush_interval=settings.ATTEMPT_FLUSH_INTERVAL,
+    put_timeout=settings.ATTEMPT_ENQUEUE_TIMEOUT
+)
+
+
+async def record_attempt(
+        *, session: SessionDep, quiz_id: uuid.UUID, user_id: uuid.UUID,
+        answer_ids: list[uuid.UUID], score: int, max_score: int,
+        sync: bool = False
+) -> uuid.UUID:
+    attempt_row = {
+        'id': uuid.uuid4(),
+        'quiz_id': quiz_id,
+        'user_id': user_id,
+        'score': score,
+        'max_score': max_score,
+        'answer_ids': [str(answer_id) for answer_id in answer_ids],
+        'created_at': datetime.now(timezone.utc),
+    }
+    if sync:
+        await crud.create_attempts(
+            session=session, attempt_rows=[attempt_row]
+        )
+    else:
+        await attempt_buffer.put(attempt_row)
+    return attempt_row['id']
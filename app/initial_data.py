@@ -1,10 +1,9 @@
 import asyncio
-from sqlmodel.ext.asyncio.session import AsyncSession
-from app.core.db import engine, init_db
+from app.core.db import async_session_maker, init_db
 
 
 async def main():
-    async with AsyncSession(engine) as session:
+    async with async_session_maker() as session:
         await init_db(session)
 
 if __name__ == '__main__':
@@ -1,6 +1,58 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from sqlalchemy.orm import configure_mappers
 from app.api.main import api_router
+from app.api.middleware import (
+    QueryProfilerMiddleware, ReadYourWritesMiddleware
+)
+from app.core.config import settings
+from app.core.db import (
+    async_session_maker, dispose_engines, engine, init_db, replica_engine,
+    warm_up_pool
+)
+from app.core.metrics import MetricsMiddleware
+from app.core.security import get_hash_executor, shutdown_hash_executor
+from app.core.slowlog import slow_query_log
+from app.grading import attempt_buffer
 
 
-app = FastAPI()
-app.include_router(api_router)
\ No newline at end of file
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Everything the first requests would otherwise pay for lazily:
+    # mapper configuration, pool connections and the hash workers.
+    configure_mappers()
+    if settings.INIT_DB_ON_STARTUP:
+        async with async_session_maker() as session:
+            await init_db(session)
+    connections = settings.DB_WARMUP_CONNECTIONS
+    if connections is None:
+        connections = settings.DB_POOL_SIZE
+    if connections > 0:
+        await warm_up_pool(engine, connections)
+        if replica_engine is not None:
+            await warm_up_pool(replica_engine, connections)
+    get_hash_executor()
+    attempt_buffer.start()
+    slow_query_log.start()
+    yield
+    await attempt_buffer.stop()
+    await slow_query_log.stop()
+    shutdown_hash_executor()
+    await dispose_engines()
+
+
+def create_app() -> FastAPI:
+    app = FastAPI(lifespan=lifespan)
+    app.include_router(api_router)
+    if replica_engine is not None:
+        app.add_middleware(ReadYourWritesMiddleware)
+    # Added before the metrics middleware so that it runs inside it and
+    # shares the request's statement counters.
+    if settings.QUERY_PROFILER_ENABLED:
+        app.add_middleware(QueryProfilerMiddleware)
+    if settings.METRICS_ENABLED:
+        app.add_middleware(MetricsMiddleware)
+    return app
+
+
+app = create_app()
@@ -1,4 +1,7 @@
 import uuid
+from datetime import datetime, timezone
+from typing import Literal
+from sqlalchemy import DDL, JSON, Column, DateTime, Index, event
 from sqlmodel import SQLModel, Field, Relationship
 from pydantic import EmailStr
 
@@ -6,7 +9,7 @@ from pydantic import EmailStr
 class UserBase(SQLModel):
     email: EmailStr = Field(index=True, max_length=255)
     is_superuser: bool = False
-    username: str = Field(max_length=256)
+    username: str = Field(max_length=256, unique=True, index=True)
 
 
 class UserCreate(UserBase):
@@ -54,8 +57,25 @@ class QuizRead(QuizBase):
     id: uuid.UUID
     questions: list['QuestionRead']
 
+class QuizPage(SQLModel):
+    items: list[QuizRead]
+    next_cursor: str | None = None
+
+
+class QuizSummary(QuizBase):
+    id: uuid.UUID
+    question_count: int
+    answer_count: int
+
+
+class QuizSummaryPage(SQLModel):
+    items: list[QuizSummary]
+    next_cursor: str | None = None
+
+
 class QuizQuestions(SQLModel):
     questions: list['QuestionRead']
+    next_cursor: str | None = None
 
 
 class QuizUpdate(QuizBase):
@@ -63,8 +83,13 @@ class QuizUpdate(QuizBase):
 
 
 class Quiz(QuizBase, table=True):
+    __table_args__ = (Index('ix_quiz_owner_id_id', 'owner_id', 'id'),)
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     owner_id: uuid.UUID = Field(foreign_key='user.id', ondelete='CASCADE')
+    question_count: int = Field(default=0)
+    answer_count: int = Field(default=0)
+    version: int = Field(default=1)
     owner: 'User' = Relationship(back_populates='quizzes')
     questions: list['Question'] = Relationship(
         back_populates='quiz',
@@ -90,11 +115,18 @@ class QuestionUpdate(QuestionBase):
     )
 
 
+class QuestionBulkUpdate(QuestionUpdate):
+    id: uuid.UUID
+
+
 class QuestionAnswers(SQLModel):
     answers: list['AnswerRead']
+    next_cursor: str | None = None
 
 
 class Question(QuestionBase, table=True):
+    __table_args__ = (Index('ix_question_quiz_id_id', 'quiz_id', 'id'),)
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     quiz_id: uuid.UUID = Field(foreign_key='quiz.id', ondelete='CASCADE')
     quiz: 'Quiz' = Relationship(back_populates='questions')
@@ -118,12 +150,151 @@ class AnswerUpdate(AnswerBase):
     text: str | None = Field(default=None, min_length=4, max_length=2048)
 
 
+class AnswerBulkUpdate(AnswerUpdate):
+    id: uuid.UUID
+
+
 class Answer(AnswerBase, table=True):
+    __table_args__ = (Index('ix_answer_question_id_id', 'question_id', 'id'),)
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     question_id: uuid.UUID = Field(foreign_key='question.id', ondelete='CASCADE')
     question: 'Question' = Relationship(back_populates='answers')
 
 
+class BulkItemResult(SQLModel):
+    index: int
+    id: uuid.UUID | None = None
+    status: int
+    detail: str | None = None
+
+
+class BulkResult(SQLModel):
+    results: list[BulkItemResult]
+
+
+class ImportLineError(SQLModel):
+    line: int
+    detail: str
+
+
+class ImportReport(SQLModel):
+    imported: int
+    failed: int
+    batches: int
+    errors: list[ImportLineError]
+    errors_truncated: bool = False
+
+
+class AttemptCreate(SQLModel):
+    answer_ids: list[uuid.UUID]
+
+
+class QuestionResult(SQLModel):
+    question_id: uuid.UUID
+    correct: bool
+
+
+class AttemptResult(SQLModel):
+    id: uuid.UUID
+    quiz_id: uuid.UUID
+    score: int
+    max_score: int
+    questions: list[QuestionResult]
+
+
+class Attempt(SQLModel, table=True):
+    __table_args__ = (Index('ix_attempt_quiz_id_id', 'quiz_id', 'id'),)
+
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    quiz_id: uuid.UUID = Field(foreign_key='quiz.id', ondelete='CASCADE')
+    user_id: uuid.UUID = Field(foreign_key='user.id', ondelete='CASCADE')
+    score: int
+    max_score: int
+    answer_ids: list[str] = Field(sa_column=Column(JSON, nullable=False))
+    created_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(DateTime(timezone=True), nullable=False)
+    )
+
+
+class QuizStats(SQLModel, table=True):
+    quiz_id: uuid.UUID = Field(
+        foreign_key='quiz.id', ondelete='CASCADE', primary_key=True
+    )
+    attempt_count: int = Field(default=0)
+    score_total: int = Field(default=0)
+    max_score_total: int = Field(default=0)
+
+
+class AnswerStats(SQLModel, table=True):
+    # No foreign key on answer_id: a pick recorded for an answer that was
+    # deleted after grading must not fail the attempt insert.
+    answer_id: uuid.UUID = Field(primary_key=True)
+    quiz_id: uuid.UUID = Field(
+        foreign_key='quiz.id', ondelete='CASCADE', index=True
+    )
+    pick_count: int = Field(default=0)
+
+
+class AnswerStatsRead(SQLModel):
+    answer_id: uuid.UUID
+    pick_count: int
+    pick_rate: float
+
+
+class QuestionStatsRead(SQLModel):
+    question_id: uuid.UUID
+    answers: list[AnswerStatsRead]
+
+
+class QuizStatsRead(SQLModel):
+    quiz_id: uuid.UUID
+    attempt_count: int
+    average_score: float | None
+    average_ratio: float | None
+    questions: list[QuestionStatsRead]
+
+
+class SearchHit(SQLModel):
+    kind: Literal['quiz', 'question', 'answer']
+    id: uuid.UUID
+    quiz_id: uuid.UUID
+    text: str
+    score: float
+
+
+class SearchPage(SQLModel):
+    items: list[SearchHit]
+    next_offset: int | None = None
+
+
+class WriteBufferStats(SQLModel):
+    pending: int
+    max_size: int
+    written: int
+    dropped: int
+    flushes: int
+    rejected: int
+
+
+class SlowQuery(SQLModel):
+    statement: str
+    parameters: str
+    duration_ms: float
+    route: str | None
+    at: datetime
+    plan: list[str] | None
+
+
+class SlowQueryReport(SQLModel):
+    threshold_ms: float | None
+    captured: int
+    explained: int
+    dropped: int
+    items: list[SlowQuery]
+
+
 class Token(SQLModel):
     access_token: str
     token_type: str = 'bearer'
@@ -134,4 +305,40 @@ class TokenPayload(SQLModel):
 
 
 class Message(SQLModel):
-    message: str
\ No newline at end of file
+    message: str
+
+
+class CacheStats(SQLModel):
+    hits: int
+    misses: int
+    size: int
+    maxsize: int
+
+
+class PoolStatus(SQLModel):
+    pool_class: str
+    size: int | None
+    checked_in: int | None
+    checked_out: int | None
+    overflow: int | None
+    max_overflow: int | None
+    wait_count: int
+    wait_time_total: float
+    wait_time_max: float
+
+
+class PoolReport(SQLModel):
+    primary: PoolStatus
+    replica: PoolStatus | None = None
+
+
+# SQLite has no tsvector, so search goes through an FTS5 table there (see
+# app/search.py). It is not a mapped table, hence the raw DDL.
+event.listen(SQLModel.metadata, 'after_create', DDL(
+    'CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5('
+    'body, kind UNINDEXED, object_id UNINDEXED, question_id UNINDEXED, '
+    'quiz_id UNINDEXED)'
+).execute_if(dialect='sqlite'))
+event.listen(SQLModel.metadata, 'before_drop', DDL(
+    'DROP TABLE IF EXISTS search_index'
+).execute_if(dialect='sqlite'))
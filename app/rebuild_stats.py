@@ -0,0 +1,90 @@
+import argparse
+import asyncio
+import sys
+from collections import Counter
+from app import crud
+from app.core.db import async_session_maker
+
+BATCH_SIZE = 1000
+
+
+async def compute_stats(session) -> tuple[list[dict], list[dict]]:
+    quiz_totals: dict = {}
+    picks: Counter = Counter()
+    async for partition in crud.stream_attempt_stat_rows(
+            session=session, batch_size=BATCH_SIZE
+    ):
+        quiz_rows, answer_rows = crud.aggregate_attempt_stats(partition)
+        for row in quiz_rows:
+            totals = quiz_totals.setdefault(row['quiz_id'], Counter())
+            totals.update({
+                'attempt_count': row['attempt_count'],
+                'score_total': row['score_total'],
+                'max_score_total': row['max_score_total'],
+            })
+        for row in answer_rows:
+            picks[(row['answer_id'], row['quiz_id'])] += row['pick_count']
+    quiz_rows = [
+        {'quiz_id': quiz_id, **totals}
+        for quiz_id, totals in sorted(quiz_totals.items())
+    ]
+    answer_rows = [
+        {'answer_id': answer_id, 'quiz_id': quiz_id, 'pick_count': count}
+        for (answer_id, quiz_id), count in sorted(picks.items())
+    ]
+    return quiz_rows, answer_rows
+
+
+def diff_stats(expected, stored, key: str) -> list[str]:
+    expected = {row[key]: row for row in expected}
+    stored = {row[key]: row for row in stored}
+    problems = []
+    for value in expected.keys() | stored.keys():
+        if expected.get(value) != stored.get(value):
+            problems.append(
+                f'{key}={value}: rebuilt {expected.get(value)}, '
+                f'stored {stored.get(value)}'
+            )
+    return problems
+
+
+async def main(check: bool) -> int:
+    async with async_session_maker() as session:
+        # Attempt writers wait until the rebuild commits (or the check
+        # ends). On SQLite they give up after the driver's busy timeout,
+        # so run the rebuild off-peak there.
+        await crud.lock_stats(session=session)
+        quiz_rows, answer_rows = await compute_stats(session)
+        if not check:
+            await crud.replace_stats(
+                session=session, quiz_rows=quiz_rows, answer_rows=answer_rows
+            )
+            print(
+                f'Rebuilt stats for {len(quiz_rows)} quizzes and '
+                f'{len(answer_rows)} answers'
+            )
+            return 0
+        stored_quizzes, stored_answers = await crud.get_all_stats(
+            session=session
+        )
+        problems = diff_stats(
+            quiz_rows, [row.model_dump() for row in stored_quizzes],
+            'quiz_id'
+        ) + diff_stats(
+            answer_rows, [row.model_dump() for row in stored_answers],
+            'answer_id'
+        )
+        for problem in problems:
+            print(problem)
+        print(f'{len(problems)} mismatching rows')
+        return 1 if problems else 0
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Recompute quiz statistics from the raw attempts.'
+    )
+    parser.add_argument(
+        '--check', action='store_true',
+        help='compare instead of overwriting; exits 1 on any mismatch'
+    )
+    sys.exit(asyncio.run(main(parser.parse_args().check)))
@@ -0,0 +1,175 @@
+import re
+import uuid
+from typing import Iterable
+from sqlalchemy import (
+    Uuid, column, delete, func, insert, literal, literal_column,
+    select, table, union_all
+)
+from app.api.deps import SessionDep
+from app.models import Answer, Question, Quiz
+
+# On PostgreSQL the documents are the rows themselves, matched through GIN
+# expression indexes (see the add_search_indexes migration); the
+# expressions below must stay identical to the indexed ones. SQLite has no
+# tsvector, so there an FTS5 table is kept in sync by the crud writes.
+TS_CONFIG = literal_column("'english'")
+
+search_index = table(
+    'search_index',
+    column('body'),
+    column('kind'),
+    column('object_id', Uuid),
+    column('question_id', Uuid),
+    column('quiz_id', Uuid),
+)
+
+_TERM = re.compile(r'\w+')
+_CHUNK_SIZE = 5000
+
+
+def _quiz_text():
+    return Quiz.title.op('||')(literal_column("' '")).op('||')(
+        func.coalesce(Quiz.description, literal_column("''"))
+    )
+
+
+def _uses_fts(session: SessionDep) -> bool:
+    return session.bind.dialect.name == 'sqlite'
+
+
+def _chunks(ids: list):
+    for start in range(0, len(ids), _CHUNK_SIZE):
+        yield ids[start:start + _CHUNK_SIZE]
+
+
+async def unindex(
+        *, session: SessionDep, quiz_ids: Iterable = (),
+        question_ids: Iterable = (), answer_ids: Iterable = ()
+) -> None:
+    # question_id is set on question and answer documents alike, so
+    # dropping a question also drops its answers.
+    if not _uses_fts(session):
+        return
+    for ids, key in (
+            (list(quiz_ids), search_index.c.quiz_id),
+            (list(question_ids), search_index.c.question_id),
+            (list(answer_ids), search_index.c.object_id)
+    ):
+        for chunk in _chunks(ids):
+            await session.execute(
+                delete(search_index).where(key.in_(chunk))
+            )
+
+
+async def unindex_owner(*, session: SessionDep, owner_id: uuid.UUID) -> None:
+    if not _uses_fts(session):
+        return
+    await session.execute(delete(search_index).where(
+        search_index.c.quiz_id.in_(
+            select(Quiz.id).where(Quiz.owner_id == owner_id)
+        )
+    ))
+
+
+async def index_documents(
+        *, session: SessionDep, quiz_ids: Iterable = (),
+        question_ids: Iterable = (), answer_ids: Iterable = ()
+) -> None:
+    # (Re)indexes exactly the given rows, copying their current text with
+    # INSERT .. SELECT so callers only need to know the ids.
+    if not _uses_fts(session):
+        return
+    await session.flush()
+    columns = ['body', 'kind', 'object_id', 'question_id', 'quiz_id']
+    sources = []
+    if quiz_ids := list(quiz_ids):
+        sources.append((quiz_ids, lambda ids: select(
+            _quiz_text(), literal('quiz'), Quiz.id, literal(None, Uuid),
+            Quiz.id
+        ).where(Quiz.id.in_(ids))))
+    if question_ids := list(question_ids):
+        sources.append((question_ids, lambda ids: select(
+            Question.question, literal('question'), Question.id,
+            Question.id, Question.quiz_id
+        ).where(Question.id.in_(ids))))
+    if answer_ids := list(answer_ids):
+        sources.append((answer_ids, lambda ids: select(
+            Answer.text, literal('answer'), Answer.id, Answer.question_id,
+            Question.quiz_id
+        ).join(Question, Question.id == Answer.question_id)
+            .where(Answer.id.in_(ids))))
+    for ids, source_for in sources:
+        for chunk in _chunks(ids):
+            await session.execute(delete(search_index).where(
+                search_index.c.object_id.in_(chunk)
+            ))
+            await session.execute(
+                insert(search_index).from_select(columns, source_for(chunk))
+            )
+
+
+def _fts_query(owner_id: uuid.UUID, q: str):
+    terms = _TERM.findall(q)
+    if not terms:
+        return None
+    # Every term is quoted so user input can't use FTS5 query syntax.
+    match = ' '.join(f'"{term}"' for term in terms)
+    fts_table = literal_column('search_index')
+    rank = func.bm25(fts_table)
+    return (
+        select(
+            search_index.c.kind, search_index.c.object_id.label('id'),
+            search_index.c.quiz_id, search_index.c.body.label('text'),
+            (-rank).label('score')
+        )
+        .select_from(search_index)
+        .join(Quiz, Quiz.id == search_index.c.quiz_id)
+        .where(fts_table.op('MATCH')(match), Quiz.owner_id == owner_id)
+        .order_by(rank, search_index.c.object_id)
+    )
+
+
+def _tsvector_query(owner_id: uuid.UUID, q: str):
+    query = func.websearch_to_tsquery(TS_CONFIG, q)
+
+    def document(text_expr):
+        return func.to_tsvector(TS_CONFIG, text_expr)
+
+    def ranked(kind: str, object_id, quiz_id, text_expr):
+        return select(
+            literal_column(f"'{kind}'").label('kind'),
+            object_id.label('id'), quiz_id.label('quiz_id'),
+            text_expr.label('text'),
+            func.ts_rank(document(text_expr), query).label('score')
+        ).where(document(text_expr).op('@@')(query))
+
+    quizzes = ranked('quiz', Quiz.id, Quiz.id, _quiz_text()).where(
+        Quiz.owner_id == owner_id
+    )
+    questions = ranked(
+        'question', Question.id, Question.quiz_id, Question.question
+    ).join(Quiz, Quiz.id == Question.quiz_id).where(
+        Quiz.owner_id == owner_id
+    )
+    answers = ranked(
+        'answer', Answer.id, Question.quiz_id, Answer.text
+    ).join(Question, Question.id == Answer.question_id).join(
+        Quiz, Quiz.id == Question.quiz_id
+    ).where(Quiz.owner_id == owner_id)
+    return union_all(quizzes, questions, answers).order_by(
+        literal_column('score').desc(), literal_column('id')
+    )
+
+
+async def search(
+        *, session: SessionDep, owner_id: uuid.UUID, q: str,
+        limit: int, offset: int = 0
+):
+    if _uses_fts(session):
+        stmt = _fts_query(owner_id, q)
+    else:
+        stmt = _tsvector_query(owner_id, q)
+    if stmt is None:
+        return []
+    result = await session.execute(stmt.limit(limit + 1).offset(offset))
+    return result.all()
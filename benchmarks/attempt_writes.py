@@ -0,0 +1,89 @@
+"""Commit-per-request vs. write-behind buffered attempt submissions.
+
+Afterwards the incrementally maintained stats are compared against a
+rebuild from the raw attempts.
+
+    python -m benchmarks.attempt_writes [--attempts 2000] [--concurrency 32]
+"""
+import argparse
+import asyncio
+import random
+
+from benchmarks import common
+
+common.configure()
+
+
+async def submit(client, headers, quiz, attempts: int, concurrency: int,
+                 sync: bool) -> float:
+    remaining = attempts
+
+    async def worker():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            response = await client.post(
+                f'/quizzes/{quiz["id"]}/attempts',
+                params={'sync': str(sync).lower()}, headers=headers,
+                json={'answer_ids': [
+                    random.choice(question['answers'])['id']
+                    for question in quiz['questions']
+                ]}
+            )
+            response.raise_for_status()
+
+    with common.Timer() as timer:
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return attempts / timer.elapsed
+
+
+async def count_attempts() -> int:
+    from sqlalchemy import func, select
+    from app.core.db import async_session_maker
+    from app.models import Attempt
+
+    async with async_session_maker() as session:
+        result = await session.execute(select(func.count(Attempt.id)))
+        return result.scalar_one()
+
+
+async def main(args):
+    from app.grading import attempt_buffer
+
+    await common.reset_schema()
+    async with common.make_client() as client:
+        owner_id = await common.sign_up(client, 'attempts')
+        headers = await common.login(client, 'attempts')
+        response = await client.post(
+            '/quizzes/create-quiz', headers=headers,
+            json=common.quiz_payload(owner_id, questions=10)
+        )
+        response.raise_for_status()
+        quiz = response.json()
+
+        rate = await submit(
+            client, headers, quiz, args.attempts, args.concurrency, True
+        )
+        print(f'commit per request: {rate:,.0f} attempts/s')
+        with common.Timer() as timer:
+            rate = await submit(
+                client, headers, quiz, args.attempts, args.concurrency, False
+            )
+            await attempt_buffer.stop()
+        print(
+            f'write-behind: {rate:,.0f} attempts/s acknowledged, '
+            f'{args.attempts / timer.elapsed:,.0f} attempts/s incl. final flush'
+        )
+        print(f'stored: {await count_attempts()} / {2 * args.attempts}')
+        print(f'buffer: {attempt_buffer.stats()}')
+
+    from app import rebuild_stats
+    if await rebuild_stats.main(check=True):
+        raise SystemExit('incremental stats drifted from the attempts')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--attempts', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=32)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,154 @@
+"""One-by-one answer and question endpoints vs. their /bulk counterparts.
+
+Each round creates and edits --items rows; the question rounds also
+delete them again, the bulk delete with one id repeated. After the run
+the quiz's question and answer counters are checked against the rows
+that are actually left.
+
+    python -m benchmarks.bulk_answers [--items 50] [--rounds 5]
+"""
+import argparse
+import asyncio
+import uuid
+
+from benchmarks import common
+
+common.configure()
+
+
+async def one_by_one(client, headers, question_id, items: int):
+    ids = []
+    for n in range(items):
+        response = await client.post('/answers/', headers=headers, json={
+            'question_id': question_id, 'text': f'Answer {n}'
+        })
+        response.raise_for_status()
+        ids.append(response.json()['id'])
+    for answer_id in ids:
+        response = await client.patch(
+            f'/answers/{answer_id}', headers=headers,
+            json={'text': 'Edited answer'}
+        )
+        response.raise_for_status()
+
+
+async def bulk(client, headers, question_id, items: int):
+    response = await client.post('/answers/bulk', headers=headers, json=[
+        {'question_id': question_id, 'text': f'Answer {n}'}
+        for n in range(items)
+    ])
+    response.raise_for_status()
+    ids = [result['id'] for result in response.json()['results']]
+    response = await client.patch('/answers/bulk', headers=headers, json=[
+        {'id': answer_id, 'text': 'Edited answer'} for answer_id in ids
+    ])
+    response.raise_for_status()
+
+
+async def questions_one_by_one(client, headers, quiz_id, items: int):
+    ids = []
+    for n in range(items):
+        response = await client.post('/questions/', headers=headers, json={
+            'quiz_id': quiz_id, 'question': f'Question {n}?',
+            'answers': [{'text': 'Answer one'}, {'text': 'Answer two'}]
+        })
+        response.raise_for_status()
+        ids.append(response.json()['id'])
+    for question_id in ids:
+        response = await client.patch(
+            f'/questions/{question_id}', headers=headers,
+            json={'question': 'Edited question?'}
+        )
+        response.raise_for_status()
+    for question_id in ids:
+        response = await client.delete(
+            f'/questions/{question_id}', headers=headers
+        )
+        response.raise_for_status()
+
+
+async def questions_bulk(client, headers, quiz_id, items: int):
+    response = await client.post('/questions/bulk', headers=headers, json=[
+        {
+            'quiz_id': quiz_id, 'question': f'Question {n}?',
+            'answers': [{'text': 'Answer one'}, {'text': 'Answer two'}]
+        }
+        for n in range(items)
+    ])
+    response.raise_for_status()
+    ids = [result['id'] for result in response.json()['results']]
+    response = await client.patch('/questions/bulk', headers=headers, json=[
+        {'id': question_id, 'question': 'Edited question?'}
+        for question_id in ids
+    ])
+    response.raise_for_status()
+    response = await client.request(
+        'DELETE', '/questions/bulk', headers=headers, json=ids + ids[:1]
+    )
+    response.raise_for_status()
+
+
+async def check_counters(quiz_id) -> None:
+    from sqlmodel import func, select
+    from app.core.db import async_session_maker
+    from app.models import Answer, Question, Quiz
+
+    async with async_session_maker() as session:
+        quiz = await session.get(Quiz, quiz_id)
+        questions = (await session.exec(
+            select(func.count()).where(Question.quiz_id == quiz.id)
+        )).one()
+        answers = (await session.exec(
+            select(func.count()).select_from(Answer)
+            .join(Question, Question.id == Answer.question_id)
+            .where(Question.quiz_id == quiz.id)
+        )).one()
+    if (quiz.question_count, quiz.answer_count) != (questions, answers):
+        raise SystemExit(
+            f'quiz counters drifted: {quiz.question_count} questions and '
+            f'{quiz.answer_count} answers recorded, {questions} and '
+            f'{answers} stored'
+        )
+
+
+async def run(name, func, client, headers, parent_id, args) -> None:
+    samples = []
+    for _ in range(args.rounds):
+        with common.Timer() as timer:
+            await func(client, headers, parent_id, args.items)
+        samples.append(timer.elapsed)
+    stats = common.summarize(samples)
+    print(
+        f'{name:>20}: {args.items} creates + {args.items} edits '
+        f'p50={stats["p50_ms"]:.1f}ms'
+    )
+
+
+async def main(args):
+    await common.reset_schema()
+    async with common.make_client() as client:
+        owner_id = await common.sign_up(client, 'bulk')
+        headers = await common.login(client, 'bulk')
+        response = await client.post(
+            '/quizzes/create-quiz', headers=headers,
+            json=common.quiz_payload(owner_id, questions=1, answers=0)
+        )
+        response.raise_for_status()
+        quiz_id = response.json()['id']
+        question_id = response.json()['questions'][0]['id']
+
+        for name, func in (('one by one', one_by_one), ('bulk', bulk)):
+            await run(name, func, client, headers, question_id, args)
+        for name, func in (
+                ('questions one by one', questions_one_by_one),
+                ('questions bulk', questions_bulk)
+        ):
+            await run(name, func, client, headers, quiz_id, args)
+    await check_counters(uuid.UUID(quiz_id))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--items', type=int, default=50)
+    parser.add_argument('--rounds', type=int, default=5)
+    asyncio.run(main(parser.parse_args()))
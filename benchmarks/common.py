@@ -0,0 +1,148 @@
+import os
+import tempfile
+import time
+import uuid
+from contextlib import contextmanager
+
+BENCHMARK_ENV = {
+    'PROJECT_NAME': 'SimpleQuizFastAPI benchmark',
+    'POSTGRES_USER': 'benchmark',
+    'POSTGRES_PASSWORD': 'benchmark',
+    'POSTGRES_DB': 'benchmark',
+    'POSTGRES_HOST': 'localhost',
+    'POSTGRES_PORT': '5432',
+    # Outside the checkout, so runs don't leave a database in the cwd.
+    'DATABASE_URL': 'sqlite+aiosqlite:///' + os.path.join(
+        tempfile.gettempdir(), 'quiz-benchmark.db'
+    ),
+    # HS256 keys shorter than 32 bytes make PyJWT warn on every token.
+    'SECRET_KEY': 'benchmark-secret-key-at-least-32-bytes-long',
+    'ALGORITHM': 'HS256',
+    'ACCESS_TOKEN_EXPIRE_MINUTES': '60',
+    'FIRST_USER': 'admin',
+    'FIRST_USER_EMAIL': 'admin@example.com',
+    'FIRST_USER_PASSWORD': 'benchmark-admin',
+}
+
+
+def configure(**overrides) -> None:
+    # Must run before anything under ``app`` is imported, because the
+    # settings object is built at import time.
+    for key, value in BENCHMARK_ENV.items():
+        os.environ.setdefault(key, value)
+    for key, value in overrides.items():
+        os.environ[key] = str(value)
+
+
+async def reset_schema() -> None:
+    from sqlmodel import SQLModel
+    from app.core.db import engine
+
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.drop_all)
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+
+def make_client(app=None):
+    import httpx
+    if app is None:
+        from app.main import app
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app),
+        base_url='http://benchmark'
+    )
+
+
+async def sign_up(client, username: str, password: str = 'benchmark-pass'):
+    response = await client.post('/users/sign-up', json={
+        'username': username,
+        'email': f'{username}@example.com',
+        'password': password,
+    })
+    response.raise_for_status()
+    return uuid.UUID(response.json()['id'])
+
+
+async def login(client, username: str, password: str = 'benchmark-pass'):
+    response = await client.post('/login/access-token', data={
+        'username': username, 'password': password
+    })
+    response.raise_for_status()
+    return {'Authorization': f'Bearer {response.json()["access_token"]}'}
+
+
+def quiz_payload(owner_id, questions: int = 5, answers: int = 4) -> dict:
+    return {
+        'title': f'Benchmark quiz {uuid.uuid4().hex[:8]}',
+        'description': 'Generated by the benchmarks',
+        'owner_id': str(owner_id),
+        'questions': [
+            {
+                'question': f'Question number {q}?',
+                'quiz_id': str(uuid.uuid4()),
+                'answers': [
+                    {'text': f'Answer {q}.{a}', 'is_correct': a == 0}
+                    for a in range(answers)
+                ],
+            }
+            for q in range(questions)
+        ],
+    }
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(samples: list[float]) -> dict:
+    return {
+        'count': len(samples),
+        'mean_ms': sum(samples) / len(samples) * 1000 if samples else 0.0,
+        'p50_ms': percentile(samples, 50) * 1000,
+        'p95_ms': percentile(samples, 95) * 1000,
+        'p99_ms': percentile(samples, 99) * 1000,
+    }
+
+
+class Timer:
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed = time.perf_counter() - self.start
+
+
+class StatementCounter:
+    def __init__(self):
+        self.statements: list[str] = []
+        self.parameters: list = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+        self.parameters.append(parameters)
+
+
+@contextmanager
+def count_statements(db_engine=None):
+    # Records every statement sent to the engine (the primary by default)
+    # inside the block, e.g. to pin the number of queries an endpoint
+    # issues or to EXPLAIN them afterwards.
+    from sqlalchemy import event
+    from app.core.db import engine
+
+    sync_engine = (db_engine or engine).sync_engine
+    counter = StatementCounter()
+    event.listen(sync_engine, 'before_cursor_execute', counter._record)
+    try:
+        yield counter
+    finally:
+        event.remove(sync_engine, 'before_cursor_execute', counter._record)
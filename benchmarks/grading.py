@@ -0,0 +1,123 @@
+"""Grading throughput against the 5,000 gradings/s per worker target.
+
+    python -m benchmarks.grading [--questions 20] [--answers 4]
+
+Measures grade() on the compiled answer key, then the real endpoint,
+POST /quizzes/{quiz_id}/attempts, over in-process ASGI with one worker.
+Two cheaper requests on the same stack show where the endpoint's time
+goes: GET /users/me (auth and routing, no SQL) and a 304 from
+GET /quizzes/{quiz_id} (the same plus the access/version query that
+grading also runs). The report says whether the endpoint meets the
+target and by how much it misses it.
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from benchmarks import common
+
+common.configure()
+
+TARGET = 5_000
+
+
+def bench_grade(key, submissions) -> float:
+    from app.grading import grade
+
+    start = time.perf_counter()
+    for answer_ids in submissions:
+        grade(key, answer_ids)
+    return len(submissions) / (time.perf_counter() - start)
+
+
+async def bench_http(send, requests: int, concurrency: int) -> float:
+    remaining = requests
+
+    async def worker():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            response = await send()
+            if response.status_code >= 400:
+                response.raise_for_status()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return requests / (time.perf_counter() - start)
+
+
+def report(label: str, rate: float) -> None:
+    print(f'{label:<44} {rate:>9,.0f}/s {1000 / rate:>8.3f} ms each')
+
+
+async def main(args):
+    import uuid
+    from app.core.db import async_session_maker
+    from app.grading import get_answer_key
+    from app.api.responses import quiz_etag
+
+    await common.reset_schema()
+    async with common.make_client() as client:
+        owner_id = await common.sign_up(client, 'grader')
+        headers = await common.login(client, 'grader')
+        response = await client.post(
+            '/quizzes/create-quiz', headers=headers,
+            json=common.quiz_payload(owner_id, args.questions, args.answers)
+        )
+        response.raise_for_status()
+        quiz = response.json()
+        quiz_id = uuid.UUID(quiz['id'])
+
+        submissions = [
+            [
+                uuid.UUID(random.choice(question['answers'])['id'])
+                for question in quiz['questions']
+            ]
+            for _ in range(args.submissions)
+        ]
+        async with async_session_maker() as session:
+            key = await get_answer_key(
+                session=session, quiz_id=quiz_id, version=1
+            )
+        bodies = [
+            {'answer_ids': [str(a) for a in answer_ids]}
+            for answer_ids in submissions[:args.http_submissions]
+        ]
+        conditional = {**headers, 'If-None-Match': quiz_etag(quiz_id, 1)}
+
+        report('grade() only', bench_grade(key, submissions))
+        report('GET /users/me (auth + routing, no SQL)', await bench_http(
+            lambda: client.get('/users/me', headers=headers),
+            args.http_submissions, args.concurrency
+        ))
+        report('GET /quizzes/{id} 304 (+ access query)', await bench_http(
+            lambda: client.get(f'/quizzes/{quiz_id}', headers=conditional),
+            args.http_submissions, args.concurrency
+        ))
+        rate = await bench_http(
+            lambda: client.post(
+                f'/quizzes/{quiz_id}/attempts', headers=headers,
+                json=random.choice(bodies)
+            ),
+            args.http_submissions, args.concurrency
+        )
+        report('POST /quizzes/{id}/attempts', rate)
+
+    if rate >= TARGET:
+        print(f'target {TARGET:,}/s per worker: met')
+    else:
+        print(
+            f'target {TARGET:,}/s per worker: MISSED by '
+            f'{TARGET - rate:,.0f}/s ({TARGET / rate:.1f}x short)'
+        )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--questions', type=int, default=20)
+    parser.add_argument('--answers', type=int, default=4)
+    parser.add_argument('--submissions', type=int, default=100_000)
+    parser.add_argument('--http-submissions', type=int, default=2_000)
+    parser.add_argument('--concurrency', type=int, default=16)
+    asyncio.run(main(parser.parse_args()))
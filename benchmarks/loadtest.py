@@ -0,0 +1,205 @@
+"""Mixed-workload load test with per-route latency percentiles.
+
+Seeds users, quizzes, questions and answers, then runs virtual users that
+pick requests according to ``--mix`` for ``--duration`` seconds. Without
+``--base-url`` the app is driven in-process over ASGI against
+DATABASE_URL (a SQLite file in the temp dir by default; export a
+Postgres URL to use that); with it, requests go to a running server,
+e.g. a local ``uvicorn app.main:app``, whose database must already be
+migrated.
+
+    python -m benchmarks.loadtest [--users 8] [--concurrency 32]
+        [--duration 30] [--mix login=1,get_quiz=12,create_quiz=1,edit_answer=4]
+        [--base-url http://127.0.0.1:8000] [--output results.json]
+"""
+import argparse
+import asyncio
+import json
+import platform
+import random
+import time
+import uuid
+from collections import defaultdict
+
+from benchmarks import common
+
+common.configure()
+
+DEFAULT_MIX = 'login=1,get_quiz=12,create_quiz=1,edit_answer=4'
+
+
+async def seed(client, args) -> list[dict]:
+    users = []
+    run = uuid.uuid4().hex[:6]
+    for n in range(args.users):
+        username = f'load-{run}-{n}'
+        owner_id = await common.sign_up(client, username)
+        headers = await common.login(client, username)
+        quizzes, answer_ids = [], []
+        for _ in range(args.quizzes):
+            response = await client.post(
+                '/quizzes/create-quiz', headers=headers,
+                json=common.quiz_payload(owner_id, args.questions, args.answers)
+            )
+            response.raise_for_status()
+            quiz = response.json()
+            quizzes.append(quiz['id'])
+            answer_ids.extend(
+                answer['id']
+                for question in quiz['questions']
+                for answer in question['answers']
+            )
+        users.append({
+            'username': username, 'owner_id': owner_id, 'headers': headers,
+            'quizzes': quizzes, 'answers': answer_ids,
+        })
+    return users
+
+
+def login(user, args):
+    return 'POST /login/access-token', {
+        'method': 'POST', 'url': '/login/access-token',
+        'data': {'username': user['username'], 'password': 'benchmark-pass'},
+    }
+
+
+def get_quiz(user, args):
+    return 'GET /quizzes/{quiz_id}', {
+        'method': 'GET', 'url': f'/quizzes/{random.choice(user["quizzes"])}',
+        'headers': user['headers'],
+    }
+
+
+def create_quiz(user, args):
+    return 'POST /quizzes/create-quiz', {
+        'method': 'POST', 'url': '/quizzes/create-quiz',
+        'headers': user['headers'],
+        'json': common.quiz_payload(
+            user['owner_id'], args.questions, args.answers
+        ),
+    }
+
+
+def edit_answer(user, args):
+    return 'PATCH /answers/{answer_id}', {
+        'method': 'PATCH', 'url': f'/answers/{random.choice(user["answers"])}',
+        'headers': user['headers'],
+        'json': {'text': f'Edited answer {random.randrange(10**6)}'},
+    }
+
+
+ACTIONS = {
+    'login': login,
+    'get_quiz': get_quiz,
+    'create_quiz': create_quiz,
+    'edit_answer': edit_answer,
+}
+
+
+def parse_mix(mix: str) -> dict[str, int]:
+    weights = {}
+    for part in mix.split(','):
+        name, _, weight = part.partition('=')
+        if name not in ACTIONS:
+            raise SystemExit(
+                f'unknown action {name!r}, expected one of {sorted(ACTIONS)}'
+            )
+        weights[name] = int(weight or 1)
+    return weights
+
+
+async def virtual_user(client, users, args, weights, deadline, samples,
+                       errors):
+    names, name_weights = list(weights), list(weights.values())
+    while time.perf_counter() < deadline:
+        user = random.choice(users)
+        action = random.choices(names, name_weights)[0]
+        route, request = ACTIONS[action](user, args)
+        start = time.perf_counter()
+        try:
+            response = await client.request(**request)
+            failed = response.status_code >= 400
+        except Exception:
+            failed = True
+        samples[route].append(time.perf_counter() - start)
+        if failed:
+            errors[route] += 1
+
+
+def make_client(args):
+    import httpx
+    limits = httpx.Limits(max_connections=args.concurrency)
+    if args.base_url:
+        return httpx.AsyncClient(
+            base_url=args.base_url, limits=limits, timeout=60
+        )
+    return common.make_client()
+
+
+async def main(args):
+    weights = parse_mix(args.mix)
+    if not args.base_url:
+        await common.reset_schema()
+    async with make_client(args) as client:
+        users = await seed(client, args)
+        samples: dict[str, list[float]] = defaultdict(list)
+        errors: dict[str, int] = defaultdict(int)
+        started = time.perf_counter()
+        deadline = started + args.duration
+        await asyncio.gather(*(
+            virtual_user(
+                client, users, args, weights, deadline, samples, errors
+            )
+            for _ in range(args.concurrency)
+        ))
+        elapsed = time.perf_counter() - started
+
+    routes = {}
+    for route, route_samples in sorted(samples.items()):
+        stats = common.summarize(route_samples)
+        stats['errors'] = errors[route]
+        stats['rps'] = len(route_samples) / elapsed
+        routes[route] = stats
+    total = sum(len(route_samples) for route_samples in samples.values())
+    report = {
+        'target': args.base_url or 'asgi',
+        'python': platform.python_version(),
+        'config': {
+            key: value for key, value in vars(args).items()
+            if key != 'output'
+        },
+        'elapsed_s': elapsed,
+        'requests': total,
+        'rps': total / elapsed,
+        'errors': sum(errors.values()),
+        'routes': routes,
+    }
+
+    print(f'{total} requests in {elapsed:.1f}s ({total / elapsed:,.0f} req/s)')
+    print(f'{"route":<32}{"count":>8}{"rps":>9}{"p50 ms":>9}'
+          f'{"p95 ms":>9}{"p99 ms":>9}{"errors":>8}')
+    for route, stats in routes.items():
+        print(
+            f'{route:<32}{stats["count"]:>8}{stats["rps"]:>9.1f}'
+            f'{stats["p50_ms"]:>9.1f}{stats["p95_ms"]:>9.1f}'
+            f'{stats["p99_ms"]:>9.1f}{stats["errors"]:>8}'
+        )
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+            file.write('\n')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--users', type=int, default=8)
+    parser.add_argument('--quizzes', type=int, default=5,
+                        help='quizzes seeded per user')
+    parser.add_argument('--questions', type=int, default=10)
+    parser.add_argument('--answers', type=int, default=4)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=30.0)
+    parser.add_argument('--mix', default=DEFAULT_MIX)
+    parser.add_argument('--base-url')
+    parser.add_argument('--output', help='write the JSON report here')
+    asyncio.run(main(parser.parse_args()))
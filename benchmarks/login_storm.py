@@ -0,0 +1,86 @@
+"""p99 latency of GET /quizzes/{id} with and without a concurrent login storm.
+
+    python -m benchmarks.login_storm [--logins 16] [--reads 500] [--blocking]
+
+``--blocking`` hashes on the event loop like the old code did, for comparison.
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks import common
+
+common.configure()
+
+
+async def read_quiz(client, headers, quiz_id, count, samples):
+    for _ in range(count):
+        start = time.perf_counter()
+        response = await client.get(f'/quizzes/{quiz_id}', headers=headers)
+        samples.append(time.perf_counter() - start)
+        response.raise_for_status()
+
+
+async def login_storm(client, username, stop: asyncio.Event):
+    while not stop.is_set():
+        await client.post('/login/access-token', data={
+            'username': username, 'password': 'benchmark-pass'
+        })
+
+
+async def run_reads(client, headers, quiz_id, args):
+    samples: list[float] = []
+    per_reader = args.reads // args.readers
+    await asyncio.gather(*(
+        read_quiz(client, headers, quiz_id, per_reader, samples)
+        for _ in range(args.readers)
+    ))
+    return samples
+
+
+async def main(args):
+    from app.core import security
+
+    if args.blocking:
+        async def inline(operation, func, *func_args):
+            return func(*func_args)
+        security._run_in_hash_executor = inline
+
+    await common.reset_schema()
+    async with common.make_client() as client:
+        owner_id = await common.sign_up(client, 'reader')
+        await common.sign_up(client, 'storm')
+        headers = await common.login(client, 'reader')
+        response = await client.post(
+            '/quizzes/create-quiz', headers=headers,
+            json=common.quiz_payload(owner_id)
+        )
+        response.raise_for_status()
+        quiz_id = response.json()['id']
+
+        idle = await run_reads(client, headers, quiz_id, args)
+
+        stop = asyncio.Event()
+        storm = [
+            asyncio.create_task(login_storm(client, 'storm', stop))
+            for _ in range(args.logins)
+        ]
+        busy = await run_reads(client, headers, quiz_id, args)
+        stop.set()
+        await asyncio.gather(*storm, return_exceptions=True)
+
+    for name, samples in (('idle', idle), ('login storm', busy)):
+        stats = common.summarize(samples)
+        print(
+            f'{name:>12}: n={stats["count"]} p50={stats["p50_ms"]:.1f}ms '
+            f'p99={stats["p99_ms"]:.1f}ms'
+        )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--logins', type=int, default=16)
+    parser.add_argument('--reads', type=int, default=500)
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--blocking', action='store_true')
+    asyncio.run(main(parser.parse_args()))
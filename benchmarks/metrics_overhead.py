@@ -0,0 +1,64 @@
+"""Per-request and per-statement cost of the metrics instrumentation.
+
+Times MetricsMiddleware around a no-op ASGI app against the bare app, and
+record_statement() on its own, so no database or HTTP stack is involved.
+
+    python -m benchmarks.metrics_overhead [--iterations 200000]
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks import common
+
+common.configure()
+
+
+class Route:
+    path = '/quizzes/{quiz_id}'
+
+
+async def noop_app(scope, receive, send):
+    scope['route'] = Route
+    await send({'type': 'http.response.start', 'status': 200})
+    await send({'type': 'http.response.body', 'body': b''})
+
+
+async def receive():
+    return {'type': 'http.request', 'body': b''}
+
+
+async def send(message):
+    pass
+
+
+async def per_call(app, iterations: int) -> float:
+    scope = {'type': 'http', 'method': 'GET', 'path': '/'}
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await app(dict(scope), receive, send)
+    return (time.perf_counter() - start) / iterations
+
+
+async def main(args):
+    from app.core.metrics import (
+        MetricsMiddleware, RequestStats, record_statement, request_stats
+    )
+
+    bare = await per_call(noop_app, args.iterations)
+    wrapped = await per_call(MetricsMiddleware(noop_app), args.iterations)
+    print(f'middleware: {(wrapped - bare) * 1e6:.2f}us per request')
+
+    token = request_stats.set(RequestStats())
+    start = time.perf_counter()
+    for _ in range(args.iterations):
+        record_statement(0.0005, 'SELECT 1')
+    elapsed = (time.perf_counter() - start) / args.iterations
+    request_stats.reset(token)
+    print(f'record_statement: {elapsed * 1e6:.2f}us per statement')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--iterations', type=int, default=200_000)
+    asyncio.run(main(parser.parse_args()))
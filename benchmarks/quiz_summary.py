@@ -0,0 +1,96 @@
+"""Full quiz tree vs. summary projection for one user with many quizzes.
+
+    python -m benchmarks.quiz_summary [--quizzes 10000]
+"""
+import argparse
+import asyncio
+import uuid
+
+from benchmarks import common
+
+common.configure()
+
+
+async def seed(owner_id, quizzes: int, questions: int, answers: int):
+    from sqlalchemy import insert
+    from app.core.db import async_session_maker
+    from app.models import Answer, Question, Quiz, User
+
+    quiz_rows, question_rows, answer_rows = [], [], []
+    for n in range(quizzes):
+        quiz_id = uuid.uuid4()
+        quiz_rows.append({
+            'id': quiz_id, 'owner_id': owner_id,
+            'title': f'Benchmark quiz {n}', 'description': None,
+            'question_count': questions,
+            'answer_count': questions * answers,
+        })
+        for q in range(questions):
+            question_id = uuid.uuid4()
+            question_rows.append({
+                'id': question_id, 'quiz_id': quiz_id,
+                'question': f'Question {q}?',
+            })
+            answer_rows.extend(
+                {
+                    'id': uuid.uuid4(), 'question_id': question_id,
+                    'text': f'Answer {a}', 'is_correct': a == 0,
+                }
+                for a in range(answers)
+            )
+    async with async_session_maker() as session:
+        session.add(User(
+            id=owner_id, username='summary', email='summary@example.com',
+            hashed_password='-'
+        ))
+        await session.flush()
+        for model, rows in (
+                (Quiz, quiz_rows), (Question, question_rows),
+                (Answer, answer_rows)
+        ):
+            await session.execute(insert(model), rows)
+        await session.commit()
+
+
+async def measure(name, func, repeat: int):
+    from app.core.db import async_session_maker
+
+    samples = []
+    for _ in range(repeat):
+        async with async_session_maker() as session:
+            with common.Timer() as timer:
+                rows = await func(session)
+        samples.append(timer.elapsed)
+    stats = common.summarize(samples)
+    print(
+        f'{name:>20}: rows={len(rows)} p50={stats["p50_ms"]:.1f}ms '
+        f'p99={stats["p99_ms"]:.1f}ms'
+    )
+
+
+async def main(args):
+    from app import crud
+    from app.core.config import settings
+
+    await common.reset_schema()
+    owner_id = uuid.uuid4()
+    await seed(owner_id, args.quizzes, args.questions, args.answers)
+
+    await measure('full tree', lambda session: crud.get_user_quizzes(
+        session=session, user_id=owner_id, limit=args.quizzes
+    ), args.repeat)
+    for use_counters in (False, True):
+        settings.QUIZ_SUMMARY_USE_COUNTERS = use_counters
+        name = 'summary (counters)' if use_counters else 'summary (COUNT)'
+        await measure(name, lambda session: crud.get_user_quiz_summaries(
+            session=session, user_id=owner_id, limit=args.quizzes
+        ), args.repeat)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--quizzes', type=int, default=10_000)
+    parser.add_argument('--questions', type=int, default=5)
+    parser.add_argument('--answers', type=int, default=4)
+    parser.add_argument('--repeat', type=int, default=5)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,97 @@
+"""FastAPI's response_model path vs. the FAST_JSON_RESPONSES path.
+
+Both serialize the same in-memory ORM graph, so no database is involved.
+
+    python -m benchmarks.serialization [--sizes 100 1000 10000]
+"""
+import argparse
+import asyncio
+import time
+import uuid
+
+from benchmarks import common
+
+common.configure()
+
+
+def build_quiz(answers: int, per_question: int = 4):
+    from app.models import Answer, Question, Quiz
+
+    quiz_id = uuid.uuid4()
+    questions = []
+    for q in range(max(1, answers // per_question)):
+        question_id = uuid.uuid4()
+        questions.append(Question(
+            id=question_id, quiz_id=quiz_id,
+            question=f'Question number {q}?',
+            answers=[
+                Answer(
+                    question_id=question_id, text=f'Answer {q}.{a}',
+                    is_correct=a == 0
+                )
+                for a in range(per_question)
+            ]
+        ))
+    return Quiz(
+        id=quiz_id, owner_id=uuid.uuid4(), title='Benchmark quiz',
+        description='Generated by the benchmarks', questions=questions
+    )
+
+
+def response_field(model):
+    try:
+        from fastapi.utils import create_model_field as create_field
+    except ImportError:
+        from fastapi.utils import create_response_field as create_field
+    return create_field(name='response', type_=model, mode='serialization')
+
+
+async def fastapi_path(field, quiz) -> bytes:
+    from fastapi.responses import JSONResponse
+    from fastapi.routing import serialize_response
+
+    content = await serialize_response(
+        field=field, response_content=quiz, is_coroutine=True
+    )
+    return JSONResponse(content).body
+
+
+async def timed(func, rounds: int) -> float:
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        await func()
+        samples.append(time.perf_counter() - start)
+    return common.percentile(samples, 50) * 1000
+
+
+async def main(args):
+    from app.api.responses import serialize
+    from app.models import QuizRead
+
+    field = response_field(QuizRead)
+    for size in args.sizes:
+        quiz = build_quiz(size)
+        rounds = max(3, args.budget // size)
+
+        async def fast():
+            serialize(QuizRead, quiz)
+
+        default_ms = await timed(lambda: fastapi_path(field, quiz), rounds)
+        fast_ms = await timed(fast, rounds)
+        print(
+            f'{size:>6} answers: response_model p50={default_ms:.2f}ms '
+            f'fast p50={fast_ms:.2f}ms ({default_ms / fast_ms:.1f}x)'
+        )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        '--sizes', type=int, nargs='+', default=[100, 1000, 10000]
+    )
+    parser.add_argument(
+        '--budget', type=int, default=200_000,
+        help='answers serialized per size; sets the number of rounds'
+    )
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,74 @@
+"""Request latency with the slow-query log capturing every statement.
+
+Runs with a zero threshold, so that each statement of each request goes
+through the slow-query path, and compares GET /quizzes/{quiz_id} latency
+against the same requests with the log switched off. The background
+worker is then drained and one captured entry is printed with its plan.
+
+    python -m benchmarks.slow_queries [--requests 500] [--explain-rate 1.0]
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from benchmarks import common
+
+common.configure(QUIZ_CACHE_BACKEND='none', SLOW_QUERY_THRESHOLD=0)
+
+
+async def timed_requests(client, url: str, headers: dict, count: int):
+    samples = []
+    for _ in range(count):
+        start = time.perf_counter()
+        response = await client.get(url, headers=headers)
+        samples.append(time.perf_counter() - start)
+        response.raise_for_status()
+    return samples
+
+
+async def main(args):
+    from app.core.slowlog import slow_query_log
+
+    slow_query_log.explain_rate = args.explain_rate
+    await common.reset_schema()
+    async with common.make_client() as client:
+        owner_id = await common.sign_up(client, 'slow-queries')
+        headers = await common.login(client, 'slow-queries')
+        response = await client.post(
+            '/quizzes/create-quiz', headers=headers,
+            json=common.quiz_payload(owner_id, 10, 4)
+        )
+        response.raise_for_status()
+        url = f'/quizzes/{response.json()["id"]}'
+
+        slow_query_log.threshold = None
+        off = await timed_requests(client, url, headers, args.requests)
+        slow_query_log.threshold = 0.0
+        on = await timed_requests(client, url, headers, args.requests)
+    await slow_query_log.stop()
+
+    for name, samples in (('log off', off), ('log on', on)):
+        stats = common.summarize(samples)
+        print(
+            f'{name:<8} p50 {stats["p50_ms"]:.2f} ms  '
+            f'p95 {stats["p95_ms"]:.2f} ms'
+        )
+    report = slow_query_log.report()
+    print(
+        f'captured {report["captured"]}, explained {report["explained"]}, '
+        f'dropped {report["dropped"]}'
+    )
+    sample = next(
+        (item for item in report['items'] if item['plan']),
+        report['items'][0] if report['items'] else None
+    )
+    if sample:
+        print(json.dumps(sample, indent=2, default=str))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--explain-rate', type=float, default=1.0)
+    asyncio.run(main(parser.parse_args()))
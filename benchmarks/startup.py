@@ -0,0 +1,105 @@
+"""Cold start: import time, lifespan startup and the first served requests.
+
+Every run is a fresh interpreter. Results are printed as JSON, so they can
+be stored and compared across releases.
+
+    python -m benchmarks.startup [--runs 5] [--warmup 0 5] [--output FILE]
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from benchmarks import common
+
+common.configure()
+
+CHILD = '''
+import asyncio, json, os, time
+start = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+
+
+async def run():
+    from datetime import timedelta
+    import httpx
+    from app.core.security import create_access_token
+    token = create_access_token(os.environ['BENCHMARK_USER_ID'], timedelta(minutes=5))
+    headers = {'Authorization': f'Bearer {token}'}
+    transport = httpx.ASGITransport(app=app.main.app)
+    async with app.main.app.router.lifespan_context(app.main.app):
+        started = time.perf_counter()
+        async with httpx.AsyncClient(transport=transport, base_url='http://startup') as client:
+            timings = []
+            for _ in range(2):
+                t = time.perf_counter()
+                response = await client.get('/users/me', headers=headers)
+                response.raise_for_status()
+                timings.append(time.perf_counter() - t)
+    return started, timings
+
+lifespan_start = time.perf_counter()
+started, (first, second) = asyncio.run(run())
+print(json.dumps({
+    'import_s': imported - start,
+    'startup_s': started - lifespan_start,
+    'first_request_s': first,
+    'second_request_s': second,
+    'to_first_response_s': started - start + first,
+}))
+'''
+
+
+async def prepare() -> str:
+    from app.core.config import settings
+    from app.core.db import async_session_maker, init_db
+    from app import crud
+
+    await common.reset_schema()
+    async with async_session_maker() as session:
+        await init_db(session)
+        user = await crud.get_user_by_username(
+            session=session, username=settings.FIRST_USER
+        )
+    return str(user.id)
+
+
+def run_child(user_id: str, warmup: int) -> dict:
+    env = {
+        **os.environ,
+        'BENCHMARK_USER_ID': user_id,
+        'DB_WARMUP_CONNECTIONS': str(warmup),
+    }
+    output = subprocess.run(
+        [sys.executable, '-c', CHILD], env=env, check=True,
+        capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(args):
+    user_id = asyncio.run(prepare())
+    report = {'python': sys.version.split()[0], 'runs': args.runs}
+    for warmup in args.warmup:
+        samples = [run_child(user_id, warmup) for _ in range(args.runs)]
+        report[f'warmup_{warmup}'] = {
+            key: statistics.median(sample[key] for sample in samples)
+            for key in samples[0]
+        }
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, 'w') as file:
+            file.write(text + '\n')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--warmup', type=int, nargs='+', default=[0, 5])
+    parser.add_argument('--output')
+    main(parser.parse_args())
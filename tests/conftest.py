@@ -0,0 +1,153 @@
+import os
+import tempfile
+
+# The settings object is built when ``app`` is first imported, so the test
+# environment has to be in place before any test module imports it.
+_DB_DIR = tempfile.mkdtemp(prefix='quiz-tests-')
+os.environ.update({
+    'PROJECT_NAME': 'SimpleQuizFastAPI tests',
+    'POSTGRES_USER': 'test',
+    'POSTGRES_PASSWORD': 'test',
+    'POSTGRES_DB': 'test',
+    'POSTGRES_HOST': 'localhost',
+    'POSTGRES_PORT': '5432',
+    'DATABASE_URL': f'sqlite+aiosqlite:///{_DB_DIR}/primary.db',
+    'SECRET_KEY': 'test-secret-key-that-is-long-enough-for-hs256',
+    'ALGORITHM': 'HS256',
+    'ACCESS_TOKEN_EXPIRE_MINUTES': '60',
+    'FIRST_USER': 'admin',
+    'FIRST_USER_EMAIL': 'admin@example.com',
+    'FIRST_USER_PASSWORD': 'test-admin-pass',
+    'INIT_DB_ON_STARTUP': 'true',
+    'QUIZ_CACHE_BACKEND': 'none',
+    'PASSWORD_HASH_WORKERS': '2',
+})
+
+from contextlib import contextmanager  # noqa: E402
+
+import httpx  # noqa: E402
+import pytest  # noqa: E402
+
+from benchmarks import common  # noqa: E402
+
+# Most statements a request to each route may issue, with a warm principal
+# cache and the quiz response cache off. The counts include the FTS5 index
+# upkeep that only exists on SQLite. Raise a budget only together with the
+# change that needs the extra statement.
+QUERY_BUDGETS = {
+    ('POST', '/users/sign-up'): 2,
+    ('PATCH', '/users/users/{user_id}/password'): 2,
+    ('GET', '/users/me'): 1,
+    ('GET', '/users/{user_id}'): 1,
+    ('DELETE', '/users/{user_id}'): 11,
+    ('POST', '/login/access-token'): 1,
+    ('POST', '/quizzes/create-quiz'): 9,
+    ('GET', '/quizzes/{quiz_id}'): 4,
+    ('PATCH', '/quizzes/{quiz_id}'): 4,
+    ('DELETE', '/quizzes/{quiz_id}'): 8,
+    ('POST', '/quizzes/{quiz_id}/attempts'): 5,
+    ('GET', '/quizzes/{quiz_id}/stats'): 3,
+    ('GET', '/quizzes/user/{user_id}'): 3,
+    ('GET', '/quizzes/user/{user_id}/summary'): 1,
+    ('GET', '/quizzes/user/{user_id}/export'): 3,
+    ('POST', '/quizzes/import'): 9,
+    ('POST', '/questions/bulk'): 8,
+    ('PATCH', '/questions/bulk'): 5,
+    ('DELETE', '/questions/bulk'): 6,
+    ('GET', '/questions/{question_id}'): 2,
+    ('GET', '/questions/quiz/{quiz_id}'): 3,
+    ('POST', '/questions/'): 8,
+    ('PATCH', '/questions/{question_id}'): 7,
+    ('DELETE', '/questions/{question_id}'): 6,
+    ('POST', '/answers/'): 5,
+    ('POST', '/answers/bulk'): 5,
+    ('PATCH', '/answers/bulk'): 5,
+    ('DELETE', '/answers/bulk'): 4,
+    ('GET', '/answers/{answer_id}'): 2,
+    ('GET', '/answers/question/{question_id}'): 2,
+    ('PATCH', '/answers/{answer_id}'): 5,
+    ('DELETE', '/answers/{answer_id}'): 4,
+    ('GET', '/search'): 1,
+    ('GET', '/internal/principal-cache'): 0,
+    ('GET', '/internal/pool'): 0,
+    ('GET', '/internal/attempt-buffer'): 0,
+    ('GET', '/internal/slow-queries'): 0,
+    ('GET', '/metrics'): 0,
+}
+
+
+def pytest_configure(config):
+    # crud runs Core statements through session.execute() on purpose.
+    config.addinivalue_line(
+        'filterwarnings',
+        r'ignore:(?s).*session\.exec\(\):DeprecationWarning'
+    )
+
+
+@pytest.fixture
+def anyio_backend():
+    return 'asyncio'
+
+
+@pytest.fixture
+async def app():
+    from app.main import app
+
+    # Every test starts from empty tables; the lifespan then creates the
+    # superuser and, on exit, disposes the pools bound to this test's loop.
+    await common.reset_schema()
+    async with app.router.lifespan_context(app):
+        yield app
+
+
+@pytest.fixture
+async def client(app):
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url='http://test'
+    ) as client:
+        yield client
+
+
+@pytest.fixture
+async def user(client):
+    user_id = await common.sign_up(client, 'alice')
+    headers = await common.login(client, 'alice')
+    return {'id': user_id, 'username': 'alice', 'headers': headers}
+
+
+@pytest.fixture
+async def admin_headers(client):
+    return await common.login(
+        client, 'admin', os.environ['FIRST_USER_PASSWORD']
+    )
+
+
+@pytest.fixture
+async def quiz(client, user):
+    response = await client.post(
+        '/quizzes/create-quiz', headers=user['headers'],
+        json=common.quiz_payload(user['id'], questions=3, answers=3)
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+@pytest.fixture
+def count_statements():
+    return common.count_statements
+
+
+@pytest.fixture
+def query_budget():
+    # ``with query_budget('GET', '/quizzes/{quiz_id}'): ...`` fails the
+    # test when the block issues more statements than the route's budget.
+    @contextmanager
+    def check(method: str, path: str):
+        budget = QUERY_BUDGETS[(method, path)]
+        with common.count_statements() as counter:
+            yield counter
+        assert counter.count <= budget, (
+            f'{method} {path} issued {counter.count} statements, budget '
+            f'{budget}:\n' + '\n'.join(counter.statements)
+        )
+    return check
@@ -0,0 +1,71 @@
+import ast
+import pathlib
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateTable
+from sqlmodel import select
+
+from app.core.db import async_session_maker
+from app.models import Attempt
+
+pytestmark = pytest.mark.anyio
+
+MIGRATION = (
+    pathlib.Path(__file__).parent.parent
+    / 'alembic/versions/4f2c9b7e1d58_add_attempt_table.py'
+)
+
+
+async def test_created_at_round_trips(client, user, quiz):
+    before = datetime.now(timezone.utc)
+    response = await client.post(
+        f'/quizzes/{quiz["id"]}/attempts', headers=user['headers'],
+        params={'sync': 'true'},
+        json={'answer_ids': [
+            question['answers'][0]['id'] for question in quiz['questions']
+        ]}
+    )
+    assert response.status_code == 200, response.text
+
+    attempt_id = uuid.UUID(response.json()['id'])
+    async with async_session_maker() as session:
+        attempt = (await session.exec(
+            select(Attempt).where(Attempt.id == attempt_id)
+        )).one()
+    created_at = attempt.created_at
+    # SQLite has no time zone type and hands the UTC value back naive.
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    assert before - timedelta(seconds=1) <= created_at
+    assert created_at <= datetime.now(timezone.utc)
+
+
+def test_model_column_is_timestamptz():
+    ddl = str(CreateTable(Attempt.__table__).compile(
+        dialect=postgresql.dialect()
+    ))
+    assert 'created_at TIMESTAMP WITH TIME ZONE NOT NULL' in ddl
+
+
+
+def test_migration_column_matches_the_model():
+    # alembic isn't importable in the test environment, so the migration's
+    # sa.Column('created_at', sa.DateTime(...)) call is read from source.
+    tree = ast.parse(MIGRATION.read_text())
+    column = next(
+        node for node in ast.walk(tree)
+        if isinstance(node, ast.Call) and node.args
+        and isinstance(node.args[0], ast.Constant)
+        and node.args[0].value == 'created_at'
+    )
+    column_type = column.args[1]
+    assert ast.unparse(column_type.func) == 'sa.DateTime'
+    timezone_aware = {
+        keyword.arg: ast.literal_eval(keyword.value)
+        for keyword in column_type.keywords
+    }.get('timezone', False)
+    assert timezone_aware is Attempt.__table__.c.created_at.type.timezone
+    assert timezone_aware is True
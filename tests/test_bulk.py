@@ -0,0 +1,89 @@
+import pytest
+
+from benchmarks import common
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def quizzes(client, user):
+    created = []
+    for _ in range(3):
+        response = await client.post(
+            '/quizzes/create-quiz', headers=user['headers'],
+            json=common.quiz_payload(user['id'], questions=2, answers=2)
+        )
+        response.raise_for_status()
+        created.append(response.json())
+    return created
+
+
+async def counts(client, user) -> dict:
+    response = await client.get(
+        f'/quizzes/user/{user["id"]}/summary', headers=user['headers']
+    )
+    return {
+        item['id']: (item['question_count'], item['answer_count'])
+        for item in response.json()['items']
+    }
+
+
+async def etags(client, user, quizzes) -> list[str]:
+    return [
+        (await client.get(
+            f'/quizzes/{quiz["id"]}', headers=user['headers']
+        )).headers['ETag']
+        for quiz in quizzes
+    ]
+
+
+async def test_bulk_write_across_quizzes_touches_each_once(
+        client, user, quizzes, query_budget
+):
+    before = await etags(client, user, quizzes)
+    # Two answers from the first quiz, one from the second, none from the
+    # third.
+    answer_ids = [
+        quizzes[0]['questions'][0]['answers'][0]['id'],
+        quizzes[0]['questions'][1]['answers'][0]['id'],
+        quizzes[1]['questions'][0]['answers'][0]['id'],
+    ]
+    with query_budget('DELETE', '/answers/bulk'):
+        response = await client.request(
+            'DELETE', '/answers/bulk', headers=user['headers'],
+            json=answer_ids
+        )
+    assert response.status_code == 200
+
+    assert await counts(client, user) == {
+        quizzes[0]['id']: (2, 2),
+        quizzes[1]['id']: (2, 3),
+        quizzes[2]['id']: (2, 4),
+    }
+    after = await etags(client, user, quizzes)
+    assert [a != b for a, b in zip(after, before)] == [True, True, False]
+
+
+async def test_bulk_create_questions_adds_per_quiz_counts(
+        client, user, quizzes, query_budget
+):
+    questions = [
+        {
+            'quiz_id': quiz['id'], 'question': 'Bulk question?',
+            'answers': [{'text': f'Answer {a}'} for a in range(answers)]
+        }
+        for quiz, answers in (
+            (quizzes[0], 1), (quizzes[0], 3), (quizzes[2], 0)
+        )
+    ]
+    with query_budget('POST', '/questions/bulk'):
+        response = await client.post(
+            '/questions/bulk', headers=user['headers'], json=questions
+        )
+    assert response.status_code == 200
+
+    assert await counts(client, user) == {
+        quizzes[0]['id']: (4, 8),
+        quizzes[1]['id']: (2, 4),
+        quizzes[2]['id']: (3, 4),
+    }
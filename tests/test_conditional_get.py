@@ -0,0 +1,65 @@
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+def reads(quiz) -> list[str]:
+    question = quiz['questions'][0]
+    return [
+        f'/quizzes/{quiz["id"]}',
+        f'/questions/{question["id"]}',
+        f'/questions/quiz/{quiz["id"]}',
+        f'/answers/{question["answers"][0]["id"]}',
+        f'/answers/question/{question["id"]}',
+    ]
+
+
+async def test_matching_if_none_match_returns_304(client, user, quiz):
+    for path in reads(quiz):
+        response = await client.get(path, headers=user['headers'])
+        assert response.status_code == 200
+        etag = response.headers['ETag']
+
+        response = await client.get(
+            path, headers={**user['headers'], 'If-None-Match': etag}
+        )
+        assert response.status_code == 304, path
+        assert response.headers['ETag'] == etag
+        assert response.content == b''
+
+
+async def test_quiz_and_answer_writes_change_the_etag(client, user, quiz):
+    path = f'/quizzes/{quiz["id"]}'
+    answer = quiz['questions'][0]['answers'][0]
+    writes = [
+        (path, {'title': 'Renamed quiz'}),
+        (f'/answers/{answer["id"]}', {'text': 'Edited answer'}),
+    ]
+    response = await client.get(path, headers=user['headers'])
+    etags = [response.headers['ETag']]
+    for write_path, body in writes:
+        response = await client.patch(
+            write_path, headers=user['headers'], json=body
+        )
+        assert response.status_code == 200
+        response = await client.get(path, headers=user['headers'])
+        etags.append(response.headers['ETag'])
+    assert len(set(etags)) == len(etags)
+
+
+async def test_stale_etag_gets_the_new_body(client, user, quiz):
+    path = f'/quizzes/{quiz["id"]}'
+    response = await client.get(path, headers=user['headers'])
+    etag = response.headers['ETag']
+
+    response = await client.patch(
+        path, headers=user['headers'], json={'title': 'Renamed quiz'}
+    )
+    assert response.status_code == 200
+
+    response = await client.get(
+        path, headers={**user['headers'], 'If-None-Match': etag}
+    )
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+    assert response.json()['title'] == 'Renamed quiz'
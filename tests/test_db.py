@@ -0,0 +1,22 @@
+import pytest
+
+from app.core import db
+from app.core.config import settings
+
+
+def test_asyncpg_statement_caches_follow_the_setting(monkeypatch):
+    monkeypatch.setattr(settings, 'DB_STATEMENT_CACHE_SIZE', 0)
+    options = db._engine_options('postgresql+asyncpg://u:p@localhost/quiz')
+    assert options['poolclass'] is db.TimedQueuePool
+    assert options['connect_args'] == {
+        'prepared_statement_cache_size': 0,
+        'statement_cache_size': 0,
+    }
+
+
+@pytest.mark.parametrize('url', [
+    'postgresql+psycopg://u:p@localhost/quiz',
+    'sqlite+aiosqlite:///./quiz.db',
+])
+def test_other_drivers_get_no_asyncpg_arguments(url):
+    assert 'connect_args' not in db._engine_options(url)
@@ -0,0 +1,86 @@
+import uuid
+
+import pytest
+from sqlmodel import func, select, update
+
+from app import rebuild_stats
+from app.core.db import async_session_maker
+from app.models import AnswerStats, Attempt, QuizStats, User
+from benchmarks import common
+
+pytestmark = pytest.mark.anyio
+
+
+async def attempt(client, headers, quiz) -> None:
+    response = await client.post(
+        f'/quizzes/{quiz["id"]}/attempts', headers=headers,
+        params={'sync': 'true'},
+        json={'answer_ids': [
+            question['answers'][0]['id'] for question in quiz['questions']
+        ]}
+    )
+    response.raise_for_status()
+
+
+async def rows_for_quiz(quiz_id) -> dict:
+    async with async_session_maker() as session:
+        return {
+            model.__name__: (await session.exec(
+                select(func.count()).select_from(model)
+                .where(model.quiz_id == uuid.UUID(quiz_id))
+            )).one()
+            for model in (Attempt, QuizStats, AnswerStats)
+        }
+
+
+async def set_superuser(user_id, is_superuser: bool) -> None:
+    async with async_session_maker() as session:
+        await session.execute(
+            update(User).where(User.id == user_id)
+            .values(is_superuser=is_superuser)
+        )
+        await session.commit()
+
+
+async def test_delete_quiz_removes_attempts_and_stats(client, user, quiz):
+    await attempt(client, user['headers'], quiz)
+    response = await client.delete(
+        f'/quizzes/{quiz["id"]}', headers=user['headers']
+    )
+    assert response.status_code == 200
+    assert await rows_for_quiz(quiz['id']) == {
+        'Attempt': 0, 'QuizStats': 0, 'AnswerStats': 0
+    }
+    assert await rebuild_stats.main(check=True) == 0
+
+
+async def test_delete_user_takes_their_attempts_out_of_other_stats(
+        client, user, quiz, admin_headers
+):
+    # Only owners and superusers may attempt a quiz, so bob is a superuser
+    # while he attempts alice's quiz; superusers can't be deleted, so he is
+    # demoted again before that.
+    bob_id = await common.sign_up(client, 'bob')
+    await set_superuser(bob_id, True)
+    bob = await common.login(client, 'bob')
+    response = await client.post(
+        '/quizzes/create-quiz', headers=bob,
+        json=common.quiz_payload(bob_id, questions=2, answers=2)
+    )
+    bob_quiz = response.json()
+    await attempt(client, bob, quiz)
+    await attempt(client, user['headers'], quiz)
+    await attempt(client, admin_headers, bob_quiz)
+    await set_superuser(bob_id, False)
+
+    response = await client.delete(f'/users/{bob_id}', headers=bob)
+    assert response.status_code == 200
+
+    assert await rows_for_quiz(bob_quiz['id']) == {
+        'Attempt': 0, 'QuizStats': 0, 'AnswerStats': 0
+    }
+    response = await client.get(
+        f'/quizzes/{quiz["id"]}/stats', headers=user['headers']
+    )
+    assert response.json()['attempt_count'] == 1
+    assert await rebuild_stats.main(check=True) == 0
@@ -0,0 +1,111 @@
+import uuid
+
+import pytest
+
+from app import crud
+from app.core.db import async_session_maker, engine
+from app.models import QuizCreate, User
+from benchmarks import common
+
+pytestmark = pytest.mark.anyio
+
+# Every hot crud read is run once against a seeded database while its SQL
+# is captured, then each statement is re-run under EXPLAIN. On Postgres
+# sequential scans are disabled for the session, so a Seq Scan means no
+# usable index exists; on SQLite a plain SCAN of a table fails.
+HOT_QUERIES = {
+    'get_user_by_username': lambda s, d: crud.get_user_by_username(
+        session=s, username='explain'
+    ),
+    'get_user_quizzes': lambda s, d: crud.get_user_quizzes(
+        session=s, user_id=d['owner_id'], limit=20, after=d['quiz_id']
+    ),
+    'get_user_quiz_summaries': lambda s, d: crud.get_user_quiz_summaries(
+        session=s, user_id=d['owner_id'], limit=20
+    ),
+    'get_quiz_by_id': lambda s, d: crud.get_quiz_by_id(
+        session=s, quiz_id=d['quiz_id']
+    ),
+    'get_quiz_access(quiz)': lambda s, d: crud.get_quiz_access(
+        session=s, user=d['user'], quiz_id=d['quiz_id']
+    ),
+    'get_quiz_access(question)': lambda s, d: crud.get_quiz_access(
+        session=s, user=d['user'], question_id=d['question_id']
+    ),
+    'get_quiz_access(answer)': lambda s, d: crud.get_quiz_access(
+        session=s, user=d['user'], answer_id=d['answer_id']
+    ),
+    'get_question_by_id': lambda s, d: crud.get_question_by_id(
+        session=s, question_id=d['question_id']
+    ),
+    'get_quiz_questions': lambda s, d: crud.get_quiz_questions(
+        session=s, quiz_id=d['quiz_id'], limit=20
+    ),
+    'get_question_answers': lambda s, d: crud.get_question_answers(
+        session=s, question_id=d['question_id'], limit=20
+    ),
+    'get_answer_for_user': lambda s, d: crud.get_answer_for_user(
+        session=s, user=d['user'], answer_id=d['answer_id']
+    ),
+}
+
+
+@pytest.fixture
+async def seeded(app):
+    owner_id = uuid.uuid4()
+    user = User(
+        id=owner_id, username='explain', email='explain@example.com',
+        hashed_password='-'
+    )
+    async with async_session_maker() as session:
+        session.add(user)
+        await session.commit()
+        for _ in range(50):
+            quiz = await crud.create_quiz_with_question(
+                session=session,
+                quiz=QuizCreate.model_validate(common.quiz_payload(owner_id)),
+                owner_id=owner_id
+            )
+    question = quiz.questions[0]
+    return {
+        'user': user,
+        'owner_id': owner_id,
+        'quiz_id': quiz.id,
+        'question_id': question.id,
+        'answer_id': question.answers[0].id,
+    }
+
+
+def scans(dialect: str, plan: list[str]) -> list[str]:
+    if dialect == 'postgresql':
+        return [line for line in plan if 'Seq Scan' in line]
+    # Ignore scans of subqueries and temp b-trees, only tables count.
+    tables = {'user', 'quiz', 'question', 'answer'}
+    return [
+        line for line in plan
+        if line.split()[:1] == ['SCAN'] and 'USING' not in line
+        and line.split()[1].strip('"') in tables
+    ]
+
+
+@pytest.mark.parametrize('name', HOT_QUERIES)
+async def test_hot_query_uses_an_index(seeded, count_statements, name):
+    async with async_session_maker() as session:
+        with count_statements() as counter:
+            await HOT_QUERIES[name](session, seeded)
+    assert counter.statements
+
+    dialect = engine.dialect.name
+    prefix = 'EXPLAIN ' if dialect == 'postgresql' else 'EXPLAIN QUERY PLAN '
+    async with engine.connect() as conn:
+        if dialect == 'postgresql':
+            await conn.exec_driver_sql('SET LOCAL enable_seqscan = off')
+        for statement, parameters in zip(
+                counter.statements, counter.parameters
+        ):
+            result = await conn.exec_driver_sql(prefix + statement, parameters)
+            plan = [str(row[-1]) for row in result]
+            assert not scans(dialect, plan), (
+                f'{name} plans a sequential scan:\n{statement}\n'
+                + '\n'.join(plan)
+            )
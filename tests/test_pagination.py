@@ -0,0 +1,80 @@
+import uuid
+
+import pytest
+
+from app.core.pagination import decode_cursor, encode_cursor
+from benchmarks import common
+
+pytestmark = pytest.mark.anyio
+
+
+async def collect(client, headers, path: str, key: str, limit: int) -> list:
+    pages = []
+    params = {'limit': limit}
+    while True:
+        response = await client.get(path, headers=headers, params=params)
+        assert response.status_code == 200, response.text
+        body = response.json()
+        pages.append([item['id'] for item in body[key]])
+        if body['next_cursor'] is None:
+            return pages
+        params['cursor'] = body['next_cursor']
+
+
+def test_cursor_round_trip():
+    last_id = uuid.uuid4()
+    assert decode_cursor(encode_cursor(last_id)) == last_id
+
+
+async def test_pages_follow_next_cursor_to_the_end(client, user):
+    quiz_ids = []
+    for _ in range(5):
+        response = await client.post(
+            '/quizzes/create-quiz', headers=user['headers'],
+            json=common.quiz_payload(user['id'], questions=5, answers=5)
+        )
+        response.raise_for_status()
+        quiz_ids.append(response.json()['id'])
+    question = response.json()['questions'][0]
+
+    listings = [
+        (f'/quizzes/user/{user["id"]}', 'items', quiz_ids),
+        (
+            f'/questions/quiz/{quiz_ids[-1]}', 'questions',
+            [q['id'] for q in response.json()['questions']]
+        ),
+        (
+            f'/answers/question/{question["id"]}', 'answers',
+            [a['id'] for a in question['answers']]
+        ),
+    ]
+    for path, key, ids in listings:
+        pages = await collect(client, user['headers'], path, key, limit=2)
+        assert [len(page) for page in pages] == [2, 2, 1], path
+        seen = [item for page in pages for item in page]
+        assert seen == sorted(ids, key=uuid.UUID), path
+
+
+async def test_exact_multiple_of_the_limit_has_no_extra_page(
+        client, user, quiz
+):
+    pages = await collect(
+        client, user['headers'], f'/questions/quiz/{quiz["id"]}',
+        'questions', limit=3
+    )
+    assert [len(page) for page in pages] == [3]
+
+
+@pytest.mark.parametrize('cursor', ['not-a-cursor!', 'AAAA', ''])
+async def test_bad_cursor_is_a_400(client, user, quiz, cursor):
+    question = quiz['questions'][0]
+    for path in (
+        f'/quizzes/user/{user["id"]}',
+        f'/questions/quiz/{quiz["id"]}',
+        f'/answers/question/{question["id"]}',
+    ):
+        response = await client.get(
+            path, headers=user['headers'], params={'cursor': cursor}
+        )
+        assert response.status_code == 400, path
+        assert response.json()['detail'] == 'Invalid cursor'
@@ -0,0 +1,371 @@
+import json
+import os
+import uuid
+
+import pytest
+
+from benchmarks import common
+from conftest import QUERY_BUDGETS
+
+pytestmark = pytest.mark.anyio
+
+# Each route runs once on a quiz with SMALL questions of SMALL answers and
+# once with LARGE; a count that grows with the data is an N+1.
+SMALL, LARGE = 2, 6
+
+
+class Fixtures:
+    def __init__(self, client):
+        self.client = client
+        self.size = SMALL
+
+    async def setup(self):
+        self.username = f'budget-{uuid.uuid4().hex[:8]}'
+        self.user_id = await common.sign_up(self.client, self.username)
+        self.headers = await common.login(self.client, self.username)
+        self.admin = await common.login(
+            self.client, 'admin', os.environ['FIRST_USER_PASSWORD']
+        )
+        # Warms the principal cache so that budgets exclude the user lookup.
+        await self.client.get('/users/me', headers=self.headers)
+        await self.client.get('/users/me', headers=self.admin)
+
+    async def quiz(self, headers=None, owner_id=None) -> dict:
+        response = await self.client.post(
+            '/quizzes/create-quiz', headers=headers or self.headers,
+            json=self.payload(owner_id)
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def payload(self, owner_id=None) -> dict:
+        return common.quiz_payload(
+            owner_id or self.user_id, self.size, self.size
+        )
+
+    def answers(self, question_id: str) -> list[dict]:
+        return [
+            {'question_id': question_id, 'text': f'Answer {n}'}
+            for n in range(self.size)
+        ]
+
+
+SCENARIOS = {}
+
+
+def scenario(method: str, path: str):
+    def register(func):
+        SCENARIOS[(method, path)] = func
+        return func
+    return register
+
+
+@scenario('POST', '/users/sign-up')
+async def sign_up(f: Fixtures):
+    name = f'budget-{uuid.uuid4().hex[:8]}'
+    return {'json': {
+        'username': name, 'email': f'{name}@example.com',
+        'password': 'benchmark-pass'
+    }}
+
+
+@scenario('PATCH', '/users/users/{user_id}/password')
+async def update_password(f: Fixtures):
+    # A password change evicts the principal, so the previous run of this
+    # scenario left the cache cold.
+    await f.client.get('/users/me', headers=f.headers)
+    return {
+        'url': f'/users/users/{f.user_id}/password', 'headers': f.headers,
+        'json': {
+            'current_password': 'benchmark-pass',
+            'new_password': 'benchmark-pass'
+        }
+    }
+
+
+@scenario('GET', '/users/me')
+async def me(f: Fixtures):
+    return {'headers': f.headers}
+
+
+@scenario('GET', '/users/{user_id}')
+async def get_user(f: Fixtures):
+    return {'url': f'/users/{f.user_id}', 'headers': f.headers}
+
+
+@scenario('DELETE', '/users/{user_id}')
+async def delete_user(f: Fixtures):
+    name = f'budget-{uuid.uuid4().hex[:8]}'
+    user_id = await common.sign_up(f.client, name)
+    headers = await common.login(f.client, name)
+    for _ in range(f.size):
+        await f.quiz(headers, user_id)
+    await f.client.get('/users/me', headers=headers)
+    return {'url': f'/users/{user_id}', 'headers': headers}
+
+
+@scenario('POST', '/login/access-token')
+async def login(f: Fixtures):
+    return {'data': {'username': f.username, 'password': 'benchmark-pass'}}
+
+
+@scenario('POST', '/quizzes/create-quiz')
+async def create_quiz(f: Fixtures):
+    return {'headers': f.headers, 'json': f.payload()}
+
+
+@scenario('GET', '/quizzes/{quiz_id}')
+async def get_quiz(f: Fixtures):
+    quiz = await f.quiz()
+    return {'url': f'/quizzes/{quiz["id"]}', 'headers': f.headers}
+
+
+@scenario('PATCH', '/quizzes/{quiz_id}')
+async def edit_quiz(f: Fixtures):
+    quiz = await f.quiz()
+    return {
+        'url': f'/quizzes/{quiz["id"]}', 'headers': f.headers,
+        'json': {'title': 'Renamed quiz'}
+    }
+
+
+@scenario('DELETE', '/quizzes/{quiz_id}')
+async def delete_quiz(f: Fixtures):
+    quiz = await f.quiz()
+    return {'url': f'/quizzes/{quiz["id"]}', 'headers': f.headers}
+
+
+@scenario('POST', '/quizzes/{quiz_id}/attempts')
+async def submit_attempt(f: Fixtures):
+    quiz = await f.quiz()
+    return {
+        'url': f'/quizzes/{quiz["id"]}/attempts', 'headers': f.headers,
+        'params': {'sync': 'true'},
+        'json': {'answer_ids': [
+            question['answers'][0]['id'] for question in quiz['questions']
+        ]}
+    }
+
+
+@scenario('GET', '/quizzes/{quiz_id}/stats')
+async def quiz_stats(f: Fixtures):
+    quiz = await f.quiz()
+    return {'url': f'/quizzes/{quiz["id"]}/stats', 'headers': f.headers}
+
+
+@scenario('GET', '/quizzes/user/{user_id}')
+async def user_quizzes(f: Fixtures):
+    for _ in range(f.size):
+        await f.quiz()
+    return {'url': f'/quizzes/user/{f.user_id}', 'headers': f.headers}
+
+
+@scenario('GET', '/quizzes/user/{user_id}/summary')
+async def user_quiz_summaries(f: Fixtures):
+    return {'url': f'/quizzes/user/{f.user_id}/summary', 'headers': f.headers}
+
+
+@scenario('GET', '/quizzes/user/{user_id}/export')
+async def export_quizzes(f: Fixtures):
+    return {'url': f'/quizzes/user/{f.user_id}/export', 'headers': f.headers}
+
+
+@scenario('POST', '/quizzes/import')
+async def import_quizzes(f: Fixtures):
+    body = '\n'.join(json.dumps(f.payload()) for _ in range(f.size))
+    return {'headers': f.headers, 'content': body.encode()}
+
+
+@scenario('POST', '/questions/bulk')
+async def create_questions_bulk(f: Fixtures):
+    quiz = await f.quiz()
+    return {'headers': f.headers, 'json': [
+        {
+            'quiz_id': quiz['id'], 'question': f'Bulk question {n}?',
+            'answers': [{'text': f'Answer {a}'} for a in range(f.size)]
+        }
+        for n in range(f.size)
+    ]}
+
+
+@scenario('PATCH', '/questions/bulk')
+async def edit_questions_bulk(f: Fixtures):
+    quiz = await f.quiz()
+    return {'headers': f.headers, 'json': [
+        {'id': question['id'], 'question': 'Edited question?'}
+        for question in quiz['questions']
+    ]}
+
+
+@scenario('DELETE', '/questions/bulk')
+async def delete_questions_bulk(f: Fixtures):
+    quiz = await f.quiz()
+    return {'headers': f.headers, 'json': [
+        question['id'] for question in quiz['questions']
+    ]}
+
+
+@scenario('GET', '/questions/{question_id}')
+async def get_question(f: Fixtures):
+    quiz = await f.quiz()
+    question_id = quiz['questions'][0]['id']
+    return {'url': f'/questions/{question_id}', 'headers': f.headers}
+
+
+@scenario('GET', '/questions/quiz/{quiz_id}')
+async def quiz_questions(f: Fixtures):
+    quiz = await f.quiz()
+    return {'url': f'/questions/quiz/{quiz["id"]}', 'headers': f.headers}
+
+
+@scenario('POST', '/questions/')
+async def create_question(f: Fixtures):
+    quiz = await f.quiz()
+    return {'headers': f.headers, 'json': {
+        'quiz_id': quiz['id'], 'question': 'One more question?',
+        'answers': [{'text': f'Answer {a}'} for a in range(f.size)]
+    }}
+
+
+@scenario('PATCH', '/questions/{question_id}')
+async def edit_question(f: Fixtures):
+    quiz = await f.quiz()
+    question_id = quiz['questions'][0]['id']
+    return {
+        'url': f'/questions/{question_id}', 'headers': f.headers,
+        'json': {'question': 'Edited question?'}
+    }
+
+
+@scenario('DELETE', '/questions/{question_id}')
+async def delete_question(f: Fixtures):
+    quiz = await f.quiz()
+    question_id = quiz['questions'][0]['id']
+    return {'url': f'/questions/{question_id}', 'headers': f.headers}
+
+
+@scenario('POST', '/answers/')
+async def create_answer(f: Fixtures):
+    quiz = await f.quiz()
+    question_id = quiz['questions'][0]['id']
+    return {'headers': f.headers, 'json': f.answers(question_id)[0]}
+
+
+@scenario('POST', '/answers/bulk')
+async def create_answers_bulk(f: Fixtures):
+    quiz = await f.quiz()
+    question_id = quiz['questions'][0]['id']
+    return {'headers': f.headers, 'json': f.answers(question_id)}
+
+
+@scenario('PATCH', '/answers/bulk')
+async def edit_answers_bulk(f: Fixtures):
+    quiz = await f.quiz()
+    return {'headers': f.headers, 'json': [
+        {'id': answer['id'], 'text': 'Edited answer'}
+        for answer in quiz['questions'][0]['answers']
+    ]}
+
+
+@scenario('DELETE', '/answers/bulk')
+async def delete_answers_bulk(f: Fixtures):
+    quiz = await f.quiz()
+    return {'headers': f.headers, 'json': [
+        answer['id'] for answer in quiz['questions'][0]['answers']
+    ]}
+
+
+@scenario('GET', '/answers/{answer_id}')
+async def get_answer(f: Fixtures):
+    quiz = await f.quiz()
+    answer_id = quiz['questions'][0]['answers'][0]['id']
+    return {'url': f'/answers/{answer_id}', 'headers': f.headers}
+
+
+@scenario('GET', '/answers/question/{question_id}')
+async def question_answers(f: Fixtures):
+    quiz = await f.quiz()
+    question_id = quiz['questions'][0]['id']
+    return {'url': f'/answers/question/{question_id}', 'headers': f.headers}
+
+
+@scenario('PATCH', '/answers/{answer_id}')
+async def edit_answer(f: Fixtures):
+    quiz = await f.quiz()
+    answer_id = quiz['questions'][0]['answers'][0]['id']
+    return {
+        'url': f'/answers/{answer_id}', 'headers': f.headers,
+        'json': {'text': 'Edited answer'}
+    }
+
+
+@scenario('DELETE', '/answers/{answer_id}')
+async def delete_answer(f: Fixtures):
+    quiz = await f.quiz()
+    answer_id = quiz['questions'][0]['answers'][0]['id']
+    return {'url': f'/answers/{answer_id}', 'headers': f.headers}
+
+
+@scenario('GET', '/search')
+async def search(f: Fixtures):
+    for _ in range(f.size):
+        await f.quiz()
+    return {'headers': f.headers, 'params': {'q': 'question'}}
+
+
+@scenario('GET', '/internal/principal-cache')
+async def principal_cache(f: Fixtures):
+    return {'headers': f.admin}
+
+
+@scenario('GET', '/internal/pool')
+async def pool(f: Fixtures):
+    return {'headers': f.admin}
+
+
+@scenario('GET', '/internal/attempt-buffer')
+async def attempt_buffer(f: Fixtures):
+    return {'headers': f.admin}
+
+
+@scenario('GET', '/internal/slow-queries')
+async def slow_queries(f: Fixtures):
+    return {'headers': f.admin}
+
+
+@scenario('GET', '/metrics')
+async def metrics(f: Fixtures):
+    return {}
+
+
+def test_every_route_has_a_scenario_and_a_budget():
+    from app.main import app
+
+    routes = {
+        (method.upper(), path)
+        for path, operations in app.openapi()['paths'].items()
+        for method in operations
+    }
+    assert len(routes) == len(QUERY_BUDGETS)
+    assert routes == SCENARIOS.keys()
+    assert routes == QUERY_BUDGETS.keys()
+
+
+@pytest.mark.parametrize(
+    'method, path', sorted(SCENARIOS), ids=lambda value: value
+)
+async def test_route_query_budget(client, query_budget, method, path):
+    fixtures = Fixtures(client)
+    await fixtures.setup()
+    counts = []
+    for size in (SMALL, LARGE):
+        fixtures.size = size
+        request = {'url': path, **await SCENARIOS[(method, path)](fixtures)}
+        with query_budget(method, path) as counter:
+            response = await client.request(method, **request)
+        assert response.status_code < 400, response.text
+        counts.append(counter.count)
+    assert counts[0] == counts[1], (
+        f'{method} {path} issued {counts[0]} statements for {SMALL} rows '
+        f'but {counts[1]} for {LARGE}'
+    )
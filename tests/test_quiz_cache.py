@@ -0,0 +1,88 @@
+import pytest
+
+from app.api import responses
+from app.api.routers import answers, questions, quizzes
+from app.core.cache import MemoryResponseCache
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def memory_cache(monkeypatch):
+    # conftest turns the cache off; every module that imported the global
+    # gets the same in-memory backend here.
+    cache = MemoryResponseCache(max_bytes=1 << 20, ttl=60)
+    for module in (responses, quizzes, questions, answers):
+        monkeypatch.setattr(module, 'quiz_response_cache', cache)
+    return cache
+
+
+def cached_reads(quiz) -> list[str]:
+    return [f'/quizzes/{quiz["id"]}', f'/questions/quiz/{quiz["id"]}']
+
+
+def write(quiz) -> dict:
+    question = quiz['questions'][0]
+    answer = question['answers'][0]
+    return {
+        'edit answer': (
+            'PATCH', f'/answers/{answer["id"]}', {'text': 'Edited answer'}
+        ),
+        'create answer': ('POST', '/answers/', {
+            'text': 'Another answer', 'question_id': question['id']
+        }),
+        'delete answer': ('DELETE', f'/answers/{answer["id"]}', None),
+        'bulk edit answers': ('PATCH', '/answers/bulk', [
+            {'id': answer['id'], 'text': 'Edited answer'}
+        ]),
+        'edit question': ('PATCH', f'/questions/{question["id"]}', {
+            'question': 'Edited question?'
+        }),
+        'create question': ('POST', '/questions/', {
+            'question': 'Another question?', 'quiz_id': quiz['id']
+        }),
+        'delete question': ('DELETE', f'/questions/{question["id"]}', None),
+        'bulk edit questions': ('PATCH', '/questions/bulk', [
+            {'id': question['id'], 'question': 'Edited question?'}
+        ]),
+    }
+
+
+async def test_repeated_read_is_served_from_the_cache(
+        client, user, quiz, memory_cache, count_statements
+):
+    path = f'/quizzes/{quiz["id"]}'
+    with count_statements() as miss:
+        first = await client.get(path, headers=user['headers'])
+    with count_statements() as hit:
+        second = await client.get(path, headers=user['headers'])
+    assert second.content == first.content
+    assert memory_cache.size == len(first.content)
+    assert hit.count < miss.count
+
+
+@pytest.mark.parametrize('name', [
+    'edit answer', 'create answer', 'delete answer', 'bulk edit answers',
+    'edit question', 'create question', 'delete question',
+    'bulk edit questions',
+])
+async def test_writes_invalidate_cached_reads(
+        client, user, quiz, memory_cache, name
+):
+    before = {}
+    for path in cached_reads(quiz):
+        response = await client.get(path, headers=user['headers'])
+        before[path] = response.content
+    assert memory_cache.size > 0
+
+    method, path, body = write(quiz)[name]
+    response = await client.request(
+        method, path, headers=user['headers'], json=body
+    )
+    assert response.status_code == 200, response.text
+    assert memory_cache.size == 0
+
+    for path in cached_reads(quiz):
+        response = await client.get(path, headers=user['headers'])
+        assert response.status_code == 200
+        assert response.content != before[path]
@@ -0,0 +1,83 @@
+import asyncio
+import time
+import uuid
+
+import httpx
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.api import deps
+from app.api.middleware import PRIMARY_STICKY_COOKIE
+from app.core import db
+from app.core.config import settings
+from app.models import Quiz
+from benchmarks import common
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def replica(monkeypatch, tmp_path):
+    # A second SQLite file stands in for the replica. Nothing replicates
+    # into it, so rows written there show which database served a read.
+    replica_engine = db.create_engine(
+        f'sqlite+aiosqlite:///{tmp_path}/replica.db'
+    )
+    async with replica_engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    monkeypatch.setattr(deps, 'replica_engine', replica_engine)
+    monkeypatch.setattr(deps, 'read_session_maker', async_sessionmaker(
+        replica_engine, expire_on_commit=False, class_=AsyncSession
+    ))
+    yield replica_engine
+    await replica_engine.dispose()
+
+
+@pytest.fixture
+async def replica_client(monkeypatch, replica):
+    import app.main
+
+    # create_app() only installs ReadYourWritesMiddleware with a replica.
+    monkeypatch.setattr(app.main, 'replica_engine', replica)
+    application = app.main.create_app()
+    await common.reset_schema()
+    async with application.router.lifespan_context(application):
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=application),
+            base_url='http://test'
+        ) as client:
+            yield client
+
+
+async def test_reads_stick_to_primary_until_the_cookie_expires(
+        monkeypatch, replica, replica_client
+):
+    monkeypatch.setattr(settings, 'REPLICA_STICKY_SECONDS', 1)
+    client = replica_client
+    user_id = await common.sign_up(client, 'alice')
+    headers = await common.login(client, 'alice')
+    response = await client.post(
+        '/quizzes/create-quiz', headers=headers,
+        json=common.quiz_payload(user_id, questions=1, answers=1)
+    )
+    assert PRIMARY_STICKY_COOKIE in response.cookies
+    quiz = response.json()
+    # A lagging replica: it has the quiz, but with an older title.
+    async with replica.begin() as conn:
+        await conn.execute(insert(Quiz).values(
+            id=uuid.UUID(quiz['id']), owner_id=user_id,
+            title='Stale replica title', description=None
+        ))
+
+    response = await client.get(f'/quizzes/{quiz["id"]}', headers=headers)
+    assert response.json()['title'] == quiz['title']
+
+    # httpx keeps sending the expired cookie; its timestamp has passed, so
+    # the read goes to the replica anyway.
+    await asyncio.sleep(1.1)
+    assert float(client.cookies[PRIMARY_STICKY_COOKIE]) < time.time()
+    response = await client.get(f'/quizzes/{quiz["id"]}', headers=headers)
+    assert response.json()['title'] == 'Stale replica title'
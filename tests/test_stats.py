@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+
+from app import rebuild_stats
+from app.grading import attempt_buffer
+
+pytestmark = pytest.mark.anyio
+
+
+async def attempt(client, headers, quiz, *, sync: bool = True, pick: int = 0):
+    response = await client.post(
+        f'/quizzes/{quiz["id"]}/attempts', headers=headers,
+        params={'sync': str(sync).lower()},
+        json={'answer_ids': [
+            question['answers'][pick]['id'] for question in quiz['questions']
+        ]}
+    )
+    response.raise_for_status()
+
+
+async def quiz_stats(client, headers, quiz) -> dict:
+    response = await client.get(f'/quizzes/{quiz["id"]}/stats', headers=headers)
+    response.raise_for_status()
+    return response.json()
+
+
+async def test_incremental_stats_match_a_rebuild(
+        client, user, quiz, admin_headers
+):
+    for pick in range(3):
+        await attempt(client, user['headers'], quiz, pick=pick)
+        await attempt(client, admin_headers, quiz, sync=False, pick=pick)
+    # Stopping the buffer flushes the queued attempts.
+    await attempt_buffer.stop()
+    before = await quiz_stats(client, user['headers'], quiz)
+    assert before['attempt_count'] == 6
+
+    assert await rebuild_stats.main(check=True) == 0
+    assert await rebuild_stats.main(check=False) == 0
+    assert await quiz_stats(client, user['headers'], quiz) == before
+
+
+async def test_rebuild_keeps_attempts_made_while_it_runs(
+        client, user, quiz, monkeypatch
+):
+    await attempt(client, user['headers'], quiz)
+    compute_stats = rebuild_stats.compute_stats
+    writes = []
+
+    # An attempt arrives after the rebuild has read the attempts but before
+    # it writes the stats. It has to wait for the rebuild, not be
+    # overwritten by it.
+    async def compute_then_race(session):
+        rows = await compute_stats(session)
+        writes.append(asyncio.create_task(
+            attempt(client, user['headers'], quiz, pick=1)
+        ))
+        await asyncio.sleep(0.2)
+        assert not writes[0].done()
+        return rows
+
+    monkeypatch.setattr(rebuild_stats, 'compute_stats', compute_then_race)
+    assert await rebuild_stats.main(check=False) == 0
+    await writes[0]
+    monkeypatch.undo()
+
+    assert (await quiz_stats(client, user['headers'], quiz))[
+        'attempt_count'
+    ] == 2
+    assert await rebuild_stats.main(check=True) == 0
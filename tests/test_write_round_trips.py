@@ -0,0 +1,72 @@
+import pytest
+
+from benchmarks import common
+from conftest import QUERY_BUDGETS
+
+pytestmark = pytest.mark.anyio
+
+# The write endpoints must use exactly their QUERY_BUDGETS entry. Writes no
+# longer refresh what they just wrote, so any extra SELECT fails here, and
+# a saved statement has to lower the budget too.
+WRITES = [
+    ('POST', '/users/sign-up'),
+    ('PATCH', '/users/users/{user_id}/password'),
+    ('POST', '/quizzes/create-quiz'),
+    ('PATCH', '/quizzes/{quiz_id}'),
+    ('POST', '/questions/'),
+    ('PATCH', '/questions/{question_id}'),
+    ('POST', '/answers/'),
+    ('PATCH', '/answers/{answer_id}'),
+]
+
+
+def write_requests(user, quiz):
+    question = quiz['questions'][0]
+    return {
+        ('POST', '/users/sign-up'): ('/users/sign-up', {'json': {
+            'username': 'bob', 'email': 'bob@example.com',
+            'password': 'benchmark-pass'
+        }}),
+        ('PATCH', '/users/users/{user_id}/password'): (
+            f'/users/users/{user["id"]}/password', {'json': {
+                'current_password': 'benchmark-pass',
+                'new_password': 'benchmark-pass-2'
+            }}
+        ),
+        ('POST', '/quizzes/create-quiz'): ('/quizzes/create-quiz', {
+            'json': common.quiz_payload(user['id'], questions=3, answers=3)
+        }),
+        ('PATCH', '/quizzes/{quiz_id}'): (f'/quizzes/{quiz["id"]}', {
+            'json': {'title': 'Renamed quiz'}
+        }),
+        ('POST', '/questions/'): ('/questions/', {'json': {
+            'quiz_id': quiz['id'], 'question': 'One more question?',
+            'answers': [{'text': 'Answer one'}]
+        }}),
+        ('PATCH', '/questions/{question_id}'): (
+            f'/questions/{question["id"]}',
+            {'json': {'question': 'Edited question?'}}
+        ),
+        ('POST', '/answers/'): ('/answers/', {'json': {
+            'question_id': question['id'], 'text': 'Another answer'
+        }}),
+        ('PATCH', '/answers/{answer_id}'): (
+            f'/answers/{question["answers"][0]["id"]}',
+            {'json': {'text': 'Edited answer'}}
+        ),
+    }
+
+
+@pytest.mark.parametrize('method, path', WRITES)
+async def test_write_statement_count(
+        client, user, quiz, count_statements, method, path
+):
+    url, kwargs = write_requests(user, quiz)[(method, path)]
+    with count_statements() as counter:
+        response = await client.request(
+            method, url, headers=user['headers'], **kwargs
+        )
+    assert response.status_code == 200, response.text
+    assert counter.count == QUERY_BUDGETS[(method, path)], (
+        '\n'.join(counter.statements)
+    )